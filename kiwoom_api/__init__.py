@@ -1 +1,19 @@
-from .api import DataFeeder, Executor, Kiwoom
+import sys
+
+__all__ = ["DataFeeder", "Executor", "Kiwoom"]
+
+if sys.version_info < (3, 7):  # module __getattr__ 미지원
+    from .api import DataFeeder, Executor, Kiwoom
+else:
+
+    def __getattr__(name):
+        """ PyQt5(QAxContainer)가 필요한 class는 처음 사용할 때 import (kiwoom_api.api 참고) """
+
+        if name not in __all__:
+            raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
+
+        from . import api
+
+        value = getattr(api, name)
+        globals()[name] = value
+        return value
@@ -1,3 +1,28 @@
-from .data_feeder import DataFeeder
-from .executor import Executor
-from .kiwoom import Kiwoom
+""" Kiwoom, DataFeeder, Executor는 PyQt5의 QAxContainer가 필요하므로 처음 사용할 때 import 합니다.
+QAxContainer가 없는 환경에서도 chejan, journal 등의 module과 kiwoom_api.tools를 사용할 수 있습니다.
+"""
+
+import importlib
+import sys
+
+_LAZY_ATTRIBUTES = {
+    "DataFeeder": ".data_feeder",
+    "Executor": ".executor",
+    "Kiwoom": ".kiwoom",
+}
+
+__all__ = list(_LAZY_ATTRIBUTES)
+
+if sys.version_info < (3, 7):  # module __getattr__ 미지원
+    from .data_feeder import DataFeeder
+    from .executor import Executor
+    from .kiwoom import Kiwoom
+else:
+
+    def __getattr__(name):
+        if name not in _LAZY_ATTRIBUTES:
+            raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
+
+        value = getattr(importlib.import_module(_LAZY_ATTRIBUTES[name], __name__), name)
+        globals()[name] = value
+        return value
@@ -1,71 +1,200 @@
-from datetime import datetime as dt
-import json
+from datetime import date, datetime as dt
+import atexit
 import logging
 import logging.handlers
 import os
 import pprint
 import queue
+import time
+import warnings
 
+from .event_log import EventLogHandler
 
-class Logger:
-    def __init__(self, path, name=""):
-        self.propagate = 0
-        self.makeLogFolder(path)
 
-        filePath = "{}/{}.txt".format(path, dt.now().strftime("%Y%m%d"))
+class PrettyFormatter(logging.Formatter):
+    """ 기록 직전(listener thread)에 메시지를 만드는 Formatter 입니다.
 
-        # 로깅용 설정파일
-        self.__logger = logging.getLogger(name)
-        self.__logger.setLevel(logging.DEBUG)
+    - args가 있으면 msg.format(*args)
+    - str이 아닌 msg(dict 등)는 pprint.pformat, datetime 값은 문자열로 변환
+    """
 
-        fileHandler = logging.FileHandler(filePath)
-        self.__logger.addHandler(fileHandler)
+    TIME_FORMAT = "%Y-%m-%d %H:%M:%S.%f"
 
-        streamHandler = logging.StreamHandler()
-        self.__logger.addHandler(streamHandler)
+    def format(self, record):
+        args = getattr(record, "fmtArgs", None)
+        if args:
+            record.msg = str(record.msg).format(*args)
+            record.fmtArgs = None
+        elif not isinstance(record.msg, str) and getattr(record, "pretty", True):
+            record.msg = pprint.pformat(self.__render(record.msg))
+        return super().format(record)
 
-        #log_que = queue.Queue(-1)
-        #queueListener = logging.handlers.QueueListener(log_que, streamHandler, fileHandler, streamHandler)
-        #queueListener.start()
+    def __render(self, msg):
+        if isinstance(msg, dict):
+            return {key: self.__render(value) for key, value in msg.items()}
+        if isinstance(msg, dt):
+            return msg.strftime(self.TIME_FORMAT)
+        if isinstance(msg, date):
+            return msg.isoformat()
+        return msg
 
-        #queueHandler = logging.handlers.QueueHandler(log_que)
-        #self.__logger.addHandler(queueHandler)
 
-    def makeLogFolder(self, path):
-        if not os.path.exists(path):
-            os.mkdir(path)
+class DailyFileHandler(logging.FileHandler):
+    """ {path}/{YYYYMMDD}.txt 파일에 기록하며, 날짜가 바뀌면 새 파일로 교체하는 FileHandler """
+
+    def __init__(self, path):
+        self.path = path
+        self.day = time.strftime("%Y%m%d")
+        super().__init__(self.filePath(self.day), delay=True)
+
+    def filePath(self, day):
+        return os.path.join(self.path, "{}.txt".format(day))
+
+    def emit(self, record):
+        day = time.strftime("%Y%m%d", time.localtime(record.created))
+        if day != self.day:
+            self.close()
+            self.day = day
+            self.baseFilename = os.path.abspath(self.filePath(day))
+        super().emit(record)
+
 
-    def debug(self, msg, pretty=True):
-        if pretty:
-            msg = self.make_pretty(msg)
+class RecordQueueHandler(logging.handlers.QueueHandler):
+    """ LogRecord를 format 하지 않고 그대로 queue에 넣는 QueueHandler """
 
-        self.__logger.debug(msg)
+    def prepare(self, record):
+        return record
 
-    def info(self, msg, pretty=True):
-        if pretty:
-            msg = self.make_pretty(msg)
 
-        self.__logger.info(msg)
+# logger 이름: 현재 사용 중인 Logger, 종료시 모두 close
+_loggers = {}
 
-    def warning(self, msg, pretty=True):
-        if pretty:
-            msg = self.make_pretty(msg)
 
-        self.__logger.warning(msg)
+def _closeAll():
+    for logger in list(_loggers.values()):
+        logger.close()
 
-    def error(self, msg, pretty=True):
-        if pretty:
-            msg = self.make_pretty(msg)
 
-        self.__logger.error(msg)
+atexit.register(_closeAll)
 
-    def critical(self, msg, pretty=True):
-        if pretty:
-            msg = self.make_pretty(msg)
 
-        self.__logger.critical(msg)
+class Logger:
+    """ 호출한 thread에서는 LogRecord를 queue에 넣기만 하고,
+    메시지 생성(format, pprint)과 파일/화면 출력은 background listener thread에서 처리하는 logger 입니다.
+
+    level 이하의 호출은 LogRecord도 생성하지 않으며, 메시지는 아래와 같이 지연 생성할 수 있습니다.
+
+    ex) logger.debug("{}  commRqData {}", dt.now(), rqName)
+
+    dict 등 str이 아닌 메시지는 기록 시점에 pprint로 변환하므로, 기록한 이후에 변경하지 않아야 합니다.
+    pretty는 keyword로 전달해야 하며, 이전처럼 logger.debug(msg, False) 형태로 bool 하나만
+    전달하면 pretty로 처리하고 DeprecationWarning을 발생시킵니다.
+    같은 name으로 다시 생성하면 이전 Logger는 close() 됩니다.
+
+    structured=True이면 파일에는 event 한 건당 한 줄의 JSONL로 기록하며,
+    날짜와 크기(maxBytes)에 따라 파일을 나누고 닫은 파일은 압축합니다. (EventLogHandler, readEvents() 참고)
+
+    Parameters
+    ----------
+    path: str
+        log 폴더, 일자별 {YYYYMMDD}.txt 파일에 기록 (날짜가 바뀌면 새 파일)
+    name: str
+    level: int
+        default=logging.DEBUG
+    structured: bool
+        JSONL event log 사용 여부
+    maxBytes: int
+        structured=True인 경우 파일 최대 크기
+    """
+
+    def __init__(self, path, name="", level=logging.DEBUG, structured=False, maxBytes=64 * 1024 * 1024):
+        self.propagate = 0
+        self.makeLogFolder(path)
+
+        # 같은 이름의 Logger를 다시 생성하면 이전 listener와 handler를 종료
+        previous = _loggers.get(name)
+        if previous is not None:
+            previous.close()
+
+        # 로깅용 설정파일
+        self.__logger = logging.getLogger(name)
+        self.__logger.setLevel(level)
+        self.__logger.propagate = False
+
+        formatter = PrettyFormatter()
+        if structured:
+            fileHandler = EventLogHandler(path, maxBytes=maxBytes)
+        else:
+            fileHandler = DailyFileHandler(path)
+            fileHandler.setFormatter(formatter)
+        streamHandler = logging.StreamHandler()
+        streamHandler.setFormatter(formatter)
+
+        self.__name = name
+        self.__handlers = (fileHandler, streamHandler)
+        self.__queue = queue.Queue(-1)
+        self.__queueHandler = RecordQueueHandler(self.__queue)
+        self.__listener = logging.handlers.QueueListener(
+            self.__queue, *self.__handlers, respect_handler_level=True
+        )
+        self.__listener.start()
+        self.__logger.addHandler(self.__queueHandler)
+        _loggers[name] = self
+
+    def makeLogFolder(self, path):
+        if not os.path.exists(path):
+            os.mkdir(path)
 
-    def make_pretty(self, msg):
-        if isinstance(msg, str):
-            return msg
-        return pprint.pformat(msg)
+    def isEnabledFor(self, level):
+        return self.__logger.isEnabledFor(level)
+
+    def setLevel(self, level):
+        self.__logger.setLevel(level)
+
+    def close(self):
+        """ queue에 남은 log를 모두 기록하고 listener thread를 종료 """
+
+        if self.__listener is None:
+            return
+        self.__logger.removeHandler(self.__queueHandler)
+        self.__listener.stop()
+        self.__listener = None
+        for handler in self.__handlers:
+            handler.close()
+        if _loggers.get(self.__name) is self:
+            del _loggers[self.__name]
+
+    def __log(self, level, msg, args, pretty):
+        # 이전 signature (msg, pretty=True) 호환
+        if len(args) == 1 and isinstance(args[0], bool):
+            warnings.warn(
+                "pass pretty as a keyword argument: logger.debug(msg, pretty=False)",
+                DeprecationWarning,
+                stacklevel=3,
+            )
+            pretty, args = args[0], ()
+
+        if not self.__logger.isEnabledFor(level):
+            return
+
+        # 호출 위치(findCaller) 탐색 없이 LogRecord 생성
+        record = self.__logger.makeRecord(
+            self.__logger.name, level, "", 0, msg, (), None,
+            extra={"fmtArgs": args, "pretty": pretty},
+        )
+        self.__logger.handle(record)
+
+    def debug(self, msg, *args, pretty=True):
+        self.__log(logging.DEBUG, msg, args, pretty)
+
+    def info(self, msg, *args, pretty=True):
+        self.__log(logging.INFO, msg, args, pretty)
+
+    def warning(self, msg, *args, pretty=True):
+        self.__log(logging.WARNING, msg, args, pretty)
+
+    def error(self, msg, *args, pretty=True):
+        self.__log(logging.ERROR, msg, args, pretty)
+
+    def critical(self, msg, *args, pretty=True):
+        self.__log(logging.CRITICAL, msg, args, pretty)
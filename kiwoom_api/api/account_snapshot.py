@@ -0,0 +1,173 @@
+from collections import namedtuple
+from types import MappingProxyType
+import time
+
+from .order_book import normalizeCode
+
+
+def _toNumber(x, cls=int):
+    x = (x or "").strip().replace(",", "")
+    if not x:
+        return cls(0)
+    try:
+        return cls(x)
+    except ValueError:
+        return cls(float(x))
+
+
+# OPW00004 싱글데이터 중 숫자로 변환하지 않는 항목, 실수 항목
+SUMMARY_TEXT_KEYS = ("계좌명", "지점명")
+SUMMARY_FLOAT_KEYS = ("당일손익율", "당월손익율", "누적손익율")
+
+
+Holding = namedtuple(
+    "Holding",
+    [
+        "code",  # 종목코드
+        "name",  # 종목명
+        "qty",  # 보유수량
+        "avgPrice",  # 평균단가
+        "curPrice",  # 현재가
+        "buyAmount",  # 매입금액
+        "evalAmount",  # 평가금액
+        "pnl",  # 손익금액
+        "pnlRate",  # 손익율
+    ],
+)
+
+
+UnExOrder = namedtuple(
+    "UnExOrder",
+    [
+        "orderNo",  # 주문번호
+        "origOrderNo",  # 원주문번호
+        "code",  # 종목코드
+        "name",  # 종목명
+        "orderType",  # 주문구분 (+매수, -매도, 매수정정, ..)
+        "state",  # 주문상태 (접수, 확인, ..)
+        "qty",  # 주문수량
+        "price",  # 주문가격
+        "unExQty",  # 미체결수량
+        "time",  # 시간
+    ],
+)
+
+
+class AccountSnapshot(
+    namedtuple("AccountSnapshot", ["accNo", "timestamp", "summary", "holdings", "unExOrders"])
+):
+    """ 계좌 한 개의 평가현황(OPW00004)과 미체결(OPT10075)을 한 시점에 조회한 결과입니다.
+
+    namedtuple이므로 생성 이후 변경할 수 없으며, 여러 곳에서 같은 객체를 공유해도 안전합니다.
+    DataFeeder.getAccountSnapshot()을 참고하시길 바랍니다.
+
+    Attributes
+    ----------
+    accNo: str
+        계좌번호
+    timestamp: float
+        조회 시각 (time.time())
+    summary: mappingproxy
+        OPW00004 싱글데이터, 금액은 int, 손익율은 float로 변환
+    holdings: tuple of Holding
+        보유 종목 (보유수량이 0인 종목 제외)
+    unExOrders: tuple of UnExOrder
+        미체결 주문
+    """
+
+    __slots__ = ()
+
+    @classmethod
+    def fromTr(cls, accNo, OPW00004, OPT10075, timestamp=None):
+        """ DataFeeder.request()와 같은 형태의 TR 결과로 생성
+
+        Parameters
+        ----------
+        accNo: str
+        OPW00004: dict
+            계좌평가현황요청 결과
+        OPT10075: dict
+            실시간미체결요청 결과
+        timestamp: float
+            조회 시각, default=None(현재 시각)
+        """
+
+        single = OPW00004.get("싱글데이터") or {}
+        summary = {}
+        for key, value in single.items():
+            if key in SUMMARY_TEXT_KEYS:
+                summary[key] = value.strip()
+            else:
+                summary[key] = _toNumber(value, float if key in SUMMARY_FLOAT_KEYS else int)
+
+        holdings = []
+        for row in OPW00004.get("멀티데이터") or []:
+            holding = Holding(
+                code=normalizeCode(row.get("종목코드", "").strip()),
+                name=row.get("종목명", "").strip(),
+                qty=_toNumber(row.get("보유수량")),
+                avgPrice=_toNumber(row.get("평균단가")),
+                curPrice=abs(_toNumber(row.get("현재가"))),
+                buyAmount=_toNumber(row.get("매입금액")),
+                evalAmount=_toNumber(row.get("평가금액")),
+                pnl=_toNumber(row.get("손익금액")),
+                pnlRate=_toNumber(row.get("손익율"), float),
+            )
+            if holding.code and holding.qty:
+                holdings.append(holding)
+
+        unExOrders = []
+        for row in OPT10075.get("멀티데이터") or []:
+            orderNo = row.get("주문번호", "").strip()
+            if not orderNo:
+                continue
+            unExOrders.append(
+                UnExOrder(
+                    orderNo=orderNo,
+                    origOrderNo=row.get("원구문번호", "").strip(),
+                    code=normalizeCode(row.get("종목코드", "").strip()),
+                    name=row.get("종목명", "").strip(),
+                    orderType=row.get("주문구분", "").strip(),
+                    state=row.get("주문상태", "").strip(),
+                    qty=_toNumber(row.get("주문수량")),
+                    price=abs(_toNumber(row.get("주문가격"))),
+                    unExQty=_toNumber(row.get("미체결수량")),
+                    time=row.get("시간", "").strip(),
+                )
+            )
+
+        return cls(
+            accNo=accNo,
+            timestamp=time.time() if timestamp is None else timestamp,
+            summary=MappingProxyType(summary),
+            holdings=tuple(holdings),
+            unExOrders=tuple(unExOrders),
+        )
+
+    @property
+    def deposit(self):
+        """ D+2 추정예수금 """
+
+        return self.summary.get("D+2추정예수금", 0)
+
+    @property
+    def codes(self):
+        """ 보유 종목코드 """
+
+        return [holding.code for holding in self.holdings]
+
+    @property
+    def age(self):
+        """ 조회 이후 경과 시간(ms) """
+
+        return (time.time() - self.timestamp) * 1000
+
+    def isFresh(self, maxAge):
+        """ 조회 이후 maxAge(ms)가 지나지 않았으면 True """
+
+        return self.age <= maxAge
+
+    def getHolding(self, code):
+        """ 종목의 Holding, 보유하지 않은 종목이면 None """
+
+        return next((holding for holding in self.holdings if holding.code == code), None)
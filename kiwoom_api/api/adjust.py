@@ -0,0 +1,104 @@
+import numpy as np
+
+
+class PriceAdjuster:
+    """ 분봉/일봉 array의 수정주가구분, 수정비율로 수정주가(back-adjusted OHLCV)를 계산하는 클래스입니다.
+
+    권리 발생 bar의 수정비율(%)을 그 이전 bar 전체에 곱하는 방식이며,
+    bar i의 수정계수는 i 이후 발생한 권리의 수정비율의 곱입니다.
+    이를 누적곱 F(i) = (i 이하 bar의 수정비율의 곱)으로 저장하여 F(마지막) / F(i)로 계산하므로,
+    bar가 append 되면 추가된 bar의 누적곱만 계산합니다. (key별 cache)
+
+    수정주가가 적용되지 않은 원주가(수정주가구분=0으로 요청한 TR 결과)에 사용해야 합니다.
+    DataFeeder.getAdjustedMinuteBars()를 참고하시길 바랍니다.
+    """
+
+    PRICE_COLUMNS = ("open", "high", "low", "close")
+
+    def __init__(self):
+        # key: [누적곱 buffer, 계산한 bar 수]
+        self.cumulative = {}
+
+    @staticmethod
+    def eventFactors(adjType, adjRatio):
+        """ bar별 수정비율 (권리가 없는 bar는 1) """
+
+        adjType = np.asarray(adjType)
+        adjRatio = np.asarray(adjRatio, dtype=np.float64)
+        return np.where((adjType != 0) & (adjRatio > 0), adjRatio / 100.0, 1.0)
+
+    def factors(self, adjType, adjRatio, key=None):
+        """ bar별 누적곱 F
+
+        Parameters
+        ----------
+        adjType, adjRatio: numpy.ndarray
+            시각 순서로 정렬된 수정주가구분, 수정비율(%)
+        key: str
+            cache key (ex: 종목코드), 이전에 계산한 bar 수보다 늘어난 bar만 계산.
+            None이면 cache 하지 않음
+
+        Returns
+        ----------
+        numpy.ndarray
+        """
+
+        n = len(adjType)
+        if key is None:
+            return np.cumprod(self.eventFactors(adjType, adjRatio))
+
+        buffer, count = self.cumulative.get(key, (None, 0))
+        if buffer is None or count > n:  # 처음 계산하거나 bar가 줄어든 경우 다시 계산
+            buffer, count = np.empty(max(n, 1), dtype=np.float64), 0
+        elif len(buffer) < n:  # buffer 확장
+            grown = np.empty(max(n, 2 * len(buffer)), dtype=np.float64)
+            grown[:count] = buffer[:count]
+            buffer = grown
+
+        if count < n:
+            base = buffer[count - 1] if count else 1.0
+            tail = np.cumprod(self.eventFactors(adjType[count:n], adjRatio[count:n]))
+            buffer[count:n] = tail * base
+            count = n
+
+        self.cumulative[key] = (buffer, count)
+        return buffer[:n]
+
+    def adjust(self, bars, key=None, start=0, stop=None):
+        """ 수정주가 계산
+
+        Parameters
+        ----------
+        bars: dict
+            시각 순서로 정렬된 {column: array}, BarStore.read() 혹은 BarStore.COLUMNS 형태
+        key: str
+            누적곱 cache key, default=None(cache 하지 않음)
+        start, stop: int
+            반환할 bar 구간 (BarStore.seek() 참고), 수정계수는 전체 bar 기준
+
+        Returns
+        ----------
+        dict
+            {"time", "open", "high", "low", "close", "volume", "factor"},
+            가격은 수정계수를 곱하여 반올림, 거래량은 수정계수로 나누어 반올림
+        """
+
+        cumulative = self.factors(bars["adjType"], bars["adjRatio"], key=key)
+        stop = len(cumulative) if stop is None else stop
+
+        last = cumulative[-1] if len(cumulative) else 1.0
+        factor = last / cumulative[start:stop]
+
+        adjusted = {"time": bars["time"][start:stop], "factor": factor}
+        for column in self.PRICE_COLUMNS:
+            adjusted[column] = np.rint(bars[column][start:stop] * factor).astype(np.int64)
+        adjusted["volume"] = np.rint(bars["volume"][start:stop] / factor).astype(np.int64)
+        return adjusted
+
+    def reset(self, key=None):
+        """ cache 삭제, key가 None이면 전체 """
+
+        if key is None:
+            self.cumulative.clear()
+        else:
+            self.cumulative.pop(key, None)
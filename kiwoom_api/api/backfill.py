@@ -0,0 +1,287 @@
+from datetime import datetime as dt, timedelta
+import json
+import math
+import os
+
+import numpy as np
+
+from .errors import KiwoomTrNotSupported, ParameterValueError
+from .order_book import normalizeCode
+from .return_codes import TRKeys, TRName
+
+
+class JsonlSink:
+    """ BackfillJob의 결과를 종목코드와 함께 JSONL 파일에 append 하는 sink 입니다.
+
+    Parameters
+    ----------
+    filePath: str
+    """
+
+    def __init__(self, filePath):
+        self.filePath = filePath
+
+    def __call__(self, code, rows):
+        with open(self.filePath, "a", encoding="utf-8") as f:
+            for row in rows:
+                f.write(json.dumps(dict(row, 종목코드=code), ensure_ascii=False))
+                f.write("\n")
+
+
+class BackfillJob:
+    """ 여러 종목의 과거 데이터를 TR 요청 제한(1초 5회, 1시간 1,000회) 이내에서 수집하는 작업입니다.
+
+    종목마다 최근 데이터부터 연속조회하여 기간의 시작일자에 도달하면 다음 종목으로 넘어가며,
+    수신한 page는 즉시 sink(code, rows)로 전달하고 (종목, page) 단위로 checkpoint에 기록합니다.
+    중단된 작업을 같은 checkpoint로 다시 실행하면 완료한 종목은 건너뛰고,
+    진행 중이던 종목은 입력값에 "{date}"가 있으면 마지막으로 받은 일자 이전부터,
+    없으면 처음부터 요청하되 이미 전달한 행은 제외합니다.
+
+    ex) OPT10059 종목별투자자기관별요청
+        template = {
+            "일자": "{date}",
+            "종목코드": "{code}",
+            "금액수량구분": "1",
+            "매매구분": "0",
+            "단위구분": "1",
+        }
+
+    Parameters
+    ----------
+    feeder: DataFeeder
+    trCode: str
+    template: dict
+        TR 입력값, "{code}"는 종목코드, "{date}"는 조회 기준일자(YYYYMMDD)로 변환
+    codes: list of str
+        종목코드
+    start: str
+        수집 시작일자(YYYYMMDD), None이면 연속조회가 끝날 때까지
+    end: str
+        수집 종료일자(YYYYMMDD), default=None(당일)
+    sink: callable
+        sink(code, rows), rows는 수신한 멀티데이터 list
+    checkpointPath: str
+        checkpoint 파일 경로, None이면 기록하지 않음
+    rowsPerPage: int
+        요청 1회에 수신하는 행 수, 요청 횟수 추정에 사용 (None이면 종목당 1회로 추정)
+    maxPages: int
+        종목당 최대 요청 횟수
+    dateKey: str
+        멀티데이터의 일자 항목, default=None(TR 항목 중 "일자", "날짜", "체결시간")
+    """
+
+    DATE_KEYS = ("일자", "날짜", "체결시간")
+
+    def __init__(
+        self,
+        feeder,
+        trCode,
+        template,
+        codes,
+        start=None,
+        end=None,
+        sink=None,
+        checkpointPath=None,
+        rowsPerPage=None,
+        maxPages=None,
+        dateKey=None,
+        scrNo="0102",
+    ):
+        trCode = trCode.upper()
+        try:
+            self.trName = getattr(TRName, trCode)
+            keys = getattr(TRKeys, trCode).get("멀티데이터", [])
+        except AttributeError:
+            raise KiwoomTrNotSupported()
+
+        if dateKey is None:
+            dateKey = next((key for key in self.DATE_KEYS if key in keys), None)
+        if start is not None and dateKey is None:
+            raise ParameterValueError("{} 멀티데이터의 일자 항목(dateKey)을 지정해야 합니다.".format(trCode))
+
+        self.feeder = feeder
+        self.kiwoom = feeder.kiwoom
+        self.trCode = trCode
+        self.template = dict(template)
+        self.codes = list(dict.fromkeys(normalizeCode(code.strip()) for code in codes))
+        self.start = start
+        self.end = end or dt.now().strftime("%Y%m%d")
+        self.sink = sink
+        self.checkpointPath = checkpointPath
+        self.rowsPerPage = rowsPerPage
+        self.maxPages = maxPages
+        self.dateKey = dateKey
+        self.scrNo = scrNo
+
+        # 종목코드: {"pages": 요청 횟수, "cursor": 마지막으로 받은 일자, "rows": 전달한 행 수, "done": bool}
+        self.progress = {}
+        self.__loadCheckpoint()
+
+    @property
+    def isDateSeekable(self):
+        """ 입력값으로 조회 기준일자를 지정할 수 있는 TR인지 여부 """
+
+        return any("{date}" in str(value) for value in self.template.values())
+
+    @property
+    def pendingCodes(self):
+        return [code for code in self.codes if not self.progress.get(code, {}).get("done")]
+
+    ###### 계획 ######
+
+    def estimateRequests(self, code):
+        """ 종목의 남은 요청 횟수 추정 """
+
+        state = self.progress.get(code, {})
+        if state.get("done"):
+            return 0
+        if self.start is None or not self.rowsPerPage:
+            return 1
+
+        # 이어서 요청할 구간의 영업일 수
+        end = state.get("cursor") if self.isDateSeekable and state.get("cursor") else self.end
+        days = np.busday_count(
+            np.datetime64(self.__isoDate(self.start)),
+            np.datetime64(self.__isoDate(end)) + np.timedelta64(1, "D"),
+        )
+        pages = max(1, math.ceil(max(0, days) / self.rowsPerPage))
+        if self.maxPages is not None:
+            pages = min(pages, max(0, self.maxPages - state.get("pages", 0)))
+        return pages
+
+    def plan(self):
+        """ 남은 요청 횟수와 요청 제한에 따른 예상 소요시간
+
+        Returns
+        ----------
+        dict
+            {"codes": 전체 종목 수, "pending": 남은 종목 수, "requests": 남은 요청 횟수(추정),
+             "budget": 지연 없이 요청 가능한 횟수, "eta": 예상 소요시간(초), "finishAt": 예상 종료 시각}
+        """
+
+        pending = self.pendingCodes
+        requests = sum(self.estimateRequests(code) for code in pending)
+        delayCheck = self.kiwoom.requestDelayCheck
+        eta = delayCheck.estimate(requests)
+        return {
+            "codes": len(self.codes),
+            "pending": len(pending),
+            "requests": requests,
+            "budget": delayCheck.remaining(),
+            "eta": round(eta, 1),
+            "finishAt": (dt.now() + timedelta(seconds=eta)).strftime("%Y-%m-%d %H:%M:%S"),
+        }
+
+    ###### 실행 ######
+
+    def run(self):
+        """ 남은 종목을 순서대로 수집합니다.
+        요청 제한은 commRqData()의 requestDelayCheck가 관리합니다.
+
+        Returns
+        ----------
+        dict
+            {종목코드: 전달한 행 수}
+        """
+
+        for code in self.pendingCodes:
+            self.__runCode(code)
+            self.kiwoom.logger.debug(
+                "BackfillJob {} {} : {}".format(self.trCode, code, self.progress[code])
+            )
+        return {code: self.progress.get(code, {}).get("rows", 0) for code in self.codes}
+
+    def __runCode(self, code):
+        state = self.progress.setdefault(code, {"pages": 0, "cursor": None, "rows": 0, "done": False})
+
+        # 진행 중이던 종목: 마지막 일자 이전부터 요청하거나, 이미 전달한 행을 제외
+        cursor = state["cursor"]
+        date = self.end
+        skipUntil = None
+        if cursor is not None:
+            if self.isDateSeekable:
+                date = (dt.strptime(cursor[:8], "%Y%m%d") - timedelta(days=1)).strftime("%Y%m%d")
+            else:
+                skipUntil = cursor
+
+        inputs = {key: str(value).format(code=code, date=date) for key, value in self.template.items()}
+
+        inquiry = 0
+        while True:
+            for key, value in inputs.items():
+                self.kiwoom.setInputValue(key, value)
+            self.kiwoom.commRqData(self.trName, self.trCode, inquiry, self.scrNo)
+            data = getattr(self.kiwoom, self.trCode)
+            rows = data.get("멀티데이터", [])
+
+            reachedStart = False
+            if self.dateKey is not None and rows:
+                dates = [row[self.dateKey].strip() for row in rows]
+                if skipUntil is not None:
+                    rows = [row for row, d in zip(rows, dates) if d < skipUntil]
+                    dates = [d for d in dates if d < skipUntil]
+                if self.start is not None:
+                    reachedStart = bool(dates) and min(dates)[:8] < self.start
+                    rows = [row for row, d in zip(rows, dates) if d[:8] >= self.start]
+                    dates = [d for d in dates if d[:8] >= self.start]
+                if dates:
+                    state["cursor"] = min(dates)
+
+            if rows and self.sink is not None:
+                self.sink(code, rows)
+
+            state["pages"] += 1
+            state["rows"] += len(rows)
+            state["done"] = (
+                not self.kiwoom.isNext
+                or not data.get("멀티데이터")
+                or reachedStart
+                or (self.maxPages is not None and state["pages"] >= self.maxPages)
+            )
+            self.__saveCheckpoint()
+
+            if state["done"]:
+                return
+            inquiry = 2
+
+    @staticmethod
+    def __isoDate(date):
+        return "{}-{}-{}".format(date[:4], date[4:6], date[6:8])
+
+    ###### checkpoint ######
+
+    def __signature(self):
+        return {
+            "trCode": self.trCode,
+            "template": self.template,
+            "start": self.start,
+            "end": self.end,
+        }
+
+    def __loadCheckpoint(self):
+        if not self.checkpointPath or not os.path.exists(self.checkpointPath):
+            return
+
+        try:
+            with open(self.checkpointPath, "r", encoding="utf-8") as f:
+                checkpoint = json.load(f)
+        except (OSError, ValueError):
+            return
+
+        # 다른 작업의 checkpoint는 사용하지 않음
+        if checkpoint.get("job") == self.__signature():
+            self.progress = checkpoint.get("progress", {})
+
+    def __saveCheckpoint(self):
+        if not self.checkpointPath:
+            return
+
+        tmpPath = self.checkpointPath + ".tmp"
+        with open(tmpPath, "w", encoding="utf-8") as f:
+            json.dump(
+                {"job": self.__signature(), "progress": self.progress},
+                f,
+                ensure_ascii=False,
+                separators=(",", ":"),
+            )
+        os.replace(tmpPath, self.checkpointPath)
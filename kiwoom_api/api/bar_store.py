@@ -0,0 +1,518 @@
+from datetime import datetime as dt
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from ..utility.utility import removeSign
+from .errors import ParameterValueError
+from .order_book import normalizeCode
+
+
+class BarStore:
+    """ 종목별 시계열 bar(분봉, 일봉)를 로컬에 저장하는 클래스입니다.
+
+    종목마다 폴더를 두고 column별 binary 파일에 시간순으로 append만 합니다.
+    (ex: {path}/005930/time.bin, open.bin, ..)
+    저장된 행 수는 meta.json에 기록하며, append 도중 중단되어 meta.json보다 길어진
+    column 파일은 다음 append 시 잘라냅니다.
+
+    읽기는 column 파일을 memory-map 하므로 text 변환이나 복사 없이 필요한 구간만 읽으며,
+    일자별 첫 행의 위치를 기록한 sparse index(dates.bin, offsets.bin)로
+    기간 조회 시 일자 구간을 O(log n)으로 찾습니다.
+
+    Parameters
+    ----------
+    path: str
+        저장 폴더, bar 종류(분봉 틱범위, 일봉 등)마다 다른 폴더를 사용
+    """
+
+    # column: dtype
+    COLUMNS = (
+        ("time", "datetime64[s]"),
+        ("open", "int64"),
+        ("high", "int64"),
+        ("low", "int64"),
+        ("close", "int64"),
+        ("volume", "int64"),
+        ("adjType", "int32"),  # 수정주가구분
+        ("adjRatio", "float64"),  # 수정비율
+        ("adjEvent", "int32"),  # 수정주가이벤트
+        ("prevClose", "int64"),  # 전일종가
+    )
+
+    META_FILE = "meta.json"
+
+    # sparse date index: 일자, 일자별 첫 행의 위치
+    INDEX_COLUMNS = (("dates", "datetime64[D]"), ("offsets", "int64"))
+
+    def __init__(self, path):
+        if not os.path.exists(path):
+            os.makedirs(path)
+
+        self.path = path
+        self.dtypes = {name: np.dtype(dtype) for name, dtype in self.COLUMNS}
+        self.indexDtypes = {name: np.dtype(dtype) for name, dtype in self.INDEX_COLUMNS}
+        self.__meta = {}  # 종목코드: meta.json
+        self.__maps = {}  # 종목코드: (행 수, {column: memmap})
+
+    def __contains__(self, code):
+        return self.rows(code) > 0
+
+    @property
+    def codes(self):
+        """ 저장된 종목코드 목록 """
+
+        return sorted(
+            name
+            for name in os.listdir(self.path)
+            if os.path.exists(os.path.join(self.path, name, self.META_FILE))
+        )
+
+    def codePath(self, code):
+        return os.path.join(self.path, normalizeCode(code))
+
+    def columnPath(self, code, name):
+        return os.path.join(self.codePath(code), "{}.bin".format(name))
+
+    def rows(self, code):
+        """ 저장된 행 수 """
+
+        return self.__loadMeta(code)["rows"]
+
+    def __loadMeta(self, code):
+        code = normalizeCode(code)
+        meta = self.__meta.get(code)
+        if meta is None:
+            metaPath = os.path.join(self.codePath(code), self.META_FILE)
+            if os.path.exists(metaPath):
+                with open(metaPath, "r", encoding="utf-8") as f:
+                    meta = json.load(f)
+            else:
+                meta = {"rows": 0, "days": 0}
+
+            # index가 없는 이전 형식이면 time column으로 index를 생성
+            if "days" not in meta:
+                meta = self.__buildIndex(code, meta)
+            self.__meta[code] = meta
+        return meta
+
+    def lastTime(self, code):
+        """ 저장된 마지막 bar의 시각(high-water mark), 없으면 None
+
+        Returns
+        ----------
+        numpy.datetime64
+        """
+
+        rows = self.rows(code)
+        if not rows:
+            return None
+
+        dtype = self.dtypes["time"]
+        with open(self.columnPath(code, "time"), "rb") as f:
+            f.seek((rows - 1) * dtype.itemsize)
+            return np.frombuffer(f.read(dtype.itemsize), dtype=dtype)[0]
+
+    def read(self, code):
+        """ 저장된 bar 전체를 column별 array의 dict로 반환
+        column 파일을 memory-map한 read-only array이며, 저장된 행이 없으면 빈 array
+        """
+
+        code = normalizeCode(code)
+        rows = self.rows(code)
+        cached = self.__maps.get(code)
+        if cached is not None and cached[0] == rows:
+            return cached[1]
+
+        columns = {
+            name: self.__map(self.columnPath(code, name), dtype, rows)
+            for name, dtype in self.dtypes.items()
+        }
+        self.__maps[code] = (rows, columns)
+        return columns
+
+    @staticmethod
+    def __map(filePath, dtype, count):
+        if not count:
+            return np.empty(0, dtype=dtype)
+        return np.memmap(filePath, dtype=dtype, mode="r", shape=(count,))
+
+    def dateIndex(self, code):
+        """ sparse date index
+
+        Returns
+        ----------
+        tuple
+            (일자 array(datetime64[D]), 일자별 첫 행의 위치 array)
+        """
+
+        days = self.__loadMeta(code)["days"]
+        return tuple(
+            self.__map(self.indexPath(code, name), dtype, days)
+            for name, dtype in self.indexDtypes.items()
+        )
+
+    def indexPath(self, code, name):
+        return os.path.join(self.codePath(code), "{}.idx".format(name))
+
+    def seek(self, code, start=None, end=None):
+        """ 기간에 해당하는 행 구간
+
+        sparse date index로 일자 구간을 찾은 뒤, 그 구간의 time column에서만
+        시각을 찾습니다.
+
+        Parameters
+        ----------
+        start: str, datetime, numpy.datetime64
+            시작 시각(포함), ex) "20200313", "2020-03-13 09:30", None이면 처음부터
+        end: str, datetime, numpy.datetime64
+            종료 시각(포함), 일자만 지정하면 그 날의 마지막 bar까지, None이면 끝까지
+
+        Returns
+        ----------
+        tuple
+            (시작 행, 종료 행(미포함))
+        """
+
+        rows = self.rows(code)
+        if not rows:
+            return 0, 0
+
+        dates, offsets = self.dateIndex(code)
+        times = self.read(code)["time"]
+
+        def locate(t):
+            """ t 이상인 첫 행 """
+
+            day = t.astype("datetime64[D]")
+            i = np.searchsorted(dates, day, side="left")
+            if i == len(dates):
+                return rows
+            lo = int(offsets[i])
+            if dates[i] != day:  # t가 포함된 일자의 bar가 없음
+                return lo
+            hi = int(offsets[i + 1]) if i + 1 < len(dates) else rows
+            return lo + int(np.searchsorted(times[lo:hi], t, side="left"))
+
+        lo = 0 if start is None else locate(toTime(start))
+        hi = rows if end is None else locate(toTime(end, inclusive=True))
+        return lo, max(lo, hi)
+
+    def load(self, codes, start=None, end=None, columns=None, frame=False):
+        """ 여러 종목의 기간 bar를 시각 기준으로 정렬된 array로 반환
+
+        Parameters
+        ----------
+        codes: list of str
+            종목코드
+        start, end:
+            seek() 참고
+        columns: list of str
+            반환할 column, default=None(time 이외 전체)
+        frame: bool
+            True이면 (종목코드, time) MultiIndex의 DataFrame으로 반환
+
+        Returns
+        ----------
+        dict
+            {"time": 모든 종목의 시각 합집합, "codes": 종목코드 list,
+             column: (시각 수, 종목 수) float64 array, bar가 없는 시각은 NaN}
+            frame=True이면 pandas.DataFrame
+        """
+
+        if isinstance(codes, str):
+            codes = [codes]
+        codes = [normalizeCode(code) for code in codes]
+        if columns is None:
+            columns = [name for name in self.dtypes if name != "time"]
+
+        slices = {}
+        for code in codes:
+            lo, hi = self.seek(code, start, end)
+            data = self.read(code)
+            slices[code] = {name: data[name][lo:hi] for name in ["time"] + list(columns)}
+
+        if frame:
+            return self.__toFrame(codes, columns, slices)
+
+        times = [slices[code]["time"] for code in codes]
+        union = np.unique(np.concatenate(times)) if times else np.empty(0, "datetime64[s]")
+
+        result = {"time": union, "codes": codes}
+        for name in columns:
+            result[name] = np.full((len(union), len(codes)), np.nan)
+        for j, code in enumerate(codes):
+            positions = np.searchsorted(union, slices[code]["time"])
+            for name in columns:
+                result[name][positions, j] = slices[code][name]
+        return result
+
+    def __toFrame(self, codes, columns, slices):
+        counts = [len(slices[code]["time"]) for code in codes]
+        index = pd.MultiIndex.from_arrays(
+            [
+                np.repeat(np.array(codes, dtype=object), counts),
+                np.concatenate([slices[code]["time"] for code in codes])
+                if codes
+                else np.empty(0, "datetime64[s]"),
+            ],
+            names=["종목코드", "time"],
+        )
+        data = {
+            name: np.concatenate([slices[code][name] for code in codes])
+            if codes
+            else np.empty(0, self.dtypes[name])
+            for name in columns
+        }
+        return pd.DataFrame(data, index=index, columns=list(columns))
+
+    def append(self, code, columns):
+        """ bar를 append 합니다.
+
+        이미 저장된 마지막 시각 이전(같은 시각 포함)의 bar는 제외하고,
+        시각 순서로 정렬하여 추가합니다.
+
+        Parameters
+        ----------
+        code: str
+            종목코드
+        columns: dict
+            {column: array}, COLUMNS의 모든 column
+
+        Returns
+        ----------
+        int
+            추가된 행 수
+        """
+
+        missing = [name for name in self.dtypes if name not in columns]
+        if missing:
+            raise ParameterValueError("column 없음: {}".format(missing))
+
+        columns = {
+            name: np.asarray(columns[name], dtype=dtype) for name, dtype in self.dtypes.items()
+        }
+        times = columns["time"]
+
+        # 시각 순서, 중복 시각 제거
+        times, first = np.unique(times, return_index=True)
+        columns = {name: values[first] for name, values in columns.items()}
+
+        last = self.lastTime(code)
+        if last is not None:
+            keep = times > last
+            columns = {name: values[keep] for name, values in columns.items()}
+
+        added = len(columns["time"])
+        if not added:
+            return 0
+
+        codePath = self.codePath(code)
+        if not os.path.exists(codePath):
+            os.mkdir(codePath)
+
+        meta = self.__loadMeta(code)
+        rows, days = meta["rows"], meta["days"]
+        self.__maps.pop(normalizeCode(code), None)
+
+        # 새로 시작되는 일자의 첫 행
+        newDays = columns["time"].astype("datetime64[D]")
+        starts = np.flatnonzero(np.r_[True, newDays[1:] != newDays[:-1]])
+        if last is not None and newDays[0] == last.astype("datetime64[D]"):
+            starts = starts[1:]
+        index = {"dates": newDays[starts], "offsets": starts + rows}
+
+        self.__write(
+            [(self.columnPath(code, name), rows * dtype.itemsize, columns[name])
+             for name, dtype in self.dtypes.items()]
+            + [(self.indexPath(code, name), days * dtype.itemsize, index[name])
+               for name, dtype in self.indexDtypes.items()]
+        )
+        self.__writeMeta(code, rows + added, days + len(starts))
+        return added
+
+    @staticmethod
+    def __write(targets):
+        for filePath, size, values in targets:
+            with open(filePath, "ab") as f:
+                # 중단된 append의 잔여분 제거 (memory-map된 파일은 Windows에서 truncate 불가)
+                if f.seek(0, os.SEEK_END) > size:
+                    f.truncate(size)
+                f.write(values.tobytes())
+
+    def __buildIndex(self, code, meta):
+        rows = meta["rows"]
+        times = self.__map(self.columnPath(code, "time"), self.dtypes["time"], rows)
+        days = times.astype("datetime64[D]")
+        starts = np.flatnonzero(np.r_[True, days[1:] != days[:-1]])
+        index = {"dates": days[starts], "offsets": starts}
+        self.__write(
+            [(self.indexPath(code, name), 0, index[name].astype(dtype))
+             for name, dtype in self.indexDtypes.items()]
+        )
+        return self.__writeMeta(code, rows, len(starts))
+
+    def __writeMeta(self, code, rows, days):
+        code = normalizeCode(code)
+        meta = {
+            "rows": rows,
+            "days": days,
+            "columns": [list(column) for column in self.COLUMNS],
+            "updated": dt.now().strftime("%Y-%m-%d %H:%M:%S"),
+        }
+        metaPath = os.path.join(self.codePath(code), self.META_FILE)
+        tmpPath = metaPath + ".tmp"
+        with open(tmpPath, "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+        os.replace(tmpPath, metaPath)
+        self.__meta[code] = meta
+        return meta
+
+
+class SyncState:
+    """ 여러 종목의 동기화 진행 상황(완료한 종목)을 일자별로 기록하는 checkpoint 입니다.
+    같은 날 중단된 같은 작업(job)을 다시 실행하면 완료한 종목은 요청하지 않습니다.
+    모든 종목을 완료하면 clear()로 삭제해야 다음 동기화에서 다시 요청합니다.
+
+    Parameters
+    ----------
+    filePath: str
+        checkpoint 파일 경로
+    job: dict
+        작업 구분 (ex: 종목코드, 틱범위), 저장된 작업과 다르면 checkpoint를 사용하지 않음
+    """
+
+    def __init__(self, filePath, job=None):
+        self.filePath = filePath
+        self.job = job
+        self.date = dt.now().strftime("%Y%m%d")
+        self.done = {}  # 종목코드: 추가된 행 수
+
+        if os.path.exists(filePath):
+            try:
+                with open(filePath, "r", encoding="utf-8") as f:
+                    state = json.load(f)
+            except (OSError, ValueError):
+                state = {}
+            if state.get("date") == self.date and state.get("job") == job:
+                self.done = state.get("done", {})
+
+    def __contains__(self, code):
+        return code in self.done
+
+    def mark(self, code, added):
+        self.done[code] = added
+        tmpPath = self.filePath + ".tmp"
+        with open(tmpPath, "w", encoding="utf-8") as f:
+            json.dump({"date": self.date, "job": self.job, "done": self.done}, f)
+        os.replace(tmpPath, self.filePath)
+
+    def clear(self):
+        self.done = {}
+        if os.path.exists(self.filePath):
+            os.remove(self.filePath)
+
+
+def _toInt(x):
+    x = removeSign((x or "").strip())
+    return int(x) if x else 0
+
+
+def _toFloat(x):
+    x = (x or "").strip().replace(",", "")
+    return float(x) if x else 0.0
+
+
+def toTime(x, inclusive=False):
+    """ 조회 기간의 시각을 datetime64[s]로 변환
+
+    Parameters
+    ----------
+    x: str, datetime, numpy.datetime64
+        ex) "20200313", "2020-03-13", "2020-03-13 09:30", "20200313093000"
+    inclusive: bool
+        True이면 지정한 단위(일자, 분 등)의 마지막 시각 다음(미포함 종료 시각)을 반환
+    """
+
+    if isinstance(x, str):
+        x = x.strip()
+        if x.isdigit() and len(x) in (8, 12, 14):  # YYYYmmdd[HHMM[SS]]
+            x = x + "0" * (14 - len(x)) if len(x) > 8 else x
+            x = (
+                "{}-{}-{}".format(x[:4], x[4:6], x[6:8])
+                if len(x) == 8
+                else "{}-{}-{}T{}:{}:{}".format(x[:4], x[4:6], x[6:8], x[8:10], x[10:12], x[12:14])
+            )
+        x = np.datetime64(x.replace(" ", "T"))
+    else:
+        x = np.datetime64(x)
+
+    if inclusive:
+        x = x + np.timedelta64(1, np.datetime_data(x.dtype)[0])
+    return x.astype("datetime64[s]")
+
+
+def dailyBarColumns(rows):
+    """ OPT10005(주식일주월시분요청) 멀티데이터를 BarStore column의 dict로 변환
+    (수정주가 항목, 전일종가는 0)
+
+    Parameters
+    ----------
+    rows: list of dict
+        kiwoom.OPT10005["멀티데이터"]
+    """
+
+    n = len(rows)
+
+    def column(key):
+        return np.abs(np.fromiter((_toInt(row[key]) for row in rows), dtype=np.int64, count=n))
+
+    return {
+        "time": np.array([toTime(row["날짜"]) for row in rows], dtype="datetime64[s]"),
+        "open": column("시가"),
+        "high": column("고가"),
+        "low": column("저가"),
+        "close": column("종가"),
+        "volume": column("거래량"),
+        "adjType": np.zeros(n, dtype=np.int32),
+        "adjRatio": np.zeros(n, dtype=np.float64),
+        "adjEvent": np.zeros(n, dtype=np.int32),
+        "prevClose": np.zeros(n, dtype=np.int64),
+    }
+
+
+def minuteBarColumns(rows):
+    """ OPT10080(주식분봉차트조회요청) 멀티데이터를 BarStore column의 dict로 변환
+
+    Parameters
+    ----------
+    rows: list of dict
+        kiwoom.OPT10080["멀티데이터"]
+
+    Returns
+    ----------
+    dict
+        {column: array}, 요청 결과와 같은 순서(최근 bar부터)
+    """
+
+    def column(key, convert, dtype):
+        return np.fromiter((convert(row[key]) for row in rows), dtype=dtype, count=len(rows))
+
+    def toTime(x):  # YYYYmmddHHMMSS
+        x = x.strip()
+        return "{}-{}-{}T{}:{}:{}".format(x[:4], x[4:6], x[6:8], x[8:10], x[10:12], x[12:14])
+
+    return {
+        "time": np.array([toTime(row["체결시간"]) for row in rows], dtype="datetime64[s]"),
+        "open": np.abs(column("시가", _toInt, np.int64)),
+        "high": np.abs(column("고가", _toInt, np.int64)),
+        "low": np.abs(column("저가", _toInt, np.int64)),
+        "close": np.abs(column("현재가", _toInt, np.int64)),
+        "volume": np.abs(column("거래량", _toInt, np.int64)),
+        "adjType": column("수정주가구분", _toInt, np.int32),
+        "adjRatio": column("수정비율", _toFloat, np.float64),
+        "adjEvent": column("수정주가이벤트", _toInt, np.int32),
+        "prevClose": np.abs(column("전일종가", _toInt, np.int64)),
+    }
@@ -0,0 +1,188 @@
+from ..utility.utility import removeSign
+from .return_codes import FidList
+
+
+def toInt(x):
+    """ 체잔 데이터(str)를 int로 변환, 빈 문자열은 0 """
+
+    x = removeSign(x.strip())
+    return int(x) if x else 0
+
+
+def toSignedInt(x):
+    """ 부호(+, -)를 유지하여 int로 변환, 손익 항목에 사용 """
+
+    x = x.strip().replace(",", "").replace("+", "")
+    return int(x) if x else 0
+
+
+def toStr(x):
+    return x.strip()
+
+
+class _Record:
+    """ 체잔 데이터 record의 공통 기능, 하위 클래스에서 __slots__를 정의합니다. """
+
+    __slots__ = ()
+
+    def __init__(self, table, baseDate):
+        for name in self.__slots__:
+            setattr(self, name, None)
+
+        self.TABLE = table
+        self.BASC_DT = baseDate
+
+    def toDict(self):
+        """ 값이 있는 항목만 dict로 반환 (TABLE 제외) """
+
+        return {
+            name: getattr(self, name)
+            for name in self.__slots__[1:]
+            if getattr(self, name) is not None
+        }
+
+    @classmethod
+    def fromDict(cls, table, data):
+        """ toDict()(혹은 journal에 기록된 dict)로부터 record를 생성 """
+
+        record = cls(table, data.get("BASC_DT"))
+        for name in cls.__slots__[2:]:
+            value = data.get(name)
+            if value is not None:
+                setattr(record, name, value)
+        return record
+
+    def __repr__(self):
+        return "{}({!r}, {!r})".format(type(self).__name__, self.TABLE, self.toDict())
+
+
+class ChejanRecord(_Record):
+    """ 주문접수/체결/확인 이벤트(gubun '0') 한 건을 담는 클래스입니다.
+
+    수량과 가격은 int, 나머지 항목은 str로 저장되며,
+    이벤트에 포함되지 않은 항목은 None 입니다.
+    """
+
+    __slots__ = (
+        "TABLE",
+        "BASC_DT",
+        "ACCOUNT_NO",
+        "ORDER_NO",
+        "TICKER",
+        "ORDER_STATUS",
+        "NAME",
+        "ORDER_QTY",
+        "ORDER_PRICE",
+        "UNEX_QTY",
+        "ORIGINAL_ORDER_NO",
+        "ORDER_GUBUN",
+        "HOGA_TYPE",
+        "SELL_BUY_GUBUN",
+        "ORDER_TRAN_TIME",
+        "TRAN_NO",
+        "TRAN_PRICE",
+        "TRAN_QTY",
+    )
+
+    def __init__(self, table, baseDate, orderStatus=None):
+        super().__init__(table, baseDate)
+        self.ORDER_STATUS = orderStatus
+
+
+class BalanceRecord(_Record):
+    """ 잔고통보 이벤트(gubun '1') 한 건을 담는 클래스입니다. """
+
+    __slots__ = (
+        "TABLE",
+        "BASC_DT",
+        "ACCOUNT_NO",
+        "TICKER",
+        "NAME",
+        "CUR_PRICE",
+        "HOLDING_QTY",
+        "AVG_PRICE",
+        "TOTAL_BUY_PRICE",
+        "ORDERABLE_QTY",
+        "TODAY_NET_BUY_QTY",
+        "BUY_SELL_GUBUN",
+        "TODAY_SELL_PNL",
+        "DEPOSIT",
+        "TODAY_REALIZED_PNL",
+    )
+
+
+class ChejanPlan:
+    """ 주문상태별로 조회할 FID 목록을 미리 계산해 둔 클래스입니다.
+
+    FidList에 정의된 FID를 (fid, 항목명, 변환함수)의 tuple로 한 번만 변환해 두고,
+    이벤트마다 해당 FID만 GetChejanData로 조회합니다.
+    주문상태(913)는 plan 선택을 위해 이미 조회하므로 plan에서 제외합니다.
+
+    Parameters
+    ----------
+    table: str
+        journal에 기록할 table 명
+    fidDict: dict
+        {fid: 항목명}, FidList 참고
+    recordClass: type
+        ChejanRecord 혹은 BalanceRecord
+    """
+
+    CONVERTERS = {
+        "ORDER_QTY": toInt,
+        "ORDER_PRICE": toInt,
+        "UNEX_QTY": toInt,
+        "TRAN_PRICE": toInt,
+        "TRAN_QTY": toInt,
+        "CUR_PRICE": toInt,
+        "HOLDING_QTY": toInt,
+        "AVG_PRICE": toInt,
+        "TOTAL_BUY_PRICE": toInt,
+        "ORDERABLE_QTY": toInt,
+        "TODAY_NET_BUY_QTY": toSignedInt,
+        "TODAY_SELL_PNL": toSignedInt,
+        "DEPOSIT": toInt,
+        "TODAY_REALIZED_PNL": toSignedInt,
+    }
+    SKIP_FIDS = ("913",)
+
+    def __init__(self, table, fidDict, recordClass=ChejanRecord):
+        self.table = table
+        self.recordClass = recordClass
+        self.steps = tuple(
+            (fid, name, self.CONVERTERS.get(name, toStr))
+            for fid, name in fidDict.items()
+            if fid not in self.SKIP_FIDS
+        )
+
+    def fetch(self, getChejanData, baseDate, orderStatus=None):
+        """ plan에 포함된 FID를 조회하여 record를 반환합니다.
+
+        Parameters
+        ----------
+        getChejanData: callable
+            Kiwoom.getChejanData
+        baseDate: str
+            기준일자(YYYY-MM-DD)
+        orderStatus: str
+            주문상태("접수", "체결", "확인"), 잔고통보인 경우 None
+        """
+
+        record = self.recordClass(self.table, baseDate)
+        if orderStatus is not None:
+            record.ORDER_STATUS = orderStatus
+
+        for fid, name, converter in self.steps:
+            setattr(record, name, converter(getChejanData(fid)))
+        return record
+
+
+# 주문상태(FID 913)별 fetch plan
+CHEJAN_PLANS = {
+    "접수": ChejanPlan("orders_submitted", FidList.SUBMITTED),
+    "체결": ChejanPlan("orders_executed", FidList.EXECUTED),
+    "확인": ChejanPlan("orders_cancelled", FidList.CANCELLED),  # 주문취소/정정 확인
+}
+
+# 잔고통보(gubun '1') fetch plan
+BALANCE_PLAN = ChejanPlan("balance", FidList.BALANCE, recordClass=BalanceRecord)
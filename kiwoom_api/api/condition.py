@@ -0,0 +1,185 @@
+from collections import deque, defaultdict
+import time
+
+from .errors import KiwoomProcessingError, ParameterValueError
+
+
+class ConditionDelayCheck:
+    """ 조건검색 요청 제한을 관리하는 클래스입니다.
+
+    조건검색(SendCondition)은 TR 조회와 별도로 아래의 제한이 적용됩니다.
+     - 조건검색 요청은 1초에 5회 제한
+     - 같은 조건식은 1분에 1회만 조회 가능
+     - 실시간 조건검색은 최대 10개 조건식까지 동시에 등록 가능
+    """
+
+    REQUEST_PER_SEC = 5
+    SAME_CONDITION_INTERVAL = 60
+    MAX_REAL_CONDITIONS = 10
+
+    def __init__(self, logger=None):
+        self.rqHistory = deque(maxlen=self.REQUEST_PER_SEC)
+        self.lastRequestTime = {}  # 조건식명: 마지막 요청 시각
+        self.logger = logger
+
+    def remaining(self, conditionName):
+        """ 같은 조건식을 다시 요청할 수 있을 때까지 남은 시간(초)을 반환합니다. """
+
+        lastTime = self.lastRequestTime.get(conditionName)
+        if lastTime is None:
+            return 0
+
+        return max(0, self.SAME_CONDITION_INTERVAL - (time.time() - lastTime))
+
+    def checkDelay(self, conditionName, realTimeCount=0, isRealTime=False, isNext=False):
+        """ 조건검색 요청 전에 제한을 확인합니다.
+
+        1초 5회 제한은 요청을 지연하고, 같은 조건식 1분 1회 제한과
+        실시간 조건검색 갯수 제한은 KiwoomProcessingError를 발생시킵니다.
+        같은 조건식의 요청 시각은 요청이 성공한 후 record()로 기록합니다.
+
+        Parameters
+        ----------
+        isNext: bool
+            연속조회 요청인 경우 같은 조건식 1분 1회 제한을 확인하지 않음
+        """
+
+        if isRealTime and realTimeCount >= self.MAX_REAL_CONDITIONS:
+            raise KiwoomProcessingError(
+                "ERROR: 실시간 조건검색은 최대 {}개까지 가능합니다.".format(
+                    self.MAX_REAL_CONDITIONS
+                )
+            )
+
+        remaining = 0 if isNext else self.remaining(conditionName)
+        if remaining > 0:
+            raise KiwoomProcessingError(
+                "ERROR: 조건식 {} 은 {:.1f}초 후에 다시 조회할 수 있습니다.".format(
+                    conditionName, remaining
+                )
+            )
+
+        # 1초 5회 제한
+        if len(self.rqHistory) == self.REQUEST_PER_SEC:
+            delay = 1 - (time.time() - self.rqHistory[0])
+            if delay > 0:
+                time.sleep(delay)
+
+        self.rqHistory.append(time.time())
+
+    def record(self, conditionName):
+        """ 조건검색 요청이 성공한 시각을 기록합니다. """
+
+        self.lastRequestTime[conditionName] = time.time()
+
+
+class ConditionRegistry:
+    """ 조건식 목록과 조건식별 편입 종목을 관리하는 클래스입니다.
+
+    조건검색 결과(OnReceiveTrCondition)로 종목 집합을 초기화하고,
+    실시간 조건검색 이벤트(OnReceiveRealCondition)의 편입("I")/이탈("D")을
+    종목 집합에 점진적으로 반영합니다.
+    """
+
+    INSERTED = "I"
+    DELETED = "D"
+
+    def __init__(self):
+        self.conditions = {}  # 조건식명: 조건식 index
+        self.matches = defaultdict(set)  # 조건식명: 편입 종목코드 set
+        self.updatedTime = {}  # 조건식명: 마지막 갱신 시각
+        self.realTime = {}  # 실시간 조건식명: 화면번호
+        self.hasNext = set()  # 연속조회 결과가 남은 조건식명
+        self.listeners = []
+
+    @property
+    def isLoaded(self):
+        return bool(self.conditions)
+
+    def loadNameList(self, nameList):
+        """ GetConditionNameList()의 반환값을 파싱하여 저장합니다.
+
+        Parameters
+        ----------
+        nameList: str
+            "index^조건식명;index^조건식명;" 형태의 문자열
+        """
+
+        conditions = {}
+        for item in nameList.split(";"):
+            if not item:
+                continue
+            index, name = item.split("^", 1)
+            conditions[name] = int(index)
+
+        self.conditions = conditions
+        return conditions
+
+    def getIndex(self, conditionName):
+        try:
+            return self.conditions[conditionName]
+        except KeyError:
+            raise ParameterValueError(
+                "등록되지 않은 조건식입니다: {}".format(conditionName)
+            )
+
+    def setMatches(self, conditionName, codeList, isNext=False):
+        """ 조건검색 결과로 편입 종목을 설정합니다.
+
+        Parameters
+        ----------
+        conditionName: str
+        codeList: str
+            ;(세미콜론)으로 구분된 종목코드
+        isNext: bool
+            연속조회 결과인 경우 기존 종목에 추가
+        """
+
+        codes = {code for code in codeList.split(";") if code}
+        if isNext:
+            self.matches[conditionName] |= codes
+        else:
+            self.matches[conditionName] = codes
+        self.updatedTime[conditionName] = time.time()
+        return codes
+
+    def applyRealEvent(self, code, eventType, conditionName):
+        """ 실시간 조건검색 이벤트를 편입 종목에 반영합니다.
+
+        Returns
+        ----------
+        bool
+            종목 집합이 변경되었으면 True
+        """
+
+        codes = self.matches[conditionName]
+        if eventType == self.INSERTED:
+            changed = code not in codes
+            codes.add(code)
+        elif eventType == self.DELETED:
+            changed = code in codes
+            codes.discard(code)
+        else:
+            return False
+
+        self.updatedTime[conditionName] = time.time()
+        if changed:
+            for listener in self.listeners:
+                listener(conditionName, code, eventType == self.INSERTED)
+        return changed
+
+    def getMatches(self, conditionName):
+        """ 조건식에 편입된 종목코드를 반환합니다. """
+
+        return set(self.matches.get(conditionName, ()))
+
+    def addListener(self, listener):
+        """ 실시간 편입/이탈시 호출될 함수를 등록합니다.
+
+        listener(conditionName, code, isInserted)의 형태로 호출됩니다.
+        """
+
+        self.listeners.append(listener)
+
+    def removeListener(self, listener):
+        self.listeners.remove(listener)
@@ -1,11 +1,20 @@
 from collections import defaultdict
 from datetime import datetime
+import functools
 import os
 
+import numpy as np
 import pandas as pd
+from PyQt5.QtCore import QEventLoop
 
-from .errors import KiwoomConnectError, ParameterTypeError, ParameterValueError, KiwoomTrNotSupported
-from .return_codes import TRName
+from .account_snapshot import AccountSnapshot
+from .backfill import BackfillJob
+from .bar_store import BarStore, SyncState, minuteBarColumns
+from .errors import (KiwoomConnectError, KiwoomProcessingError, KiwoomTrNotSupported,
+                     ParameterTypeError, ParameterValueError)
+from .order_book import normalizeCode
+from .pipeline import RequestPipeline
+from .return_codes import TRKeys, TRName
 
 
 class DataFeeder:
@@ -15,6 +24,12 @@ class DataFeeder:
     문서](https://download.kiwoom.com/web/openapi/kiwoom_openapi_plus_devguide_ver_1.5.pdf) 혹은 KOA StudioSA를 참조하시길 바랍니다.
     """
 
+    # snapshot()에서 숫자로 변환하지 않는 항목, 절대값을 사용하는 가격 항목
+    SNAPSHOT_TEXT_COLUMNS = ("종목코드", "종목명", "체결시간", "호가시간", "일자", "ELW만기일")
+    SNAPSHOT_PRICE_COLUMNS = (
+        "현재가", "기준가", "시가", "고가", "저가", "종가", "상한가", "하한가", "예상체결가",
+    )
+
     def __init__(self, kiwoom, **kwargs):
         self.kiwoom = kiwoom
         for k, v in kwargs:
@@ -37,6 +52,32 @@ class DataFeeder:
         self.kiwoom.commRqData(trName, trCode, 0, "0000")
         return getattr(self.kiwoom, trCode)
 
+    def requestDelta(self, trCode, rowKey=None, **kwargs):
+        """ TR을 조회하여 같은 입력값으로 이전에 조회한 결과 대비 변경된 행만 반환
+
+        주기적으로 조회해야 하는 TR(OPT10075 미체결, OPW00004 보유 종목 등)에 사용하며,
+        멀티데이터의 행은 행 key(ex: 주문번호, 종목코드)로 비교한다. (TrDelta 참고)
+
+        Parameters
+        ----------
+        trCode: str
+        rowKey: str or tuple of str
+            멀티데이터의 행 key 항목, default=None(TrDelta.ROW_KEYS)
+        kwargs:
+            TR 입력값
+
+        Returns
+        ----------
+        Delta
+            (inserted, updated, deleted, single), 처음 조회한 경우 모든 행이 inserted
+        """
+
+        trDelta = self.kiwoom.trDelta
+        trDelta.rowKey(trCode, rowKey)  # 요청 전에 행 key 확인
+
+        data = self.request(trCode, **kwargs)
+        return trDelta.diff(trCode, kwargs, data, rowKey=rowKey)
+
     def __requestOPTKWFID(
         self, arrCode, next, codeCount, rqName="OPTKWFID", scrNo="0000", typeFlag=0
     ):
@@ -91,17 +132,41 @@ class DataFeeder:
     def accNo(self):
         return self.kiwoom.accNo
 
-    def getDeposit(self, accNo):
+    def getDeposit(self, accNo, maxAge=0):
         """ D+2 추정예수금 반환 
+
+        D+2추정예수금은 잔고통보로 갱신되지 않으므로 OPW00004 TR을 조회하며, 조회 결과로 ledger도 초기화한다.
+        maxAge(ms)를 지정하면 그 이내에 조회(syncLedger(), getAccountSnapshot())한 값은 TR 요청 없이 반환한다.
+        (잔고통보로 갱신되는 예수금(D+0)은 kiwoom.ledger.getCashDeposit())
+
+        Parameters
+        ----------
+        accNo: str
+        maxAge: int
+            ledger의 값을 사용할 최대 경과 시간(ms), default=0(항상 조회)
         
         Returns
         ----------
         int
         """
 
+        if not (maxAge and self.kiwoom.ledger.isFresh(accNo, maxAge)):
+            self.syncLedger(accNo)
+        return self.kiwoom.ledger.getDeposit(accNo)
+
+    def syncLedger(self, accNo):
+        """ OPW00004 TR로 ledger(보유 종목, 예수금)를 초기화 """
+
         OPW00004 = self.request("OPW00004", **{"계좌번호": accNo})
-        deposit = int(OPW00004.get("싱글데이터").get("D+2추정예수금").replace(",", ""))
-        return deposit
+        self.kiwoom.ledger.seed(accNo, OPW00004)
+        return OPW00004
+
+    def getPortfolio(self, accNo):
+        """ 보유 종목 현황을 DataFrame으로 반환 (TR 요청 없이 ledger를 사용) """
+
+        if not self.kiwoom.ledger.isSynced(accNo):
+            self.syncLedger(accNo)
+        return self.kiwoom.ledger.portfolio(accNo)
 
     def getUnExOrders(self, accNo, code=""):
         """ 미체결 정보 반환
@@ -124,6 +189,71 @@ class DataFeeder:
 
         return self.request("OPT10075", **params)
 
+    def getOpenOrders(self, accNo=None, code=None):
+        """ 미체결 주문 반환 (TR 요청 없이 주문 이벤트로 관리되는 OrderBook을 사용)
+
+        Returns
+        ----------
+        list of Order
+        """
+
+        return self.kiwoom.orderBook.getOpenOrders(code=code, accNo=accNo)
+
+    def reconcileOrders(self, accNo):
+        """ OPT10075 미체결 내역으로 OrderBook의 미체결 주문을 맞춤
+
+        Returns
+        ----------
+        dict
+            {"added": [주문번호, ..], "closed": [주문번호, ..]}
+        """
+
+        unExOrders = self.getUnExOrders(accNo).get("멀티데이터", [])
+        return self.kiwoom.orderBook.reconcile(unExOrders, accNo=accNo)
+
+    def recover(self, accNo, checkpointInterval=60000):
+        """ 재시작한 프로세스의 주문 상태와 보유 현황을 복구
+
+        당일 journal을 재생(replay)한 뒤, OPW00007(계좌별주문체결내역상세요청) 1회로
+        재시작 중 누락된 주문과 체결을 맞추고, 주기적인 checkpoint 저장을 시작한다.
+        journal 재생은 commConnect() 이전에 kiwoom.recovery.replay()로 미리 실행할 수 있다.
+
+        Parameters
+        ----------
+        accNo: str
+            계좌번호
+        checkpointInterval: int
+            checkpoint 저장 주기(ms), None이면 저장하지 않음
+
+        Returns
+        ----------
+        dict
+            {"replay": replay() 결과, "reconcile": OrderBook.reconcileHistory() 결과}
+        """
+
+        recovery = self.kiwoom.recovery
+        replayed = None if recovery.isRecovered else recovery.replay()
+
+        params = {
+            "주문일자": datetime.now().strftime("%Y%m%d"),
+            "계좌번호": accNo,
+            "비밀번호": "",
+            "비밀번호입력매체구분": "00",
+            "조회구분": "1",  # 주문순
+        }
+        OPW00007 = self.request("OPW00007", **params)
+        reconciled = self.kiwoom.orderBook.reconcileHistory(
+            OPW00007.get("멀티데이터", []),
+            accNo=accNo,
+            closeMissing=not self.kiwoom.isNext,  # 내역이 잘리지 않은 경우에만 종료 처리
+        )
+
+        if checkpointInterval is not None:
+            recovery.checkpoint()
+            recovery.startCheckpoint(checkpointInterval)
+
+        return {"replay": replayed, "reconcile": reconciled}
+
     def getAccountDict(self, accNo):
         """ 계좌 정보 """
 
@@ -137,10 +267,136 @@ class DataFeeder:
         return OPW00004.get("멀티데이터")
 
     def getInventoryCodes(self, accNo):
-        """ 현재 보유중인 종목코드 반환 """
+        """ 현재 보유중인 종목코드 반환 (ledger가 초기화되어 있으면 TR 요청 없음) """
+
+        if not self.kiwoom.ledger.isSynced(accNo):
+            self.syncLedger(accNo)
+        return self.kiwoom.ledger.getCodes(accNo)
+
+    def getAccountSnapshot(self, accNo, maxAge=0, timeout=10000):
+        """ 계좌 평가현황(OPW00004)과 미체결(OPT10075)을 한 번에 조회
+
+        두 TR을 응답을 기다리지 않고 연속으로 요청하며 (RequestPipeline 참고),
+        결과는 변경할 수 없는 AccountSnapshot으로 반환하고 계좌별로 보관한다.
+        보관 중인 snapshot이 maxAge(ms) 이내에 조회된 것이면 TR 요청 없이 반환한다.
+        OPW00004 결과로 ledger도 초기화한다. (syncLedger() 참고)
+
+        Parameters
+        ----------
+        accNo: str
+            계좌번호
+        maxAge: int
+            허용하는 snapshot의 경과 시간(ms), default=0(항상 새로 조회)
+        timeout: int
+            마지막 요청 이후 응답을 기다리는 최대 시간(ms)
+
+        Returns
+        ----------
+        AccountSnapshot
+        """
+
+        snapshot = self.kiwoom.accountSnapshots.get(accNo)
+        if snapshot is not None and maxAge and snapshot.isFresh(maxAge):
+            return snapshot
+
+        unExParams = {
+            "계좌번호": accNo,
+            "전체종목구분": "0",  # 전체
+            "매매구분": "0",  # 매수+매도
+            "체결구분": "1",  # 미체결
+        }
+
+        pipeline = RequestPipeline(self.kiwoom, timeout=timeout)
+        pipeline.add(self.__trSender("OPW00004", {"계좌번호": accNo}))
+        pipeline.add(self.__trSender("OPT10075", unExParams))
+        OPW00004, OPT10075 = pipeline.run()
+
+        if pipeline.errors:
+            raise KiwoomProcessingError(
+                "ERROR: getAccountSnapshot({}) : {}".format(accNo, pipeline.errors)
+            )
+
+        self.kiwoom.ledger.seed(accNo, OPW00004)
+        snapshot = AccountSnapshot.fromTr(accNo, OPW00004, OPT10075)
+        self.kiwoom.accountSnapshots[accNo] = snapshot
+        return snapshot
 
-        inventoryDict = self.getInventoryDict(accNo)
-        return [d.get("종목코드") for d in inventoryDict]
+    def forAccounts(self, accNos, trCode, callback=None, timeout=10000, **inputs):
+        """ 여러 계좌의 같은 TR을 동시에 조회
+
+        계좌별 요청을 서로 다른 화면번호로 응답을 기다리지 않고 요청 제한(1초 5회) 이내에서
+        연속으로 전송하며 (RequestPipeline 참고), 응답은 도착하는 즉시 callback으로 전달한다.
+        연속조회는 하지 않는다.
+
+        ex) feeder.forAccounts(None, "OPW00001", 비밀번호="", 비밀번호입력매체구분="00", 조회구분="2")
+
+        Parameters
+        ----------
+        accNos: list of str
+            계좌번호, None이면 로그인한 전체 계좌
+        trCode: str
+        callback: callable
+            callback(accNo, data) 형태로 응답이 도착하는 순서대로 호출
+        timeout: int
+            마지막 요청 이후 응답을 기다리는 최대 시간(ms)
+        inputs:
+            계좌번호를 제외한 TR 입력값
+
+        Returns
+        ----------
+        dict
+            {계좌번호: data}, 조회에 실패한 계좌는 None
+        """
+
+        trCode = trCode.upper()
+        if not hasattr(TRName, trCode):
+            raise KiwoomTrNotSupported()
+
+        if accNos is None:
+            accNos = self.kiwoom.accNos
+        accNos = list(dict.fromkeys(accNos))
+
+        pipeline = RequestPipeline(self.kiwoom, timeout=timeout)
+        for accNo in accNos:
+            onData = functools.partial(callback, accNo) if callback is not None else None
+            pipeline.add(self.__trSender(trCode, dict(inputs, 계좌번호=accNo), onData))
+        results = pipeline.run()
+
+        for i, error in sorted(pipeline.errors.items()):
+            self.kiwoom.logger.error(
+                "ERROR: forAccounts({}) {} : {}".format(trCode, accNos[i], error)
+            )
+        return dict(zip(accNos, results))
+
+    def __trSender(self, trCode, inputs, onData=None):
+        """ RequestPipeline.add()에 사용할 commRqDataAsync 요청 함수
+
+        onData가 있으면 응답을 수신한 즉시 onData(data)를 호출한다.
+        (onData에서 발생한 예외는 기록만 하고, 응답은 pipeline에 그대로 전달)
+        """
+
+        trCode = trCode.upper()
+
+        def send(rqName, scrNo, callback):
+            if onData is not None:
+                def received(data, isNext):
+                    try:
+                        onData(data)
+                    except Exception as e:
+                        self.kiwoom.logger.error(
+                            "ERROR: forAccounts({}) {} callback : {!r}".format(
+                                trCode, inputs.get("계좌번호"), e
+                            )
+                        )
+                    callback(data, isNext)
+            else:
+                received = callback
+
+            for key, value in inputs.items():
+                self.kiwoom.setInputValue(key, value)
+            self.kiwoom.commRqDataAsync(rqName, trCode, 0, scrNo, received)
+
+        return send
 
     def getCodeListByMarket(self, market):
         """시장 구분에 따른 종목코드의 목록을 List로 반환한다.
@@ -168,15 +424,19 @@ class DataFeeder:
             조회한 시장에 소속된 종목 코드를 담은 list
         """
 
-        if not self.kiwoom.connectState:
-            raise KiwoomConnectError()
-
         if not isinstance(market, str):
             raise ParameterTypeError()
 
         if market not in ["0", "3", "4", "5", "6", "8", "9", "10", "30"]:
             raise ParameterValueError()
 
+        codeList = self.kiwoom.symbolMaster.codeLists.get(market)
+        if codeList is not None:
+            return list(codeList)
+
+        if not self.kiwoom.connectState:
+            raise KiwoomConnectError()
+
         codes = self.kiwoom.dynamicCall('GetCodeListByMarket("{}")'.format(market))
         return codes.split(";")
 
@@ -219,18 +479,24 @@ class DataFeeder:
             종목코드의 한글명
         """
 
-        if not self.kiwoom.connectState:
-            raise KiwoomConnectError()
-
         if not isinstance(code, str):
             raise ParameterTypeError()
 
+        if code in self.kiwoom.symbolMaster:
+            return self.kiwoom.symbolMaster.getName(code)
+
+        if not self.kiwoom.connectState:
+            raise KiwoomConnectError()
+
         name = self.kiwoom.dynamicCall('GetMasterCodeName("{}")'.format(code))
         return name
 
     def getMarketByCode(self, code):
         """ 해당 종목이 상장된 시장정보 반환 """
 
+        if self.kiwoom.symbolMaster.isLoaded:
+            return self.kiwoom.symbolMaster.getMarket(code)
+
         if not hasattr(self, "kspCodeList"):
             setattr(self, "kspCodeList", self.getCodeListByMarket("0"))
             setattr(self, "kdqCodeList", self.getCodeListByMarket("10"))
@@ -263,11 +529,15 @@ class DataFeeder:
         if not isinstance(code, str):
             raise ParameterTypeError()
 
+        if code in self.kiwoom.symbolMaster:
+            return self.kiwoom.symbolMaster.getStates(code)
+
         states = self.kiwoom.dynamicCall("GetMasterStockState(QString)", code)
         return states.split("|")
 
     def checkHasIssue(self, code):
         """ 해당 종목이 관리종목 혹은 거래정지에 해당하는지 확인하는 함수
+        preTrade 테이블이 적재되어 있으면 COM 호출 없이 확인한다.
 
         Returns
         ----------
@@ -275,13 +545,471 @@ class DataFeeder:
             True: 관리종목 or 거래정지종목
         """
 
-        stateList = self.kiwoom.getMasterStockState(code)
+        if self.kiwoom.preTrade.isLoaded:
+            return self.kiwoom.preTrade.hasIssue(code)
+
+        if code in self.kiwoom.symbolMaster:
+            return self.kiwoom.symbolMaster.hasIssue(code)
+
+        stateList = self.getMasterStockState(code)
 
         if ("관리종목" in stateList) or ("거래정지" in stateList):
             return True
 
         return False
 
+    def loadSymbolMaster(self, force=False):
+        """ 종목 기본 정보(SymbolMaster)를 거래일마다 한 번 수집하여 저장
+
+        당일 저장된 파일이 있으면 COM 호출 없이 읽고, 없으면 장내/코스닥/ETF 전체 종목의
+        종목명과 종목상태를 수집하여 저장한다.
+        이후 getCodeListByMarket(), getMasterCodeName(), getMarketByCode(),
+        getMasterStockState()는 COM 호출 없이 SymbolMaster를 사용한다.
+        이전 거래일 대비 신규/제외 종목은 SymbolMaster.compare()로 확인할 수 있다.
+
+        Parameters
+        ----------
+        force: bool
+            True이면 당일 파일이 있어도 다시 수집
+
+        Returns
+        ----------
+        SymbolMaster
+        """
+
+        master = self.kiwoom.symbolMaster
+        today = datetime.now().strftime("%Y%m%d")
+        if not force and (master.date == today or master.load(today)):
+            return master
+
+        # COM에서 다시 수집
+        master.build([], [], [], [], {})
+
+        codeLists = {}
+        codes, markets = [], []
+        seen = set()
+        for market, label in master.MARKETS:
+            codeLists[market] = self.getCodeListByMarket(market)
+            for code in codeLists[market]:
+                if code and code not in seen:
+                    seen.add(code)
+                    codes.append(code)
+                    markets.append(label)
+        names = [self.getMasterCodeName(code) for code in codes]
+        states = ["|".join(self.getMasterStockState(code)) for code in codes]
+
+        master.build(codes, names, markets, states, codeLists, date=today)
+        master.save()
+
+        diff = master.compare()
+        if diff is not None:
+            self.kiwoom.logger.debug(
+                "SymbolMaster {} : listed {}, delisted {}, renamed {}, state changed {} (vs {})".format(
+                    today,
+                    len(diff["listed"]),
+                    len(diff["delisted"]),
+                    len(diff["renamed"]),
+                    len(diff["stateChanged"]),
+                    diff["date"],
+                )
+            )
+        return master
+
+    def snapshot(self, codes, timeout=10000):
+        """ 여러 종목의 현재 시세를 OPTKWFID로 조회하여 DataFrame으로 반환
+
+        종목코드를 100종목씩 나누어, 응답을 기다리지 않고 요청 제한(1초 5회) 이내에서
+        연속으로 요청한다. (RequestPipeline 참고)
+        조회 후 등록된 실시간 데이터는 해지한다.
+
+        Parameters
+        ----------
+        codes: list of str
+            종목코드, 중복된 종목코드는 한 번만 조회
+        timeout: int
+            마지막 요청 이후 응답을 기다리는 최대 시간(ms)
+
+        Returns
+        ----------
+        pandas.DataFrame
+            종목코드 index, 요청한 종목 순서, 숫자 항목은 숫자로 변환
+            (조회에 실패한 종목은 포함되지 않음)
+        """
+
+        if isinstance(codes, str):
+            codes = [codes]
+
+        codes = list(dict.fromkeys(normalizeCode(code.strip()) for code in codes))
+        chunks = [codes[i : i + 100] for i in range(0, len(codes), 100)]
+
+        pipeline = RequestPipeline(self.kiwoom, timeout=timeout)
+        for chunk in chunks:
+            pipeline.add(
+                functools.partial(self.kiwoom.commKwRqDataAsync, ";".join(chunk), len(chunk))
+            )
+        results = pipeline.run()
+
+        for scrNo in pipeline.usedScrNos:
+            self.kiwoom.disconnectRealData(scrNo)
+
+        for i, error in sorted(pipeline.errors.items()):
+            self.kiwoom.logger.error(
+                "ERROR: snapshot() : {} ({} ~ {})".format(error, chunks[i][0], chunks[i][-1])
+            )
+
+        rows = [row for data in results if data for row in data.get("멀티데이터", [])]
+        columns = getattr(TRKeys, "OPTKWFID")["멀티데이터"]
+        df = pd.DataFrame(rows, columns=columns)
+        if df.empty:
+            return df.set_index("종목코드")
+
+        df["종목코드"] = df["종목코드"].str.strip().map(normalizeCode)
+        df["종목명"] = df["종목명"].str.strip()
+        for column in columns:
+            if column not in self.SNAPSHOT_TEXT_COLUMNS:
+                df[column] = pd.to_numeric(df[column].str.strip(), errors="coerce")
+
+        # 가격 항목의 부호는 전일대비 방향이므로 절대값 사용
+        prices = [c for c in self.SNAPSHOT_PRICE_COLUMNS if c in df]
+        df[prices] = df[prices].abs()
+
+        df = df.drop_duplicates("종목코드").set_index("종목코드")
+        return df.reindex([code for code in codes if code in df.index])
+
+    def requestQuote(self, code, callback):
+        """ 종목 현재가를 비동기로 조회
+
+        짧은 시간(QuotePlanner.window) 안에 들어온 요청을 모아 OPTKWFID 요청으로 묶어 전송하므로,
+        여러 곳에서 종목별로 요청해도 100종목당 요청 제한 1회만 사용한다.
+
+        Parameters
+        ----------
+        code: str
+            종목코드
+        callback: callable
+            callback(row) 형태로 호출, row는 OPTKWFID 멀티데이터의 해당 종목 dict
+            (조회에 실패하면 None)
+        """
+
+        if not self.kiwoom.connectState:
+            raise KiwoomConnectError()
+
+        self.kiwoom.quotePlanner.request(code, callback)
+
+    def getQuote(self, code):
+        """ 종목 현재가를 조회 (requestQuote()의 응답을 기다리는 버전)
+
+        Parameters
+        ----------
+        code: str
+            종목코드
+
+        Returns
+        ----------
+        dict
+            OPTKWFID 멀티데이터의 해당 종목 dict, 조회에 실패하면 None
+        """
+
+        result = {}
+        loop = QEventLoop()
+
+        def onQuote(row):
+            result["row"] = row
+            loop.exit()
+
+        self.requestQuote(code, onQuote)
+        if "row" not in result:
+            loop.exec_()
+        return result["row"]
+
+    def loadPreTradeTable(self, markets=("8", "0", "10"), force=False):
+        """ 주문 전 검증에 사용할 종목별 기준 정보를 세션(일자)마다 한 번 적재
+
+        종목별 상한가/하한가/기준가는 snapshot()으로 조회하고,
+        관리종목/거래정지 여부는 GetMasterStockState로 조회한다.
+        여러 시장에 속한 종목은 markets의 앞선 시장으로 분류된다.
+        (ETF의 호가단위가 다르므로 ETF를 먼저 조회)
+
+        Parameters
+        ----------
+        markets: tuple of str
+            시장구분, "0": 장내, "10": 코스닥, "8": ETF
+        force: bool
+            True이면 이미 적재되어 있어도 다시 적재
+
+        Returns
+        ----------
+        PreTradeTable
+        """
+
+        table = self.kiwoom.preTrade
+        today = datetime.now().strftime("%Y%m%d")
+        if table.loadedDate == today and not force:
+            return table
+
+        marketNames = {"0": "KOSPI", "10": "KOSDAQ", "8": "ETF"}
+        codes, codeMarkets = [], []
+        seen = set()
+        for market in markets:
+            for code in self.getCodeListByMarket(market):
+                if code and code not in seen:
+                    seen.add(code)
+                    codes.append(code)
+                    codeMarkets.append(marketNames[market])
+
+        states = {code: self.getMasterStockState(code) for code in codes}
+
+        quotes = self.snapshot(codes)[["상한가", "하한가", "기준가"]].to_dict("index")
+
+        return table.build(codes, codeMarkets, states, quotes)
+
+    ##################################
+    ###### 과거 데이터 methods ######
+    ##################################
+
+    def backfill(self, trCode, template, codes, start=None, end=None, sink=None, **kwargs):
+        """ 여러 종목의 과거 데이터 수집 작업(BackfillJob)을 생성
+
+        checkpoint는 {userprofile}/.kiwoom_backfill/{trCode}-{start}-{end}.json에 기록되며,
+        같은 조건으로 다시 생성하면 중단된 위치부터 이어서 수집한다.
+
+        ex)
+            job = feeder.backfill("OPT10059", template, codes, start="20200101", sink=JsonlSink(path))
+            job.plan()  # {"requests", "eta", ..}
+            job.run()
+
+        Parameters
+        ----------
+        trCode: str
+        template: dict
+            TR 입력값, "{code}"는 종목코드, "{date}"는 조회 기준일자로 변환
+        codes: list of str
+        start, end: str
+            수집 기간(YYYYMMDD)
+        sink: callable
+            sink(code, rows)
+        kwargs:
+            BackfillJob 참고 (checkpointPath, rowsPerPage, maxPages, dateKey)
+
+        Returns
+        ----------
+        BackfillJob
+        """
+
+        if "checkpointPath" not in kwargs:
+            path = os.path.join(self.kiwoom.homepath, ".kiwoom_backfill")
+            if not os.path.exists(path):
+                os.mkdir(path)
+            kwargs["checkpointPath"] = os.path.join(
+                path,
+                "{}-{}-{}.json".format(
+                    trCode.upper(), start or "", end or datetime.now().strftime("%Y%m%d")
+                ),
+            )
+
+        return BackfillJob(self, trCode, template, codes, start=start, end=end, sink=sink, **kwargs)
+
+    def getMinuteBarStore(self, tickRange=1, adjusted=True):
+        """ 틱범위별 분봉 저장소
+
+        수정주가로 요청한 분봉은 {userprofile}/.kiwoom_bars/minute{tickRange},
+        원주가로 요청한 분봉은 {userprofile}/.kiwoom_bars/minute{tickRange}-raw에 저장한다.
+        """
+
+        name = "minute{}".format(tickRange) if adjusted else "minute{}-raw".format(tickRange)
+        return BarStore(os.path.join(self.kiwoom.bar_path, name))
+
+    def getAdjustedMinuteBars(self, code, tickRange=1, start=None, end=None):
+        """ 저장된 분봉의 수정주가
+
+        수정주가 누적계수는 종목별로 cache 하므로, 동기화로 bar가 추가되면 추가된 bar만 계산한다.
+        (PriceAdjuster 참고) 원주가 저장소(syncMinuteBars(adjusted=False))의 분봉만 사용한다.
+
+        Parameters
+        ----------
+        code: str
+            종목코드
+        tickRange: int
+        start, end: str, datetime, numpy.datetime64
+            조회 기간 (BarStore.seek() 참고)
+
+        Returns
+        ----------
+        dict
+            {"time", "open", "high", "low", "close", "volume", "factor"}
+        """
+
+        code = normalizeCode(code.strip())
+        store = self.getMinuteBarStore(tickRange, adjusted=False)
+        lo, hi = store.seek(code, start, end)
+        return self.kiwoom.priceAdjuster.adjust(
+            store.read(code), key="minute{}/{}".format(tickRange, code), start=lo, stop=hi
+        )
+
+    def syncMinuteBars(self, codes, tickRange=1, adjusted=True, maxPages=None, resume=True):
+        """ OPT10080(주식분봉차트조회요청)으로 분봉을 로컬 저장소에 동기화
+
+        종목마다 저장된 마지막 bar의 시각(high-water mark)을 기준으로, 최근 bar부터
+        연속조회하다가 이미 저장된 bar를 만나면 중단하고 새로운 bar만 append 한다.
+        진행 중인(현재 시각의) bar는 저장하지 않는다.
+        완료한 종목은 일자별 checkpoint에 기록되므로, 같은 날 중단된 동기화를 같은 인자로 다시
+        실행하면 남은 종목부터 이어서 요청한다. (모든 종목을 완료하면 checkpoint는 삭제)
+
+        1초 5회, 1시간 1,000회 제한 (분봉 900개/1회)
+
+        Parameters
+        ----------
+        codes: list of str
+            종목코드
+        tickRange: int
+            틱범위(1, 3, 5, 10, 15, 30, 45, 60)
+        adjusted: bool
+            수정주가 적용 여부, 수정주가와 원주가는 다른 저장소에 저장 (getMinuteBarStore() 참고)
+        maxPages: int
+            저장된 bar가 없는 종목의 최대 연속조회 횟수, default=None(전체)
+        resume: bool
+            False이면 checkpoint를 무시하고 모든 종목을 요청
+
+        Returns
+        ----------
+        dict
+            {종목코드: 추가된 bar 수}
+        """
+
+        if isinstance(codes, str):
+            codes = [codes]
+
+        codes = list(dict.fromkeys(normalizeCode(code.strip()) for code in codes))
+        store = self.getMinuteBarStore(tickRange, adjusted)
+        state = SyncState(
+            os.path.join(store.path, "sync-state.json"),
+            job={"codes": codes, "tickRange": tickRange, "adjusted": adjusted},
+        )
+        if not resume:
+            state.clear()
+
+        # 진행 중인 bar 제외
+        now = np.datetime64(datetime.now().replace(second=0, microsecond=0), "s")
+
+        result = {}
+        for code in codes:
+            if code in state:
+                result[code] = state.done[code]
+                continue
+
+            columns = self.__requestMinuteBars(
+                code, tickRange, adjusted, store.lastTime(code), maxPages
+            )
+            keep = columns["time"] < now
+            added = store.append(code, {k: v[keep] for k, v in columns.items()})
+
+            state.mark(code, added)
+            result[code] = added
+            self.kiwoom.logger.debug("syncMinuteBars {} : {} bars".format(code, added))
+
+        state.clear()
+        return result
+
+    def __requestMinuteBars(self, code, tickRange, adjusted, since, maxPages):
+        """ since(저장된 마지막 시각) 이전의 bar를 만날 때까지 연속조회 """
+
+        params = {
+            "종목코드": code,
+            "틱범위": str(tickRange),
+            "수정주가구분": "1" if adjusted else "0",
+        }
+
+        pages = []
+        inquiry = 0
+        while True:
+            for k, v in params.items():
+                self.kiwoom.setInputValue(k, v)
+            self.kiwoom.commRqData(TRName.OPT10080, "OPT10080", inquiry, "0101")
+
+            rows = self.kiwoom.OPT10080.get("멀티데이터", [])
+            page = minuteBarColumns(rows)
+            pages.append(page)
+
+            if not len(page["time"]) or not self.kiwoom.isNext:
+                break
+            if since is not None and page["time"].min() <= since:
+                break
+            if since is None and maxPages is not None and len(pages) >= maxPages:
+                break
+            inquiry = 2
+
+        return {
+            name: np.concatenate([page[name] for page in pages])
+            for name in pages[0]
+        }
+
+    #############################
+    ###### 조건검색 methods ######
+    #############################
+
+    def getConditionList(self):
+        """ 사용자 조건식 목록 반환, 최초 1회만 서버에 요청하고 이후에는 캐시를 사용
+
+        Returns
+        ----------
+        dict
+            {조건식명: 조건식 index}
+        """
+
+        return self.kiwoom.getConditionNameList()
+
+    def requestCondition(self, conditionName, isRealTime=False, scrNo="0150"):
+        """ 조건검색을 실행하고 편입 종목코드를 반환
+
+        실시간 조건검색으로 등록된 조건식이거나, 같은 조건식 1분 1회 제한에
+        걸리는 경우에는 서버에 요청하지 않고 마지막으로 갱신된 결과를 반환한다.
+        실시간 조건검색으로 등록하면 이후의 편입/이탈은 getConditionCodes()에
+        자동으로 반영된다.
+
+        Parameters
+        ----------
+        conditionName: str
+            조건식명
+        isRealTime: bool
+            실시간 조건검색 등록 여부
+        scrNo: str
+            화면번호(4자리)
+
+        Returns
+        ----------
+        set
+        """
+
+        conditions = self.kiwoom.conditions
+        if not conditions.isLoaded:
+            self.getConditionList()
+        index = conditions.getIndex(conditionName)
+
+        isRegistered = conditionName in conditions.realTime
+        isLocked = self.kiwoom.conditionDelayCheck.remaining(conditionName) > 0
+        hasCache = conditionName in conditions.updatedTime
+
+        if hasCache and (isRegistered or (isLocked and not isRealTime)):
+            return conditions.getMatches(conditionName)
+
+        return self.kiwoom.sendCondition(scrNo, conditionName, index, int(isRealTime))
+
+    def stopCondition(self, conditionName):
+        """ 실시간 조건검색 중지 """
+
+        conditions = self.kiwoom.conditions
+        scrNo = conditions.realTime.get(conditionName)
+        if scrNo is None:
+            return
+
+        index = conditions.getIndex(conditionName)
+        self.kiwoom.sendConditionStop(scrNo, conditionName, index)
+
+    def getConditionCodes(self, conditionName):
+        """ 조건식에 현재 편입되어 있는 종목코드 반환(서버 요청 없음) """
+
+        return self.kiwoom.conditions.getMatches(conditionName)
+
     """
     ### logging 관련 매서드
     def showTradingSummary(self, date):
@@ -0,0 +1,120 @@
+from collections import namedtuple
+
+from .errors import ParameterValueError
+
+
+class Delta(namedtuple("Delta", ["inserted", "updated", "deleted", "single"])):
+    """ 이전 조회 결과 대비 변경 내역
+
+    Attributes
+    ----------
+    inserted, updated, deleted: list of dict
+        추가, 변경, 삭제된 멀티데이터 행 (deleted는 이전 조회 결과의 행)
+    single: dict
+        변경된 싱글데이터, 변경이 없으면 None
+    """
+
+    __slots__ = ()
+
+    @property
+    def isEmpty(self):
+        return not (self.inserted or self.updated or self.deleted or self.single)
+
+
+class TrDelta:
+    """ 주기적으로 조회하는 TR의 이전 결과를 (trCode, 입력값)별로 보관하고,
+    새 결과에서 추가/변경/삭제된 행만 계산하는 클래스입니다.
+
+    멀티데이터의 행은 행 key(ex: 주문번호, 종목코드)로 찾는 dict에 행의 hash와 함께 저장하므로,
+    변경 여부는 행 전체를 비교하지 않고 hash로 확인합니다.
+    DataFeeder.requestDelta()를 참고하시길 바랍니다.
+    """
+
+    # TR별 멀티데이터의 행 key
+    ROW_KEYS = {
+        "OPT10075": ("주문번호",),
+        "OPW00004": ("종목코드",),
+        "OPW00007": ("주문번호",),
+    }
+
+    def __init__(self):
+        # (trCode, 입력값): (싱글데이터 hash, {행 key: (행 hash, 행)})
+        self.states = {}
+
+    @staticmethod
+    def stateKey(trCode, inputs):
+        return (trCode.upper(), tuple(sorted(inputs.items())))
+
+    def rowKey(self, trCode, rowKey=None):
+        """ 행 key 항목, 지정하지 않으면 ROW_KEYS 사용 """
+
+        if rowKey is None:
+            rowKey = self.ROW_KEYS.get(trCode.upper())
+            if rowKey is None:
+                raise ParameterValueError("{} 멀티데이터의 행 key(rowKey)를 지정해야 합니다.".format(trCode))
+        elif isinstance(rowKey, str):
+            rowKey = (rowKey,)
+        return tuple(rowKey)
+
+    def diff(self, trCode, inputs, data, rowKey=None):
+        """ 이전 결과 대비 변경 내역을 계산하고 결과를 보관
+
+        Parameters
+        ----------
+        trCode: str
+        inputs: dict
+            TR 입력값
+        data: dict
+            DataFeeder.request()의 반환값
+        rowKey: str or tuple of str
+            멀티데이터의 행 key 항목, default=None(ROW_KEYS)
+
+        Returns
+        ----------
+        Delta
+            처음 조회한 경우 모든 행이 inserted
+        """
+
+        fields = self.rowKey(trCode, rowKey)
+        stateKey = self.stateKey(trCode, inputs)
+        prevSingleHash, prevRows = self.states.get(stateKey, (None, {}))
+
+        single = data.get("싱글데이터")
+        singleHash = hash(tuple(single.items())) if single else None
+
+        rows = {}
+        inserted, updated = [], []
+        for row in data.get("멀티데이터") or []:
+            key = tuple(row.get(field, "").strip() for field in fields)
+            if not any(key):
+                continue
+
+            rowHash = hash(tuple(row.items()))
+            rows[key] = (rowHash, row)
+
+            prev = prevRows.get(key)
+            if prev is None:
+                inserted.append(row)
+            elif prev[0] != rowHash:
+                updated.append(row)
+
+        deleted = [row for key, (_, row) in prevRows.items() if key not in rows]
+
+        self.states[stateKey] = (singleHash, rows)
+        return Delta(
+            inserted=inserted,
+            updated=updated,
+            deleted=deleted,
+            single=single if singleHash != prevSingleHash else None,
+        )
+
+    def reset(self, trCode=None):
+        """ 보관 중인 결과를 삭제, trCode가 None이면 전체 """
+
+        if trCode is None:
+            self.states.clear()
+            return
+
+        trCode = trCode.upper()
+        for stateKey in [key for key in self.states if key[0] == trCode]:
+            del self.states[stateKey]
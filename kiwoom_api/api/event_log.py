@@ -0,0 +1,235 @@
+from datetime import datetime as dt
+import gzip
+import json
+import logging
+import os
+import queue
+import re
+import shutil
+import threading
+import time
+
+
+class EventLogHandler(logging.Handler):
+    """ log를 event 한 건당 한 줄의 JSONL로 기록하는 logging Handler 입니다.
+
+    한 줄은 {"t": 기록 시각(epoch), "lv": level, "ev": event, "d": 내용} 형태이며,
+    dict 메시지는 "EVENT" 값을 event로, 나머지 항목을 내용으로 기록하고,
+    체잔 record(ChejanRecord, BalanceRecord 등 TABLE과 toDict()가 있는 객체)는 TABLE을 event로,
+    toDict()를 내용으로 기록하며, 문자열 메시지는 {"msg": 메시지}를 내용으로 기록합니다.
+    파일은 {YYYYMMDD}-{번호}.jsonl segment로 나누어, 날짜가 바뀌거나 maxBytes를 넘으면 새 segment로 교체하며,
+    닫은 segment는 background thread에서 gzip으로 압축합니다. (.jsonl.gz)
+    이전 실행에서 닫지 못한 segment는 전날 이전의 것만 시작할 때 압축합니다.
+    기록된 event는 readEvents()로 읽습니다.
+
+    Parameters
+    ----------
+    path: str
+        저장 폴더
+    maxBytes: int
+        segment 최대 크기
+    compress: bool
+        닫은 segment 압축 여부
+    """
+
+    SEGMENT_PATTERN = re.compile(r"^(\d{8})-(\d+)\.jsonl(\.gz)?$")
+
+    def __init__(self, path, maxBytes=64 * 1024 * 1024, compress=True):
+        super().__init__()
+        if not os.path.exists(path):
+            os.makedirs(path)
+
+        self.path = path
+        self.maxBytes = maxBytes
+        self.compress = compress
+
+        self.__file = None
+        self.__day = None
+        self.__size = 0
+        self.__seq = 0
+
+        self.__compressQueue = queue.Queue()
+        self.__compressor = None
+
+        # 이전 실행에서 닫지 못한 segment 중 전날 이전의 segment만 압축
+        # (당일 segment는 다른 process가 기록 중일 수 있으므로 그대로 두고, 새 번호의 segment에 기록)
+        today = time.strftime("%Y%m%d")
+        for name in sorted(os.listdir(path)):
+            match = self.SEGMENT_PATTERN.match(name)
+            if match is not None and match.group(3) is None and match.group(1) < today:
+                self.__closeSegment(os.path.join(path, name))
+
+    def segmentPath(self, day, seq):
+        return os.path.join(self.path, "{}-{:04d}.jsonl".format(day, seq))
+
+    @staticmethod
+    def encode(record):
+        """ LogRecord를 JSONL 한 줄(bytes)로 변환 """
+
+        msg = record.msg
+        if isinstance(msg, dict):
+            event = msg.get("EVENT", "")
+            data = {key: value for key, value in msg.items() if key != "EVENT"}
+        elif hasattr(msg, "toDict") and hasattr(msg, "TABLE"):  # 체잔 record
+            event = msg.TABLE
+            data = msg.toDict()
+        else:
+            args = getattr(record, "fmtArgs", None)
+            event = ""
+            data = {"msg": str(msg).format(*args) if args else str(msg)}
+
+        return '{{"t":{:.6f},"lv":"{}","ev":{},"d":{}}}\n'.format(
+            record.created,
+            record.levelname,
+            json.dumps(event, ensure_ascii=False),
+            json.dumps(data, ensure_ascii=False, separators=(",", ":"), default=str),
+        ).encode("utf-8")
+
+    def emit(self, record):
+        try:
+            line = self.encode(record)
+            day = time.strftime("%Y%m%d", time.localtime(record.created))
+            if (
+                self.__file is None
+                or day != self.__day
+                or (self.__size and self.__size + len(line) > self.maxBytes)
+            ):
+                self.__rotate(day)
+
+            self.__file.write(line)
+            self.__file.flush()
+            self.__size += len(line)
+        except Exception:
+            self.handleError(record)
+
+    def __rotate(self, day):
+        if self.__file is not None:
+            self.__file.close()
+            self.__closeSegment(self.__file.name)
+
+        if day != self.__day:
+            seqs = [
+                int(match.group(2))
+                for match in map(self.SEGMENT_PATTERN.match, os.listdir(self.path))
+                if match is not None and match.group(1) == day
+            ]
+            self.__day = day
+            self.__seq = max(seqs) if seqs else 0
+
+        self.__seq += 1
+        self.__file = open(self.segmentPath(day, self.__seq), "ab")
+        self.__size = 0
+
+    def __closeSegment(self, filePath):
+        if not self.compress:
+            return
+
+        if self.__compressor is None:
+            self.__compressor = threading.Thread(target=self.__compressLoop, daemon=True)
+            self.__compressor.start()
+        self.__compressQueue.put(filePath)
+
+    def __compressLoop(self):
+        while True:
+            filePath = self.__compressQueue.get()
+            try:
+                if filePath is None:
+                    return
+                tmpPath = filePath + ".gz.tmp"
+                with open(filePath, "rb") as src, gzip.open(tmpPath, "wb") as dst:
+                    shutil.copyfileobj(src, dst)
+                os.replace(tmpPath, filePath + ".gz")
+                os.remove(filePath)
+            except OSError:
+                pass
+            finally:
+                self.__compressQueue.task_done()
+
+    def close(self):
+        """ 현재 segment를 닫고, 대기 중인 압축이 끝날 때까지 기다림
+        (현재 segment는 다른 날의 다음 실행에서 압축) """
+
+        self.acquire()
+        try:
+            if self.__file is not None:
+                self.__file.close()
+                self.__file = None
+            if self.__compressor is not None:
+                self.__compressQueue.put(None)
+                self.__compressor.join()
+                self.__compressor = None
+        finally:
+            self.release()
+        super().close()
+
+
+def _toEpoch(x):
+    """ 조회 시각을 epoch로 변환, ex) "20200313", "202003130930", datetime, epoch """
+
+    if isinstance(x, (int, float)):
+        return float(x)
+    if isinstance(x, str):
+        x = x.strip().replace("-", "").replace(":", "").replace(" ", "")
+        formats = {8: "%Y%m%d", 12: "%Y%m%d%H%M", 14: "%Y%m%d%H%M%S"}
+        x = dt.strptime(x, formats[len(x)])
+    return time.mktime(x.timetuple()) + x.microsecond / 1e6
+
+
+def readEvents(path, event=None, start=None, end=None):
+    """ EventLogHandler가 기록한 event를 순서대로 읽습니다.
+
+    segment는 파일명의 일자로, 각 줄은 JSON으로 변환하기 전에 event 이름과
+    기록 시각(줄의 앞부분)으로 먼저 걸러내므로 조건에 맞는 줄만 변환합니다.
+
+    Parameters
+    ----------
+    path: str
+        EventLogHandler의 저장 폴더
+    event: str
+        event 이름 (ex: "eventReceiveTrData"), None이면 전체, ""이면 문자열 메시지
+    start: str, datetime, float
+        시작 시각(포함), ex) "20200313", "20200313 0930", None이면 처음부터
+    end: str, datetime, float
+        종료 시각(미포함), None이면 끝까지
+
+    Returns
+    ----------
+    generator of dict
+        {"t": epoch, "lv": level, "ev": event, "d": 내용}
+    """
+
+    start = _toEpoch(start) if start is not None else None
+    end = _toEpoch(end) if end is not None else None
+    firstDay = time.strftime("%Y%m%d", time.localtime(start)) if start is not None else ""
+    lastDay = time.strftime("%Y%m%d", time.localtime(end)) if end is not None else "99999999"
+
+    # (일자, 번호): 파일명, 압축 중인 segment는 압축이 끝난 파일을 사용
+    segments = {}
+    for name in os.listdir(path):
+        match = EventLogHandler.SEGMENT_PATTERN.match(name)
+        if match is not None and firstDay <= match.group(1) <= lastDay:
+            key = (match.group(1), int(match.group(2)))
+            if match.group(3) is not None or key not in segments:
+                segments[key] = name
+
+    needle = None
+    if event is not None:
+        needle = ',"ev":{},"d":'.format(json.dumps(event, ensure_ascii=False)).encode("utf-8")
+
+    for key in sorted(segments):
+        filePath = os.path.join(path, segments[key])
+        if not os.path.exists(filePath):  # 읽기 전에 압축된 segment
+            filePath += ".gz"
+        opener = gzip.open if filePath.endswith(".gz") else open
+        with opener(filePath, "rb") as f:
+            for line in f:
+                if needle is not None and needle not in line:
+                    continue
+                if start is not None or end is not None:
+                    t = float(line[5 : line.index(b",")])  # {"t":...,
+                    if (start is not None and t < start) or (end is not None and t >= end):
+                        continue
+                try:
+                    yield json.loads(line)
+                except ValueError:  # 기록 중인 마지막 줄
+                    continue
@@ -1,13 +1,165 @@
+import heapq
+import itertools
 import os
 import sys
 
-from .errors import ParameterTypeError
+from PyQt5.QtCore import QEventLoop, QTimer
+
+from .errors import ParameterTypeError, ParameterValueError
+from .order_book import OrderStatus
+
+
+class OrderHandle:
+    """ Executor.submit()이 반환하는 주문 handle 입니다.
+
+    주문은 요청 제한에 맞추어 순서대로 전송되며, 주문번호(혹은 거부 메시지)를
+    수신하면 handle의 상태가 갱신됩니다. result()로 응답을 기다리거나,
+    addDoneCallback()으로 응답시 호출될 함수를 등록할 수 있습니다.
+
+    status
+    ----------
+    대기: 요청 제한으로 전송 대기 중
+    전송: SendOrder 호출 완료, 주문번호 수신 대기 중
+    접수: 주문번호 수신 (주문 성공)
+    거부: 주문 실패 (msg에 사유)
+
+    주문번호 수신 timeout으로 거부된 주문의 주문번호가 뒤늦게 도착하면
+    접수로 정정하고 isLateAck를 True로 설정합니다. (callback은 다시 호출되지 않음)
+    """
+
+    PENDING = "대기"
+    SENT = "전송"
+    ACCEPTED = "접수"
+    REJECTED = "거부"
+
+    def __init__(self, kiwoom, spec, rqName):
+        self.kiwoom = kiwoom
+        self.spec = spec
+        self.rqName = rqName
+        self.status = self.PENDING
+        self.orderNo = ""
+        self.msg = ""
+        self.isLateAck = False
+        self.__callbacks = []
+
+    def done(self):
+        return self.status in (self.ACCEPTED, self.REJECTED)
+
+    @property
+    def isAccepted(self):
+        return self.status == self.ACCEPTED
+
+    @property
+    def order(self):
+        """ OrderBook에서 관리하는 주문 상태, 주문번호를 받기 전이면 None """
+
+        if not self.orderNo:
+            return None
+        return self.kiwoom.orderBook.getOrder(self.orderNo)
+
+    def addDoneCallback(self, callback):
+        """ 주문 응답을 수신하면 callback(handle) 형태로 호출됩니다.
+        이미 응답을 수신한 경우에는 즉시 호출됩니다.
+        """
+
+        if self.done():
+            callback(self)
+        else:
+            self.__callbacks.append(callback)
+
+    def result(self, timeout=None):
+        """ 주문 응답을 수신할 때까지 대기한 후 응답을 반환합니다.
+
+        Parameters
+        ----------
+        timeout: int
+            최대 대기 시간(ms), default=None(무한대기)
+
+        Returns
+        ----------
+        dict
+            sendOrder()의 orderResponse와 같은 형태
+        """
+
+        if not self.done():
+            loop = QEventLoop()
+            self.__callbacks.append(lambda handle: loop.exit())
+            if timeout is not None:
+                QTimer.singleShot(timeout, loop.exit)
+            loop.exec_()
+
+        return self.toDict()
+
+    def toDict(self):
+        response = dict(self.spec)
+        response.update(
+            {
+                "rqName": self.rqName,
+                "orderNo": self.orderNo,
+                "msg": self.msg,
+                "status": self.status,
+            }
+        )
+        return response
+
+    ###### Kiwoom 이벤트에서 호출 ######
+
+    def onSent(self):
+        self.status = self.SENT
+
+    def onMsg(self, msg):
+        self.msg = msg
+
+    def onAck(self, orderNo):
+        if orderNo:
+            self.orderNo = orderNo
+            self.__finish(self.ACCEPTED)
+        else:  # 주문번호가 공백이면 주문 실패
+            self.__finish(self.REJECTED)
+
+    def onLateAck(self, orderNo):
+        if orderNo:  # 거부로 처리했으나 서버에서는 접수된 주문
+            self.orderNo = orderNo
+            self.status = self.ACCEPTED
+            self.isLateAck = True
+
+    def onReject(self, msg):
+        self.msg = msg
+        self.__finish(self.REJECTED)
+
+    def __finish(self, status):
+        if self.done():
+            return
+
+        self.status = status
+        if status == self.REJECTED:
+            self.kiwoom.latency.discard(self.rqName)
+
+        callbacks, self.__callbacks = self.__callbacks, []
+        for callback in callbacks:
+            callback(self)
+
+    def __repr__(self):
+        return "OrderHandle({!r})".format(self.toDict())
 
 
 class Executor:
+
+    CANCEL_ORDER_TYPES = (3, 4)  # 매수취소, 매도취소
+    AMEND_ORDER_TYPES = (3, 4, 5, 6)  # 매수취소, 매도취소, 매수정정, 매도정정
+
     def __init__(self, kiwoom):
         self.kiwoom = kiwoom
 
+        # 비동기 주문(submit) 전송 대기열, (-priority, seq, handle)의 heap
+        self.__pending = []
+        self.__drainScheduled = False
+        self.__seq = itertools.count(1)
+
+        # 전송 대기 중인 정정/취소 주문 (원주문번호: OrderHandle)
+        self.__amends = {}
+        self.__coalescedCount = 0
+
     def createOrderSpec(
         self,
         rqName,
@@ -90,3 +242,400 @@ class Executor:
         )
         return getattr(self.kiwoom, "orderResponse")
 
+
+    def submit(self, orderSpec, callback=None, priority=0):
+        """ 주문을 제출하고 응답을 기다리지 않고 OrderHandle을 즉시 반환하는 메서드
+
+        주문은 대기열에 추가되어 주문 제한(1초 5회) 이내에서 순서대로 전송되며,
+        앞선 주문의 응답을 기다리지 않고 연속으로 전송된다(pipelining).
+        주문번호 혹은 거부 메시지는 rqName으로 구분하여 각 handle에 전달된다.
+
+        정정/취소 주문은 같은 원주문에 대한 주문이 전송 대기 중이면 대기 중인 주문에
+        합쳐지며(마지막 가격/수량만 전송), 이 경우 대기 중인 주문의 handle을 반환한다.
+        취소 주문이 대기 중인 원주문에 대한 정정 주문은 전송하지 않고 대기 중인 취소 주문의 handle을 반환한다.
+        합쳐진 주문은 두 주문 중 높은 우선순위로 전송된다.
+
+        Parameters
+        ----------
+        orderSpec: dict
+            createOrderSpec() 매서드로 생성한 주문정보
+        callback: callable
+            주문 응답 수신시 callback(handle) 형태로 호출
+        priority: int or float
+            대기열에서의 우선순위, 값이 클수록 먼저 전송 (같으면 제출 순서)
+
+        Returns
+        ----------
+        OrderHandle
+        """
+
+        handle = self.__enqueue(orderSpec, priority)
+        if callback is not None:
+            handle.addDoneCallback(callback)
+
+        self.__drain()
+        return handle
+
+    def validate(self, orderSpec):
+        """ 주문정보를 주문 전 검증(상한가/하한가, 호가단위, 거래정지 등)하는 메서드
+        DataFeeder.loadPreTradeTable()로 적재한 테이블을 사용하며 COM 호출은 없다.
+
+        Returns
+        ----------
+        str
+            검증 실패 사유, 통과하면 빈 문자열
+        """
+
+        return self.kiwoom.preTrade.check(orderSpec)
+
+    def validateBatch(self, orderSpecs):
+        """ 여러 주문정보를 한 번에 검증하는 메서드 (바스켓 주문)
+
+        Returns
+        ----------
+        list of str
+            주문별 검증 실패 사유, 통과한 주문은 빈 문자열
+        """
+
+        return self.kiwoom.preTrade.checkBatch(orderSpecs)
+
+    def __enqueue(self, orderSpec, priority, reason=None):
+        """ 주문을 대기열에 추가 (전송하지 않음)
+        preTrade 테이블이 적재되어 있으면 검증을 통과한 주문만 추가한다.
+        reason이 주어지면(일괄 검증 결과) 다시 검증하지 않는다.
+
+        같은 원주문에 대한 정정/취소 주문이 전송 대기 중이면 새 주문을 추가하지 않고
+        대기 중인 주문을 최신 주문정보로 갱신하여 그 handle을 반환한다. (latest-wins)
+        취소 주문이 대기 중이면 정정 주문은 취소 주문에 흡수된다.
+        """
+
+        spec = dict(orderSpec)
+        spec.setdefault("originOrderNo", "")
+        for key in ("orderType", "qty", "price"):
+            if not isinstance(spec[key], int):
+                spec[key] = int(spec[key])
+
+        if reason is None and self.kiwoom.preTrade.isLoaded:
+            reason = self.validate(spec)
+        if reason:
+            raise ParameterValueError("{}: {}".format(spec["code"], reason))
+
+        isAmend = spec["orderType"] in self.AMEND_ORDER_TYPES and spec["originOrderNo"]
+        if isAmend:
+            queued = self.__amends.get(spec["originOrderNo"])
+            if queued is not None:
+                return self.__coalesce(queued, spec, priority)
+
+        # 응답을 구분하기 위해 주문마다 고유한 rqName을 사용
+        seq = next(self.__seq)
+        rqName = "{}#{}".format(spec["rqName"], seq)
+        handle = OrderHandle(self.kiwoom, spec, rqName)
+        self.kiwoom.latency.start(rqName, spec["hogaType"])
+        heapq.heappush(self.__pending, (-priority, seq, handle))
+        if isAmend:
+            self.__amends[spec["originOrderNo"]] = handle
+        return handle
+
+    def __coalesce(self, queued, spec, priority):
+        """ 전송 대기 중인 정정/취소 주문을 최신 주문정보로 갱신하고, 우선순위는 높은 쪽을 사용
+        (취소 주문이 대기 중이면 정정 주문은 취소 주문에 흡수) """
+
+        isCancelQueued = queued.spec["orderType"] in self.CANCEL_ORDER_TYPES
+        if not isCancelQueued or spec["orderType"] in self.CANCEL_ORDER_TYPES:
+            for key in ("orderType", "qty", "price", "hogaType"):
+                queued.spec[key] = spec[key]
+
+        for i, (negPriority, seq, handle) in enumerate(self.__pending):
+            if handle is queued:
+                if -priority < negPriority:
+                    self.__pending[i] = (-priority, seq, handle)
+                    heapq.heapify(self.__pending)
+                break
+
+        self.__coalescedCount += 1
+        return queued
+
+    def submit_batch(self, orderSpecs, key=None):
+        """ 여러 주문을 한 번에 제출하는 메서드
+
+        주문은 주문 제한(1초 5회)이 허용하는 최대 속도로 전송되며,
+        key를 지정하면 key 값이 큰 주문부터 전송된다. (ex: 긴급도, 주문금액)
+
+        Parameters
+        ----------
+        orderSpecs: list of dict
+            createOrderSpec() 매서드로 생성한 주문정보 목록
+        key: callable
+            key(orderSpec) -> 우선순위(숫자), default=None(제출 순서)
+
+        Returns
+        ----------
+        BatchResult
+        """
+
+        orderSpecs = list(orderSpecs)
+
+        # preTrade 테이블이 적재되어 있으면 바스켓 전체를 한 번에 검증
+        reasons = [None] * len(orderSpecs)
+        if self.kiwoom.preTrade.isLoaded:
+            try:
+                reasons = self.validateBatch(orderSpecs)
+            except (KeyError, TypeError, ValueError):  # 잘못된 주문정보는 개별 검증
+                pass
+
+        handles = []
+        for orderSpec, reason in zip(orderSpecs, reasons):
+            priority = key(orderSpec) if key is not None else 0
+            try:
+                handle = self.__enqueue(orderSpec, priority, reason)
+            except Exception as e:  # 잘못된 주문정보
+                handle = OrderHandle(self.kiwoom, dict(orderSpec), orderSpec.get("rqName", ""))
+                handle.onReject(str(e))
+            handles.append(handle)
+
+        # 모든 주문을 대기열에 추가한 뒤 우선순위 순서로 전송
+        self.__drain()
+        return BatchResult(handles)
+
+    def cancel(self, orderNo, qty=None, rqName="cancel", scrNo="0000", priority=0):
+        """ 미체결 주문을 취소하는 메서드
+        OPT10075 조회 없이 OrderBook의 주문 상태로 취소 주문을 생성한다.
+
+        Parameters
+        ----------
+        orderNo: str
+            원주문번호
+        qty: int
+            취소수량, default=None(미체결 잔량 전부)
+
+        Returns
+        ----------
+        OrderHandle
+        """
+
+        order = self.__getOpenOrder(orderNo)
+        orderSpec = self.createOrderSpec(
+            rqName=rqName,
+            scrNo=scrNo,
+            accNo=order.accNo,
+            orderType=3 if order.side == "매수" else 4,  # 매수취소, 매도취소
+            code=order.code,
+            qty=order.unexQty if qty is None else qty,
+            price=0,
+            hogaType="00",
+            originOrderNo=order.orderNo,
+        )
+        return self.submit(orderSpec, priority=priority)
+
+    def modify(self, orderNo, price, qty=None, rqName="modify", scrNo="0000", priority=0):
+        """ 미체결 주문을 정정하는 메서드
+        OPT10075 조회 없이 OrderBook의 주문 상태로 정정 주문을 생성한다.
+
+        Parameters
+        ----------
+        orderNo: str
+            원주문번호
+        price: int
+            정정가격
+        qty: int
+            정정수량, default=None(미체결 잔량 전부)
+
+        Returns
+        ----------
+        OrderHandle
+        """
+
+        order = self.__getOpenOrder(orderNo)
+        orderSpec = self.createOrderSpec(
+            rqName=rqName,
+            scrNo=scrNo,
+            accNo=order.accNo,
+            orderType=5 if order.side == "매수" else 6,  # 매수정정, 매도정정
+            code=order.code,
+            qty=order.unexQty if qty is None else qty,
+            price=price,
+            hogaType="00",
+            originOrderNo=order.orderNo,
+        )
+        return self.submit(orderSpec, priority=priority)
+
+    def cancel_all(self, accNo, code=None, rqName="cancel_all", scrNo="0000"):
+        """ 계좌의 미체결 주문을 모두 취소하는 메서드
+
+        OPT10075 조회 없이 OrderBook의 미체결 주문으로 취소 주문을 생성하며,
+        미체결 금액이 큰 주문부터 취소한다.
+        이미 취소 주문이 접수된 주문은 제외한다.
+
+        Parameters
+        ----------
+        accNo: str
+            계좌번호
+        code: str
+            종목코드, default=None(전체 종목)
+
+        Returns
+        ----------
+        BatchResult
+        """
+
+        orderBook = self.kiwoom.orderBook
+        orderSpecs = []
+        for order in orderBook.getOpenOrders(code=code, accNo=accNo):
+            isCancelling = any(
+                child.kind == "취소" and child.status == OrderStatus.PENDING
+                for child in orderBook.getChildOrders(order.orderNo)
+            )
+            if isCancelling:
+                continue
+
+            orderSpecs.append(
+                self.createOrderSpec(
+                    rqName=rqName,
+                    scrNo=scrNo,
+                    accNo=order.accNo,
+                    orderType=3 if order.side == "매수" else 4,
+                    code=order.code,
+                    qty=order.unexQty,
+                    price=0,
+                    hogaType="00",
+                    originOrderNo=order.orderNo,
+                )
+            )
+
+        openOrders = orderBook.openOrders
+        return self.submit_batch(
+            orderSpecs,
+            key=lambda spec: spec["qty"] * openOrders[spec["originOrderNo"]].orderPrice,
+        )
+
+    @property
+    def pendingCount(self):
+        """ 요청 제한으로 전송 대기 중인 주문 수 """
+
+        return len(self.__pending)
+
+    @property
+    def coalescedCount(self):
+        """ 대기 중인 정정/취소 주문에 합쳐져 전송하지 않은 주문 수 """
+
+        return self.__coalescedCount
+
+    def __getOpenOrder(self, orderNo):
+        order = self.kiwoom.orderBook.getOrder(orderNo)
+        if order is None or not order.isOpen:
+            raise ParameterValueError("미체결 주문이 아닙니다: {}".format(orderNo))
+        return order
+
+    def __drain(self):
+        """ 주문 제한 이내에서 대기열의 주문을 전송하고,
+        제한에 걸리면 다음 전송 가능 시각에 다시 실행되도록 예약 """
+
+        self.__drainScheduled = False
+        delayCheck = self.kiwoom.orderDelayCheck
+        latency = self.kiwoom.latency
+
+        while self.__pending:
+            delay = delayCheck.nextDelay()
+            if delay > 0:
+                self.__scheduleDrain(delay)
+                return
+
+            _, _, handle = heapq.heappop(self.__pending)
+            originOrderNo = handle.spec["originOrderNo"]
+            if self.__amends.get(originOrderNo) is handle:
+                del self.__amends[originOrderNo]
+
+            delayCheck.record()
+            latency.stamp(handle.rqName, "release")
+            try:
+                self.kiwoom.sendOrderAsync(handle)
+            except Exception as e:
+                handle.onReject(str(e))
+                continue
+            latency.stamp(handle.rqName, "sent")
+
+    def __scheduleDrain(self, delay):
+        if self.__drainScheduled:
+            return
+
+        self.__drainScheduled = True
+        QTimer.singleShot(int(delay * 1000) + 1, self.__drain)
+
+
+class BatchResult:
+    """ submit_batch(), cancel_all()이 반환하는 결과 입니다.
+    주문별 OrderHandle을 모아서 성공/실패를 한 번에 확인할 수 있습니다.
+    """
+
+    def __init__(self, handles):
+        self.handles = handles
+
+    def __len__(self):
+        return len(self.handles)
+
+    def __iter__(self):
+        return iter(self.handles)
+
+    def done(self):
+        return all(handle.done() for handle in self.handles)
+
+    def wait(self, timeout=None):
+        """ 모든 주문의 응답을 수신할 때까지 대기
+
+        Parameters
+        ----------
+        timeout: int
+            최대 대기 시간(ms), default=None(무한대기)
+        """
+
+        remaining = [handle for handle in self.handles if not handle.done()]
+        if not remaining:
+            return self
+
+        loop = QEventLoop()
+        count = [len(remaining)]
+
+        def onDone(handle):
+            count[0] -= 1
+            if count[0] == 0:
+                loop.exit()
+
+        for handle in remaining:
+            handle.addDoneCallback(onDone)
+        if timeout is not None:
+            QTimer.singleShot(timeout, loop.exit)
+        loop.exec_()
+        return self
+
+    @property
+    def accepted(self):
+        return [handle for handle in self.handles if handle.isAccepted]
+
+    @property
+    def rejected(self):
+        return [
+            handle for handle in self.handles if handle.status == OrderHandle.REJECTED
+        ]
+
+    @property
+    def ok(self):
+        """ 모든 주문이 접수되었으면 True """
+
+        return len(self.accepted) == len(self.handles)
+
+    @property
+    def errors(self):
+        """ 실패한 주문의 {rqName: 사유} """
+
+        return {handle.rqName: handle.msg for handle in self.rejected}
+
+    def summary(self):
+        return {
+            "total": len(self.handles),
+            "accepted": len(self.accepted),
+            "rejected": len(self.rejected),
+            "pending": len(self.handles) - len(self.accepted) - len(self.rejected),
+        }
+
+    def __repr__(self):
+        return "BatchResult({!r})".format(self.summary())
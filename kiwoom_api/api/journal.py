@@ -0,0 +1,397 @@
+from collections import deque, namedtuple
+from datetime import datetime as dt
+import atexit
+import glob
+import json
+import os
+import threading
+import time
+
+from .errors import ParameterValueError
+
+
+# 파일에 기록된 위치, count: 기록한 이벤트 수(프로세스 시작 이후), date: 파일 일자,
+# offset: 파일 크기(byte), seq: 마지막 이벤트의 SEQ
+JournalPosition = namedtuple("JournalPosition", ["count", "date", "offset", "seq"])
+
+
+class OrderJournal:
+    """ 주문 이벤트를 일자별 JSONL 파일에 기록하는 클래스입니다.
+
+    write() 메서드는 이벤트를 queue에 넣기만 하고 즉시 반환하며,
+    background thread가 queue에 쌓인 이벤트를 묶어서(batch) 파일에 append 합니다.
+    Qt thread에서는 파일 입출력이 발생하지 않습니다.
+
+    파일명은 {prefix}-{YYYYMMDD}.jsonl 이며, 한 줄에 하나의 이벤트가
+    {"TABLE": table, "SEQ": 일련번호, ...} 형태로 기록됩니다.
+
+    Parameters
+    ----------
+    path: str
+        journal 파일을 저장할 폴더
+    fsync: str
+        "always"(batch마다 fsync), "interval"(fsyncInterval초 마다 fsync),
+        "never"(OS에 위임), default="interval"
+    fsyncInterval: float
+        fsync="interval"인 경우 fsync 주기(초)
+    batchSize: int
+        한 번에 기록할 최대 이벤트 수
+    flushInterval: float
+        queue가 비어있을 때 background thread의 대기 시간(초)
+    maxRetries: int
+        파일을 열지 못한 경우 재시도 횟수, 재시도 간격은 flushInterval부터 2배씩 증가(최대 maxBackoff초).
+        이벤트는 queue에 남겨두며, close() 시점에 재시도 횟수를 모두 소진한 경우에만 버림
+    maxBackoff: float
+        재시도 최대 간격(초)
+    """
+
+    FSYNC_POLICIES = ("always", "interval", "never")
+
+    def __init__(
+        self,
+        path,
+        prefix="orders",
+        fsync="interval",
+        fsyncInterval=1.0,
+        batchSize=512,
+        flushInterval=0.05,
+        maxRetries=5,
+        maxBackoff=5.0,
+        logger=None,
+    ):
+        if fsync not in self.FSYNC_POLICIES:
+            raise ParameterValueError(
+                "fsync는 {} 중 하나여야 합니다.".format(self.FSYNC_POLICIES)
+            )
+
+        if not os.path.exists(path):
+            os.mkdir(path)
+
+        self.path = path
+        self.prefix = prefix
+        self.fsync = fsync
+        self.fsyncInterval = fsyncInterval
+        self.batchSize = batchSize
+        self.flushInterval = flushInterval
+        self.maxRetries = maxRetries
+        self.maxBackoff = maxBackoff
+        self.logger = logger
+
+        # deque의 append/popleft는 thread-safe 하므로 lock 없이 사용
+        self.__queue = deque()
+        self.__wakeup = threading.Event()
+        self.__writing = False
+        self.__closed = False
+        self.__failures = 0  # 연속으로 파일을 열지 못한 횟수
+        self.__retryTime = 0
+
+        self.__file = None
+        self.__fileDate = None
+        self.__offset = 0
+        self.__lastFsync = time.time()
+        self.seq = 0
+
+        self.__enqueued = 0  # write() 호출 수
+        self.__dequeued = 0  # background thread가 queue에서 꺼낸 이벤트 수
+        self.__committed = None  # JournalPosition
+
+        self.__thread = threading.Thread(
+            target=self.__run, name="OrderJournal", daemon=True
+        )
+        self.__thread.start()
+        atexit.register(self.close)
+
+    def filePath(self, date):
+        """ 해당 일자(YYYYMMDD)의 journal 파일 경로 """
+
+        return os.path.join(self.path, "{}-{}.jsonl".format(self.prefix, date))
+
+    def write(self, table, record):
+        """ 이벤트를 queue에 추가합니다. (파일 기록은 background thread에서 수행)
+
+        Parameters
+        ----------
+        table: str
+            이벤트 구분, ex) orders_submitted, orders_executed, orders_cancelled
+        record: dict or object
+            toDict() 메서드가 있는 객체는 background thread에서 dict로 변환
+        """
+
+        if self.__closed:
+            raise ValueError("OrderJournal is closed")
+
+        self.__queue.append((table, time.time(), record))
+        self.__enqueued += 1
+        self.__wakeup.set()
+
+    @property
+    def enqueued(self):
+        """ write()로 추가한 이벤트 수 (프로세스 시작 이후) """
+
+        return self.__enqueued
+
+    @property
+    def committed(self):
+        """ background thread가 파일에 기록을 마친 위치 (JournalPosition), 기록한 적이 없으면 None
+
+        enqueued - committed.count 개의 이벤트는 아직 queue에 있으며,
+        날짜가 바뀌지 않았다면 파일의 offset 이후에 SEQ가 seq + 1부터 순서대로 기록됩니다.
+        """
+
+        return self.__committed
+
+    def flush(self, timeout=None):
+        """ queue에 쌓인 이벤트가 모두 기록될 때까지 대기합니다.
+        파일 열기를 maxRetries 번 넘게 연속으로 실패하면 timeout 전이라도 False를 반환합니다.
+        (background thread는 이벤트를 queue에 남겨두고 계속 재시도)
+
+        Parameters
+        ----------
+        timeout: float
+            최대 대기 시간(초), default=None(재시도 횟수를 소진할 때까지 대기)
+
+        Returns
+        ----------
+        bool
+            timeout 이내에 모두 기록되었으면 True
+        """
+
+        self.__wakeup.set()
+        deadline = None if timeout is None else time.time() + timeout
+        while self.__queue or self.__writing:
+            if deadline is not None and time.time() > deadline:
+                return False
+            if self.__failures > self.maxRetries:
+                return False
+            time.sleep(0.001)
+        return True
+
+    def close(self):
+        """ 남은 이벤트를 모두 기록하고 background thread를 종료합니다. """
+
+        if self.__closed:
+            return
+
+        self.__closed = True
+        self.__wakeup.set()
+        self.__thread.join()
+
+    def __run(self):
+        while True:
+            self.__wakeup.wait(self.flushInterval)
+            self.__wakeup.clear()
+
+            if time.time() >= self.__retryTime:
+                while self.__queue:
+                    self.__writing = True
+                    written = self.__writeBatch()
+                    self.__writing = False
+                    if not written:
+                        break
+
+            self.__sync(force=False)
+
+            if self.__closed:
+                if not self.__queue:
+                    break
+                if self.__failures > self.maxRetries:
+                    dropped = len(self.__queue)
+                    self.__queue.clear()
+                    if self.logger:
+                        self.logger.error(
+                            "ERROR: Order journal dropped {} records after {} retries",
+                            dropped,
+                            self.maxRetries,
+                        )
+                    break
+
+        self.__sync(force=True)
+        if self.__file is not None:
+            self.__file.close()
+            self.__file = None
+
+    def __writeBatch(self):
+        """ queue의 이벤트를 batchSize 만큼 기록
+
+        Returns
+        ----------
+        bool
+            파일을 열지 못한 경우 False (이벤트는 queue에 남겨두고 재시도)
+        """
+
+        queue = self.__queue
+        date = dt.fromtimestamp(queue[0][1]).strftime("%Y%m%d")
+
+        try:
+            f = self.__open(date)
+        except Exception as e:
+            self.__failures += 1
+            backoff = min(self.flushInterval * 2 ** self.__failures, self.maxBackoff)
+            self.__retryTime = time.time() + backoff
+            if self.logger:
+                self.logger.error(
+                    "ERROR: Order journal open failed {}, retry in {:.2f}s ({} records queued)",
+                    e,
+                    backoff,
+                    len(queue),
+                )
+            return False
+
+        self.__failures = 0
+
+        lines = []
+        for _ in range(self.batchSize):
+            try:
+                table, timestamp, record = queue[0]
+            except IndexError:
+                break
+
+            # 날짜가 바뀌면 다음 batch에서 새 파일에 기록
+            if dt.fromtimestamp(timestamp).strftime("%Y%m%d") != date:
+                break
+
+            queue.popleft()
+            self.__dequeued += 1
+            self.seq += 1
+            line = {"TABLE": table, "SEQ": self.seq}
+            line.update(record.toDict() if hasattr(record, "toDict") else record)
+            lines.append(json.dumps(line, ensure_ascii=False, separators=(",", ":")))
+
+        try:
+            data = ("\n".join(lines) + "\n").encode("utf-8")
+            f.write(data)
+            f.flush()
+            self.__offset += len(data)
+            if self.fsync == "always":
+                self.__sync(force=True)
+        except Exception as e:
+            if self.logger:
+                self.logger.error("ERROR: Order journal write failed {}".format(e))
+            try:  # 일부만 기록된 경우
+                self.__offset = os.fstat(f.fileno()).st_size
+            except OSError:
+                pass
+
+        self.__committed = JournalPosition(self.__dequeued, date, self.__offset, self.seq)
+        return True
+
+    def __open(self, date):
+        if self.__fileDate != date:
+            if self.__file is not None:
+                self.__sync(force=True)
+                self.__file.close()
+
+            filePath = self.filePath(date)
+            self.__file = open(filePath, "ab")
+            self.__fileDate = date
+            self.__offset = os.path.getsize(filePath)
+            self.seq = JournalReader.countRecords(filePath)
+        return self.__file
+
+    def __sync(self, force):
+        if self.__file is None or self.fsync == "never":
+            return
+
+        now = time.time()
+        if force or (now - self.__lastFsync >= self.fsyncInterval):
+            os.fsync(self.__file.fileno())
+            self.__lastFsync = now
+
+
+class JournalReader:
+    """ OrderJournal이 기록한 JSONL 파일을 읽는 클래스입니다.
+
+    table을 지정하면 각 줄의 앞부분만 비교하여 해당하지 않는 줄은
+    json 파싱 없이 건너뜁니다.
+
+    Parameters
+    ----------
+    path: str
+        journal 폴더
+    prefix: str
+        journal 파일명 prefix
+    """
+
+    def __init__(self, path, prefix="orders"):
+        self.path = path
+        self.prefix = prefix
+
+    def filePath(self, date):
+        return os.path.join(self.path, "{}-{}.jsonl".format(self.prefix, date))
+
+    @property
+    def dates(self):
+        """ journal 파일이 존재하는 일자(YYYYMMDD) 목록 """
+
+        pattern = os.path.join(self.path, "{}-*.jsonl".format(self.prefix))
+        start = len(self.prefix) + 1
+        return sorted(os.path.basename(p)[start : start + 8] for p in glob.glob(pattern))
+
+    def iterRecords(self, date=None, tables=None, offset=0):
+        """ journal에 기록된 이벤트를 순서대로 반환합니다.
+
+        Parameters
+        ----------
+        date: str
+            일자(YYYYMMDD), default=오늘
+        tables: list of str
+            반환할 table 목록, default=전체
+        offset: int
+            읽기 시작할 파일 위치(byte)
+
+        Yields
+        ----------
+        dict
+        """
+
+        for _, record in self.iterRecordsWithOffset(date, tables, offset):
+            yield record
+
+    def iterRecordsWithOffset(self, date=None, tables=None, offset=0, end=None):
+        """ iterRecords()와 같으나, 다음 줄의 파일 위치(byte)를 함께 반환합니다.
+        end를 지정하면 해당 파일 위치(byte)까지만 읽습니다.
+
+        Yields
+        ----------
+        (int, dict)
+        """
+
+        if date is None:
+            date = dt.now().strftime("%Y%m%d")
+
+        filePath = self.filePath(date)
+        if not os.path.exists(filePath):
+            return
+
+        prefixes = None
+        if tables is not None:
+            prefixes = tuple(
+                '{{"TABLE":"{}",'.format(table).encode("utf-8") for table in tables
+            )
+
+        with open(filePath, "rb") as f:
+            f.seek(offset)
+            pos = offset
+            for line in f:
+                pos += len(line)
+                if not line.endswith(b"\n"):  # 기록 중인 마지막 줄
+                    break
+                if end is not None and pos > end:
+                    break
+                if prefixes is not None and not line.startswith(prefixes):
+                    continue
+                yield pos, json.loads(line)
+
+    def __iter__(self):
+        for date in self.dates:
+            yield from self.iterRecords(date)
+
+    @staticmethod
+    def countRecords(filePath):
+        """ 파일에 기록된 이벤트 수 """
+
+        if not os.path.exists(filePath):
+            return 0
+
+        with open(filePath, "rb") as f:
+            return sum(chunk.count(b"\n") for chunk in iter(lambda: f.read(1 << 20), b""))
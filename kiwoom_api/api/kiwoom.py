@@ -9,11 +9,24 @@ import pandas as pd
 from PyQt5.QAxContainer import QAxWidget
 from PyQt5.QtCore import QEventLoop, QTimer
 
-from ..utility.utility import dictListToListDict, removeSign, writeJson
+from ..utility.utility import dictListToListDict, removeSign
 from ._logger import Logger
+from .adjust import PriceAdjuster
+from .chejan import BALANCE_PLAN, CHEJAN_PLANS
+from .condition import ConditionDelayCheck, ConditionRegistry
+from .delta import TrDelta
 from .errors import (KiwoomConnectError, KiwoomProcessingError,
                      ParameterTypeError, ParameterValueError)
-from .return_codes import FidList, ReturnCode, TRKeys
+from .journal import OrderJournal
+from .latency import LatencyRecorder
+from .ledger import PositionLedger
+from .order_book import OrderBook
+from .pretrade import PreTradeTable
+from .quote_planner import QuotePlanner
+from .recovery import OrderRecovery
+from .return_codes import ReturnCode, TRKeys
+from .symbol_master import SymbolMaster
+from .tr_cache import TrCache
 
 
 class Kiwoom(QAxWidget):
@@ -31,7 +44,13 @@ class Kiwoom(QAxWidget):
         cls.instance = cls.__getInstance
         return cls.__instance
 
-    def __init__(self):
+    def __init__(self, structuredLog=False):
+        """
+        Parameters
+        ----------
+        structuredLog: bool
+            log 파일을 event 한 건당 한 줄의 JSONL로 기록 (Logger 참고)
+        """
 
         super().__init__()
         self.setControl("KHOPENAPI.KHOpenAPICtrl.1")
@@ -53,12 +72,68 @@ class Kiwoom(QAxWidget):
 
         # logging 클래스
         self.homepath = os.environ.get('userprofile')
-        self.logger = Logger(path=self.log_path, name="Kiwoom")
+        self.logger = Logger(path=self.log_path, name="Kiwoom", structured=structuredLog)
 
         # API 요청 제한 관리 Queue (1초 5회, 1시간 1,000회)
         self.requestDelayCheck = APIDelayCheck(logger=self.logger)
         self.orderDelayCheck = APIDelayCheck(logger=self.logger)
 
+        # 주문 이벤트 기록 (background thread에서 일자별 파일에 batch로 기록)
+        self.orderJournal = OrderJournal(self.order_log_path, logger=self.logger)
+
+        # 주문 이벤트로 관리하는 자체 주문 상태 (미체결, 잔량, 평균체결가)
+        self.orderBook = OrderBook()
+
+        # 잔고통보 이벤트로 관리하는 계좌별 보유 종목 및 예수금
+        self.ledger = PositionLedger()
+
+        # 재시작시 당일 journal로 주문 상태와 보유 현황을 복구
+        self.recovery = OrderRecovery(
+            self.orderJournal, self.orderBook, self.ledger, logger=self.logger
+        )
+
+        # 종목 기본 정보 (DataFeeder.loadSymbolMaster()로 거래일마다 한 번 수집)
+        self.symbolMaster = SymbolMaster(self.symbol_path)
+
+        # 주문 전 검증용 종목별 기준 정보 (DataFeeder.loadPreTradeTable()로 적재)
+        self.preTrade = PreTradeTable()
+
+        # 조건검색 요청 제한 관리 (1초 5회, 같은 조건식 1분 1회)
+        self.conditionDelayCheck = ConditionDelayCheck(logger=self.logger)
+
+        # 조건식 목록 및 조건식별 편입 종목
+        self.conditions = ConditionRegistry()
+
+        # 비동기 주문의 응답 처리 (rqName: OrderHandle)
+        self.orderHandles = {}
+
+        # ackTimeout이 지난 비동기 주문 (rqName: OrderHandle), 늦게 도착한 주문번호를 반영
+        self.expiredOrderHandles = {}
+
+        # 비동기 TR 요청의 응답 처리 (rqName: callback)
+        self.trHandlers = {}
+
+        # 계좌별 최근 조회 결과 (accNo: AccountSnapshot)
+        self.accountSnapshots = {}
+
+        # 주기적으로 조회하는 TR의 이전 결과 (DataFeeder.requestDelta())
+        self.trDelta = TrDelta()
+
+        # 저장된 분봉의 수정주가 계산 (DataFeeder.getAdjustedMinuteBars())
+        self.priceAdjuster = PriceAdjuster()
+
+        # 과거 데이터 TR 응답 cache (None이면 사용하지 않음)
+        self.trCache = TrCache(self.tr_cache_path)
+        self.__inputs = {}  # 다음 요청의 입력값
+        self.__trChains = {}  # 화면번호: 연속조회 중인 요청
+
+        # 종목별 현재가 조회를 OPTKWFID 요청으로 묶어 전송 (DataFeeder.requestQuote())
+        self.quotePlanner = QuotePlanner(self)
+
+        # 주문 단계별 latency 기록
+        self.latency = LatencyRecorder()
+        self.orderBook.addListener(self.latency.onOrderEvent)
+
         # 서버에서 받은 메시지
         self.msg = ""
 
@@ -67,6 +142,9 @@ class Kiwoom(QAxWidget):
         self.OnReceiveTrData.connect(self.eventReceiveTrData)
         self.OnReceiveChejanData.connect(self.eventReceiveChejanData)
         self.OnReceiveMsg.connect(self.eventReceiveMsg)
+        self.OnReceiveConditionVer.connect(self.eventReceiveConditionVer)
+        self.OnReceiveTrCondition.connect(self.eventReceiveTrCondition)
+        self.OnReceiveRealCondition.connect(self.eventReceiveRealCondition)
 
     @property
     def log_path(self):
@@ -81,6 +159,27 @@ class Kiwoom(QAxWidget):
         if not os.path.exists(path):
             os.mkdir(path)
         return path
+
+    @property
+    def symbol_path(self):
+        path = os.path.join(self.homepath, '.kiwoom_symbols')
+        if not os.path.exists(path):
+            os.mkdir(path)
+        return path
+
+    @property
+    def bar_path(self):
+        path = os.path.join(self.homepath, '.kiwoom_bars')
+        if not os.path.exists(path):
+            os.mkdir(path)
+        return path
+
+    @property
+    def tr_cache_path(self):
+        path = os.path.join(self.homepath, '.kiwoom_trcache')
+        if not os.path.exists(path):
+            os.mkdir(path)
+        return path
         
     ###############################################################
     ################### 이벤트 발생 시 메서드   #####################
@@ -126,7 +225,10 @@ class Kiwoom(QAxWidget):
         msg: str 
             서버로 부터의 메시지
         """
-        if hasattr(self, "orderResponse"):
+        handle = self.orderHandles.get(rqName) or self.expiredOrderHandles.get(rqName)
+        if handle is not None:
+            handle.onMsg(msg)
+        elif hasattr(self, "orderResponse"):
             self.orderResponse.update({"msg": msg})
 
         self.logger.debug(msg)
@@ -160,11 +262,32 @@ class Kiwoom(QAxWidget):
         if "ORD" in trCode:
             # 주문번호 획득, 주문번호가 존재하면 주문 성공
             orderNo = self.getCommData(trCode, "", 0, "주문번호")
-            self.orderResponse.update({"orderNo": orderNo})
-            try:
-                self.orderLoop.exit()
-            except AttributeError:
-                pass
+
+            # 비동기 주문(sendOrderAsync)은 rqName으로 OrderHandle을 찾아 전달
+            handle = self.orderHandles.get(rqName)
+            if handle is not None:
+                self.latency.ack(rqName, orderNo)
+                handle.onAck(orderNo)
+                return
+
+            # ackTimeout 이후에 도착한 비동기 주문의 응답
+            handle = self.expiredOrderHandles.pop(rqName, None)
+            if handle is not None:
+                if orderNo:
+                    self.logger.error(
+                        "ERROR: sendOrder() : {} orderNo {} received after ackTimeout".format(
+                            rqName, orderNo
+                        )
+                    )
+                handle.onLateAck(orderNo)
+                return
+
+            if hasattr(self, "orderResponse"):
+                self.orderResponse.update({"orderNo": orderNo})
+                try:
+                    self.orderLoop.exit()
+                except AttributeError:
+                    pass
             return
 
         # TR 이벤트인 경우, orderResponse를 삭제
@@ -176,9 +299,17 @@ class Kiwoom(QAxWidget):
             data = self.__getOPTKWFID(trCode, rqName)
         else:
             data = self.__getData(trCode, rqName)
-        setattr(self, trCode, data)
 
-        self.isNext = 0 if ((inquiry == "0") or (inquiry == "")) else 2  # 추가조회 여부
+        isNext = 0 if ((inquiry == "0") or (inquiry == "")) else 2  # 추가조회 여부
+
+        # 비동기 TR 요청(commRqDataAsync, commKwRqDataAsync)은 rqName으로 callback을 찾아 전달
+        handler = self.trHandlers.pop(rqName, None)
+        if handler is not None:
+            handler(data, isNext)
+            return
+
+        setattr(self, trCode, data)
+        self.isNext = isNext
 
         # TR loop 탈출
         try:
@@ -186,10 +317,11 @@ class Kiwoom(QAxWidget):
         except AttributeError:
             pass
 
-        # TR 이벤트 logging
+        # TR 이벤트 logging (시각은 logger의 listener thread에서 문자열로 변환)
+        now = dt.now()
         eventDetail = {
-            "TIME": dt.now().strftime("%Y-%m-%d %H:%M:%S.%f"),
-            "BASC_DT": dt.now().strftime("%Y-%m-%d"),
+            "TIME": now,
+            "BASC_DT": now.date(),
             "EVENT": "eventReceiveTrData",
             "REQUEST_NAME": rqName,
             "TR_CODE": trCode,
@@ -209,46 +341,113 @@ class Kiwoom(QAxWidget):
         fidList: str
             fidList 구분은 ;(세미콜론) 이다.
         """
+        if gubun == '1': # 잔고통보
+            record = BALANCE_PLAN.fetch(self.getChejanData, dt.now().strftime("%Y-%m-%d"))
+            self.logger.debug(record)
+            self.ledger.apply(record)
+            self.orderJournal.write(BALANCE_PLAN.table, record)
+            return
+
         if gubun != '0': # 주문접수/주문체결이 아니면 logging 안함
             return
-        
+
         orderStatus = self.getChejanData('913').strip() # 주문상태 "접수" or "체결" or "확인"
-        if orderStatus == '접수':
-            table = 'orders_submitted'
-            fidDict = getattr(FidList, 'SUBMITTED')
-        elif orderStatus == '체결':
-            table = 'orders_executed'
-            fidDict = getattr(FidList, 'EXECUTED')
-        elif orderStatus == '확인': #주문취소
-            table = 'orders_cancelled'
-            fidDict = getattr(FidList, 'CANCELLED')
+        plan = CHEJAN_PLANS.get(orderStatus)
+        if plan is None: # 지정된 plan이 없으면 기록 안함
+            self.logger.debug("{} Unknown ORDER_STATUS: {}", dt.now(), orderStatus)
+            return
+
+        # plan에 포함된 FID만 조회
+        record = plan.fetch(self.getChejanData, dt.now().strftime("%Y-%m-%d"), orderStatus)
+        self.logger.debug(record)
+
+        # 주문 상태 반영
+        self.orderBook.apply(record)
+
+        # 체결내역은 journal queue에 넣고, background thread에서 일자별 파일에 기록
+        self.orderJournal.write(plan.table, record)
+
+    def eventReceiveConditionVer(self, returnCode, msg):
+        """ 조건식 목록 수신 이벤트
+        getConditionLoad() 메서드 호출 후, 조건식 목록을 수신하면 호출됩니다.
+
+        Parameters
+        ----------
+        returnCode: int
+            1(성공), 이외에는 실패
+        msg: str
+            서버로 부터의 메시지
+        """
+
+        if returnCode == 1:
+            nameList = self.dynamicCall("GetConditionNameList()")
+            self.conditions.loadNameList(nameList)
         else:
-            table = None # 지정된 table 명이 없으면 json파일 생성 안함
-            fidDict = getattr(FidList, 'ALL')
+            self.logger.error("{} Condition Load Failed : {}", dt.now(), msg)
 
-        resultDict = {
-            "BASC_DT": dt.now().strftime("%Y-%m-%d")
-        }
-        fids = fidList.split(";")
-        for fid in fids:
-            fidName = fidDict.get(fid)
-            if fidName is None:
-                continue
-            data = self.getChejanData(fid).strip()
-            resultDict[fidName] = data
-        self.logger.debug(resultDict)
+        try:
+            self.conditionLoop.exit()
+        except AttributeError:
+            pass
+
+    def eventReceiveTrCondition(self, scrNo, codeList, conditionName, index, inquiry):
+        """ 조건검색 결과 수신 이벤트
+        sendCondition() 메서드 호출 후, 조건검색 결과를 수신하면 호출됩니다.
+
+        Parameters
+        ----------
+        scrNo: str
+            화면번호(4자리)
+        codeList: str
+            ;(세미콜론)으로 구분된 종목코드
+        conditionName: str
+            조건식명
+        index: int
+            조건식 index
+        inquiry: int
+            연속조회(2: 남은 데이터 있음, 이외에는 없음)
+        """
+
+        # 이전 결과에 남은 데이터가 있었으면 연속조회 결과
+        isNext = conditionName in self.conditions.hasNext
+        self.conditions.setMatches(conditionName, codeList, isNext=isNext)
+        if inquiry == 2:
+            self.conditions.hasNext.add(conditionName)
+        else:
+            self.conditions.hasNext.discard(conditionName)
+
+        try:
+            self.conditionLoop.exit()
+        except AttributeError:
+            pass
+
+        self.logger.debug(
+            {
+                "TIME": dt.now(),
+                "EVENT": "eventReceiveTrCondition",
+                "CONDITION_NAME": conditionName,
+                "CODE_COUNT": len(self.conditions.matches[conditionName]),
+            }
+        )
+
+    def eventReceiveRealCondition(self, code, eventType, conditionName, index):
+        """ 실시간 조건검색 이벤트
+        실시간 조건검색으로 등록한 조건식에 종목이 편입/이탈될 때 호출됩니다.
+
+        Parameters
+        ----------
+        code: str
+            종목코드
+        eventType: str
+            "I"(편입), "D"(이탈)
+        conditionName: str
+            조건식명
+        index: str
+            조건식 index
+        """
+
+        self.conditions.applyRealEvent(code, eventType, conditionName)
 
-        
-        # 체결내역은 json으로 임시저장하고, 
-        # 비동기 watcher를 지정해서 DB에 쓰는 방식으로 최적화
-        if table is not None:
-            t = dt.now().strftime('%Y%m%d%H%M%S%f')
-            file_path = os.path.join(self.order_log_path, f'{table}-{t}')
-            try:
-                writeJson(resultDict, file_path)
-            except Exception as e:
-                self.logger.error(f'ERROR: Order JSON logging {e}')
-        
     ###############################################################
     #################### 로그인 관련 메서드   ######################
     ###############################################################
@@ -350,10 +549,11 @@ class Kiwoom(QAxWidget):
         if (key == "계좌번호") and (value not in self.accNos):
             raise KiwoomProcessingError("ERROR: Invalid 계좌번호")
 
-        if (key == "종목코드") and (value not in self.codes):
+        if (key == "종목코드") and not self.isValidCode(value):
             raise KiwoomProcessingError("ERROR: Invalid 종목코드")
 
         self.dynamicCall("SetInputValue(QString, QString)", key, value)
+        self.__inputs[key] = value
 
     def commRqData(self, rqName, trCode, inquiry, scrNo):
         """ 키움서버에 TR 요청을 한다.
@@ -388,6 +588,60 @@ class Kiwoom(QAxWidget):
         ):
             raise ParameterTypeError()
 
+        inputs, self.__inputs = self.__inputs, {}
+        if self.trCache is None:
+            self.__commRqData(rqName, trCode, inquiry, scrNo)
+            return
+
+        # 연속조회는 화면번호별로 이전 page의 응답에 연결하여 cache를 확인
+        # (cacheable: 이전 page가 모두 저장 조건을 만족하거나 cache에서 읽은 경우만 저장)
+        chain = self.__trChains.get(scrNo)
+        if inquiry == 0:
+            chain = {
+                "trCode": trCode,
+                "inputs": inputs,
+                "page": 0,
+                "digest": None,
+                "live": False,
+                "cacheable": True,
+            }
+            self.__trChains[scrNo] = chain
+        elif chain is not None and chain["trCode"] == trCode:
+            chain["page"] += 1
+        else:  # 이전 page를 알 수 없는 연속조회
+            self.__trChains.pop(scrNo, None)
+            self.__commRqData(rqName, trCode, inquiry, scrNo)
+            return
+
+        key = self.trCache.key(trCode, chain["inputs"], chain["page"], chain["digest"])
+        cached = self.trCache.get(trCode, key)
+        if cached is not None:
+            data, isNext = cached
+            setattr(self, trCode, data)
+            self.isNext = isNext
+            self.logger.debug("{}  commRqData {} (cache)", dt.now(), rqName)
+        else:
+            if inquiry == 2 and not chain["live"]:
+                # 이전 page를 cache에서 읽어 서버의 연속조회 상태가 없으므로 첫 page부터 다시 요청
+                for page in range(chain["page"] + 1):
+                    for inputKey, value in chain["inputs"].items():
+                        self.dynamicCall("SetInputValue(QString, QString)", inputKey, value)
+                    self.__commRqData(rqName, trCode, 2 if page else 0, scrNo)
+            else:
+                self.__commRqData(rqName, trCode, inquiry, scrNo)
+
+            data, isNext = getattr(self, trCode), self.isNext
+            if chain["cacheable"] and self.trCache.isImmutable(
+                chain["inputs"], data, page=chain["page"]
+            ):
+                self.trCache.put(trCode, key, data, isNext)
+            else:
+                chain["cacheable"] = False
+
+        chain["live"] = cached is None
+        chain["digest"] = self.trCache.digest(data, isNext)
+
+    def __commRqData(self, rqName, trCode, inquiry, scrNo):
         # API 제한 확인
         self.requestDelayCheck.checkDelay()
 
@@ -408,7 +662,7 @@ class Kiwoom(QAxWidget):
             raise KiwoomProcessingError()
 
         # 루프 생성: eventReceiveTrData() 메서드에서 루프를 종료시킨다.
-        self.logger.debug("{}  commRqData {}".format(dt.now(), rqName))
+        self.logger.debug("{}  commRqData {}", dt.now(), rqName)
         self.requestLoop = QEventLoop()
         self.requestLoop.exec_()
 
@@ -584,13 +838,247 @@ class Kiwoom(QAxWidget):
             raise KiwoomProcessingError()
 
         # logging
-        self.logger.debug("{}  commKwRqData {}".format(dt.now(), rqName))
+        self.logger.debug("{}  commKwRqData {}", dt.now(), rqName)
 
         # eventReceiveTrData()에서 loop 종료 or timeout
         self.requestLoop = QEventLoop()
         QTimer.singleShot(1000, self.requestLoop.exit)  # timout in 1000 ms
         self.requestLoop.exec_()
 
+    def commRqDataAsync(self, rqName, trCode, inquiry, scrNo, callback):
+        """ commRqData()의 비동기 버전, 응답을 기다리지 않고 즉시 반환한다.
+
+        입력값은 호출 직전에 setInputValue()로 지정하며,
+        수신된 데이터는 rqName으로 구분하여 callback(data, isNext) 형태로 전달된다.
+        요청 제한은 호출하는 쪽에서 requestDelayCheck.nextDelay()로 관리한다.
+
+        Parameters
+        ----------
+        rqName: str
+            TR 요청명, 요청마다 고유한 값을 사용
+        callback: callable
+            callback(data, isNext), data는 commRqData()의 self.{trCode}와 같은 형태
+        """
+
+        if not self.connectState:
+            raise KiwoomConnectError()
+
+        if not (
+            isinstance(rqName, str)
+            and isinstance(trCode, str)
+            and isinstance(inquiry, int)
+            and isinstance(scrNo, str)
+        ):
+            raise ParameterTypeError()
+
+        self.trHandlers[rqName] = callback
+        self.__inputs = {}
+        returnCode = self.dynamicCall(
+            "CommRqData(QString, QString, int, QString)",
+            rqName,
+            trCode,
+            inquiry,
+            scrNo,
+        )
+        self.__checkAsyncReturnCode("commRqDataAsync", rqName, returnCode)
+
+    def commKwRqDataAsync(self, arrCode, codeCount, rqName, scrNo, callback, typeFlag=0):
+        """ commKwRqData()의 비동기 버전, 응답을 기다리지 않고 즉시 반환한다.
+
+        수신된 데이터는 rqName으로 구분하여 callback(data, isNext) 형태로 전달된다.
+        요청 제한은 호출하는 쪽에서 requestDelayCheck.nextDelay()로 관리한다.
+
+        Parameters
+        ----------
+        arrCode: str
+            종목코드, 세미콜론(;)으로 구분, 한번에 100종목까지 조회가능
+        codeCount: int
+            codes에 지정한 종목의 갯수.
+        rqName: str
+            TR 요청명, 요청마다 고유한 값을 사용
+        callback: callable
+            callback(data, isNext), data는 {"멀티데이터": [..]}
+        """
+
+        if not self.connectState:
+            raise KiwoomConnectError()
+
+        if not (
+            isinstance(arrCode, str)
+            and isinstance(codeCount, int)
+            and isinstance(rqName, str)
+            and isinstance(scrNo, str)
+            and isinstance(typeFlag, int)
+        ):
+            raise ParameterTypeError()
+
+        self.trHandlers[rqName] = callback
+        returnCode = self.dynamicCall(
+            "CommKwRqData(QString, QBoolean, int, int, QString, QString)",
+            arrCode,
+            0,
+            codeCount,
+            typeFlag,
+            rqName,
+            scrNo,
+        )
+        self.__checkAsyncReturnCode("commKwRqDataAsync", rqName, returnCode)
+
+    def __checkAsyncReturnCode(self, method, rqName, returnCode):
+        if returnCode == ReturnCode.OP_ERR_NONE:
+            self.logger.debug("{}  {} {}", dt.now(), method, rqName)
+            return
+
+        self.trHandlers.pop(rqName, None)
+        cause = getattr(ReturnCode, "CAUSE").get(returnCode)
+        self.logger.error(
+            "{} {} {} Request Failed!, CAUSE: {}".format(dt.now(), method, rqName, cause)
+        )
+        raise KiwoomProcessingError("ERROR: {}() : {}".format(method, cause))
+
+    def disconnectRealData(self, scrNo):
+        """ 화면번호에 등록된 실시간 데이터를 해지한다.
+        (commKwRqData()로 조회한 종목은 실시간 데이터가 자동으로 등록됨)
+        """
+
+        self.dynamicCall("DisconnectRealData(QString)", scrNo)
+
+    ###############################################################
+    ################### 조건검색 관련 메서드   #####################
+    ## 조건검색 1초 5회, 같은 조건식 1분 1회, 실시간 최대 10개 제한 ##
+    ###############################################################
+
+    def getConditionLoad(self):
+        """ 서버에 저장된 사용자 조건식 목록을 요청한다.
+        조건식 목록은 eventReceiveConditionVer() 이벤트에서 수신하여
+        self.conditions에 저장된다.
+
+        Returns
+        ----------
+        conditions: dict
+            {조건식명: 조건식 index}
+        """
+
+        if not self.connectState:
+            raise KiwoomConnectError()
+
+        returnCode = self.dynamicCall("GetConditionLoad()")
+        if returnCode != 1:  # 1: 성공
+            raise KiwoomProcessingError("ERROR: getConditionLoad() Failed")
+
+        # eventReceiveConditionVer()에서 루프 종료
+        self.conditionLoop = QEventLoop()
+        self.conditionLoop.exec_()
+        return dict(self.conditions.conditions)
+
+    def getConditionNameList(self):
+        """ 조건식 목록을 반환한다.
+        조건식 목록을 불러온 적이 없으면 getConditionLoad()를 먼저 호출한다.
+
+        Returns
+        ----------
+        conditions: dict
+            {조건식명: 조건식 index}
+        """
+
+        if not self.conditions.isLoaded:
+            return self.getConditionLoad()
+        return dict(self.conditions.conditions)
+
+    def sendCondition(self, scrNo, conditionName, index, isRealTime, timeout=10000):
+        """ 조건검색을 요청한다.
+        조건검색 결과는 eventReceiveTrCondition() 이벤트에서 수신하며,
+        실시간 조건검색(isRealTime=1)인 경우 이후의 편입/이탈은
+        eventReceiveRealCondition() 이벤트로 수신한다.
+
+        Parameters
+        ----------
+        scrNo: str
+            화면번호(4자리)
+        conditionName: str
+            조건식명
+        index: int
+            조건식 index
+        isRealTime: int
+            0(일반조회), 1(실시간조회), 2(연속조회)
+        timeout: int
+            결과 수신 대기 시간(ms), default=10000
+
+        Returns
+        ----------
+        codes: set
+            조건식에 편입된 종목코드
+        """
+
+        if not self.connectState:
+            raise KiwoomConnectError()
+
+        if not (
+            isinstance(scrNo, str)
+            and isinstance(conditionName, str)
+            and isinstance(index, int)
+            and isinstance(isRealTime, int)
+        ):
+            raise ParameterTypeError()
+
+        # 조건검색 제한 확인
+        self.conditionDelayCheck.checkDelay(
+            conditionName,
+            realTimeCount=len(self.conditions.realTime),
+            isRealTime=isRealTime == 1,
+            isNext=isRealTime == 2,
+        )
+
+        returnCode = self.dynamicCall(
+            "SendCondition(QString, QString, int, int)",
+            scrNo,
+            conditionName,
+            index,
+            isRealTime,
+        )
+
+        if returnCode != 1:  # 1: 성공
+            self.logger.error(
+                "{} sendCondition {} Request Failed!".format(dt.now(), conditionName)
+            )
+            raise KiwoomProcessingError()
+
+        self.conditionDelayCheck.record(conditionName)
+        if isRealTime == 1:
+            self.conditions.realTime[conditionName] = scrNo
+
+        # eventReceiveTrCondition()에서 루프 종료 or timeout
+        self.logger.debug("{}  sendCondition {}", dt.now(), conditionName)
+        self.conditionLoop = QEventLoop()
+        QTimer.singleShot(timeout, self.conditionLoop.exit)
+        self.conditionLoop.exec_()
+        return self.conditions.getMatches(conditionName)
+
+    def sendConditionStop(self, scrNo, conditionName, index):
+        """ 실시간 조건검색을 중지한다.
+
+        Parameters
+        ----------
+        scrNo: str
+            화면번호(4자리)
+        conditionName: str
+            조건식명
+        index: int
+            조건식 index
+        """
+
+        if not (
+            isinstance(scrNo, str)
+            and isinstance(conditionName, str)
+            and isinstance(index, int)
+        ):
+            raise ParameterTypeError()
+
+        self.dynamicCall(
+            "SendConditionStop(QString, QString, int)", scrNo, conditionName, index
+        )
+        self.conditions.realTime.pop(conditionName, None)
+
     ###############################################################
     ################### 주문과 잔고처리 관련 메서드 #################
     ########################## 1초 5회 제한 ########################
@@ -670,7 +1158,7 @@ class Kiwoom(QAxWidget):
             raise KiwoomConnectError(msg)
 
         # Error: code not supported
-        if not code in self.codes:
+        if not self.isValidCode(code):
 
             msg = f"Code not supported: {code}"
             self.orderResponse.update({"msg": msg})
@@ -700,6 +1188,77 @@ class Kiwoom(QAxWidget):
         #QTimer.singleShot(1000, self.orderLoop.exit)  # timout in 1000 ms
         self.orderLoop.exec_()
 
+    def sendOrderAsync(self, handle, ackTimeout=5000):
+        """ 주식 주문 메서드 (비동기)
+
+        sendOrder()와 달리 주문번호 수신을 기다리지 않고 즉시 반환한다.
+        주문번호(eventReceiveTrData)와 서버 메시지(eventReceiveMsg)는
+        rqName으로 구분하여 handle에 전달되므로, handle마다 고유한 rqName을 사용해야 한다.
+        요청 제한은 호출하는 쪽에서 orderDelayCheck.nextDelay()로 관리한다.
+
+        Parameters
+        ----------
+        handle: OrderHandle
+            Executor.submit()에서 생성한 주문 handle
+        ackTimeout: int
+            주문번호를 수신하지 못하면 주문 실패로 처리할 시간(ms)
+        """
+
+        spec = handle.spec
+
+        if not self.connectState:
+            raise KiwoomConnectError("Server not connected")
+
+        if not self.isValidCode(spec["code"]):
+            raise KiwoomProcessingError(
+                "ERROR: sendOrder() : Code not supported: {}".format(spec["code"])
+            )
+
+        orderParams = [
+            handle.rqName,
+            spec["scrNo"],
+            spec["accNo"],
+            spec["orderType"],
+            spec["code"],
+            spec["qty"],
+            spec["price"],
+            spec["hogaType"],
+            spec["originOrderNo"],
+        ]
+
+        self.orderHandles[handle.rqName] = handle
+        try:
+            returnCode = self.dynamicCall(
+                "SendOrder(QString, QString, QString, int, QString, int, int, QString, QString)",
+                orderParams,
+            )
+        except Exception as msg:
+            del self.orderHandles[handle.rqName]
+            raise KiwoomProcessingError("ERROR: sendOrder() : {}".format(msg))
+
+        if returnCode != 0:
+            del self.orderHandles[handle.rqName]
+            msg = getattr(ReturnCode, "CAUSE").get(returnCode)
+            raise KiwoomProcessingError("ERROR: sendOrder() : {}".format(msg))
+
+        handle.onSent()
+        QTimer.singleShot(
+            ackTimeout, functools.partial(self.__expireOrderHandle, handle.rqName)
+        )
+
+    def __expireOrderHandle(self, rqName):
+        """ ackTimeout 이내에 주문번호를 수신하지 못한 주문은 실패로 처리
+        이후에 주문번호가 도착하면 반영할 수 있도록 expiredOrderHandles에 남겨둔다.
+        """
+
+        handle = self.orderHandles.pop(rqName, None)
+        if handle is None:
+            return
+
+        if not handle.done():
+            handle.onReject(handle.msg or "ERROR: sendOrder() : 주문번호 수신 timeout")
+            self.expiredOrderHandles[rqName] = handle
+
     def getChejanData(self, fid):
         """ 주문접수, 주문체결, 잔고정보를 얻어오는 메서드
         이 메서드는 receiveChejanData() 이벤트 메서드가 호출될 때
@@ -820,6 +1379,16 @@ class Kiwoom(QAxWidget):
         codes += self.__getCodeListByMarket("8")  # ETF
         return codes
 
+    def isValidCode(self, code):
+        """ 주문 및 조회 가능한 종목코드인지 확인
+        preTrade 테이블 혹은 symbolMaster가 적재되어 있으면 COM 호출 없이 확인한다. """
+
+        if self.preTrade.isLoaded:
+            return code in self.preTrade
+        if self.symbolMaster.isLoaded:
+            return code in self.symbolMaster
+        return code in self.codes
+
     """
     def __killOldProcess(self):
 
@@ -891,3 +1460,57 @@ class APIDelayCheck:
 
         # 새로운 request 시간 기록
         self.rqHistory.append(time.time())
+
+    def nextDelay(self):
+        """ 다음 요청이 가능할 때까지 남은 시간(초)을 반환합니다. (지연하지 않음)
+
+        checkDelay()와 달리 요청을 지연하지 않으므로, QTimer 등으로
+        요청을 예약하는 비동기 방식에서 사용합니다.
+        요청을 보낸 뒤에는 record()를 호출하여야 합니다.
+
+        Returns
+        ----------
+        float
+            0이면 즉시 요청 가능
+        """
+
+        now = time.time()
+        delay = 0
+
+        # 1초 5회
+        if len(self.rqHistory) >= 5:
+            delay = max(delay, self.rqHistory[-5] + 1 - now)
+
+        # 1시간 1,000회
+        if len(self.rqHistory) == self.rqHistory.maxlen:
+            delay = max(delay, self.rqHistory[0] + 3610 - now)
+
+        return max(0, delay)
+
+    def record(self):
+        """ 새로운 request 시간 기록 (nextDelay()와 함께 사용) """
+
+        self.rqHistory.append(time.time())
+
+    def remaining(self):
+        """ 최근 1시간 동안의 요청 수를 제외한, 지연 없이 요청 가능한 남은 횟수 """
+
+        since = time.time() - 3610
+        return self.rqHistory.maxlen - sum(1 for t in self.rqHistory if t > since)
+
+    def estimate(self, count):
+        """ 지금부터 count회 요청하는 데 걸리는 최소 시간(초)
+
+        요청 기록에 1초 5회, 1시간 1,000회 제한을 적용하여 계산합니다.
+        """
+
+        now = time.time()
+        history = deque(self.rqHistory, maxlen=self.rqHistory.maxlen)
+        t = now
+        for _ in range(count):
+            if len(history) >= 5:
+                t = max(t, history[-5] + 1)
+            if len(history) == history.maxlen:
+                t = max(t, history[0] + 3610)
+            history.append(t)
+        return t - now
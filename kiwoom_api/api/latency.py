@@ -0,0 +1,307 @@
+from datetime import datetime as dt
+import json
+import os
+import time
+
+from .order_book import OrderStatus
+
+
+class LatencyHistogram:
+    """ HDR Histogram 방식의 latency 분포 클래스입니다.
+
+    값(마이크로초)을 log-linear bucket에 누적합니다. 2의 거듭제곱 구간마다
+    64개의 bucket을 두어 상대오차 약 1.6% 이내로 percentile을 계산하며,
+    기록에 필요한 메모리와 시간은 값의 갯수와 무관하게 일정합니다.
+    """
+
+    SUB_BITS = 7
+    SUB_COUNT = 1 << SUB_BITS  # 128
+    HALF_COUNT = SUB_COUNT >> 1  # 64
+    MAX_SHIFT = 40
+
+    def __init__(self):
+        self.counts = [0] * (self.SUB_COUNT + self.MAX_SHIFT * self.HALF_COUNT)
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = None
+
+    @classmethod
+    def _index(cls, value):
+        if value < cls.SUB_COUNT:
+            return value
+
+        shift = min(value.bit_length() - cls.SUB_BITS, cls.MAX_SHIFT)
+        top = min(value >> shift, cls.SUB_COUNT - 1)
+        return cls.SUB_COUNT + (shift - 1) * cls.HALF_COUNT + (top - cls.HALF_COUNT)
+
+    @classmethod
+    def _value(cls, index):
+        """ bucket의 대표값(구간의 중간값) """
+
+        if index < cls.SUB_COUNT:
+            return index
+
+        shift, offset = divmod(index - cls.SUB_COUNT, cls.HALF_COUNT)
+        shift += 1
+        low = (offset + cls.HALF_COUNT) << shift
+        return low + ((1 << shift) >> 1)
+
+    def record(self, value):
+        """ 값(마이크로초, int)을 기록합니다. """
+
+        value = max(0, int(value))
+        self.counts[self._index(value)] += 1
+        self.count += 1
+        self.total += value
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+
+    def merge(self, other):
+        for i, c in enumerate(other.counts):
+            if c:
+                self.counts[i] += c
+        self.count += other.count
+        self.total += other.total
+        if other.min is not None:
+            self.min = other.min if self.min is None else min(self.min, other.min)
+            self.max = other.max if self.max is None else max(self.max, other.max)
+        return self
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else 0
+
+    def percentile(self, p):
+        """ p(0 ~ 100) percentile 값(마이크로초), 기록된 값이 없으면 None """
+
+        if not self.count:
+            return None
+
+        rank = max(1, int(round(p / 100 * self.count)))
+        cumulative = 0
+        for index, c in enumerate(self.counts):
+            cumulative += c
+            if cumulative >= rank:
+                return min(self._value(index), self.max)
+        return self.max
+
+    def summary(self, percentiles=(50, 90, 99, 99.9)):
+        result = {
+            "count": self.count,
+            "mean": round(self.mean, 1),
+            "min": self.min,
+            "max": self.max,
+        }
+        for p in percentiles:
+            result["p{}".format(p)] = self.percentile(p)
+        return result
+
+    def toDict(self):
+        """ 직렬화용 dict (값이 있는 bucket만 저장) """
+
+        return {
+            "count": self.count,
+            "total": self.total,
+            "min": self.min,
+            "max": self.max,
+            "buckets": {str(i): c for i, c in enumerate(self.counts) if c},
+        }
+
+    @classmethod
+    def fromDict(cls, d):
+        histogram = cls()
+        for i, c in d.get("buckets", {}).items():
+            histogram.counts[int(i)] = c
+        histogram.count = d.get("count", 0)
+        histogram.total = d.get("total", 0)
+        histogram.min = d.get("min")
+        histogram.max = d.get("max")
+        return histogram
+
+
+class LatencyRecorder:
+    """ 주문 단계별 latency를 기록하는 클래스입니다.
+
+    주문마다 아래 단계의 시각을 time.perf_counter()로 기록하고,
+    직전 단계로부터의 소요시간(segment)과 Executor 진입으로부터의 누적시간(elapsed)을
+    단계별, 거래구분(hogaType)별 LatencyHistogram에 누적합니다.
+
+    STAGES
+    ----------
+    submit: Executor 진입
+    release: 요청 제한 대기 종료
+    sent: SendOrder 반환
+    ack: 주문번호 수신(eventReceiveTrData)
+    accepted: 주문접수(체잔 "접수")
+    firstFill: 최초 체결(체잔 "체결")
+    completed: 체결완료 혹은 취소/정정으로 종료
+    """
+
+    STAGES = ("submit", "release", "sent", "ack", "accepted", "firstFill", "completed")
+    ALL = "ALL"
+
+    def __init__(self):
+        self.__index = {stage: i for i, stage in enumerate(self.STAGES)}
+        self.__stamps = {}  # rqName: [hogaType, 단계별 시각..]
+        self.__orderNos = {}  # 주문번호: rqName
+        self.__rqOrderNos = {}  # rqName: 주문번호
+        self.segments = {}  # (stage, hogaType): LatencyHistogram
+        self.elapsed = {}  # (stage, hogaType): LatencyHistogram
+        self.isEnabled = True
+
+    ###### 기록 ######
+
+    def start(self, rqName, hogaType=""):
+        """ Executor 진입 시각을 기록 """
+
+        if not self.isEnabled:
+            return
+
+        stamps = [hogaType] + [None] * len(self.STAGES)
+        stamps[1] = time.perf_counter()
+        self.__stamps[rqName] = stamps
+
+    def stamp(self, rqName, stage):
+        """ rqName으로 구분되는 주문의 stage 시각을 기록 (이미 기록된 단계는 무시) """
+
+        stamps = self.__stamps.get(rqName)
+        if stamps is None:
+            return
+
+        i = self.__index[stage] + 1
+        if stamps[i] is not None:
+            return
+
+        now = time.perf_counter()
+        stamps[i] = now
+
+        # 직전에 기록된 단계로부터의 소요시간
+        prev = next(t for t in reversed(stamps[1:i]) if t is not None)
+        hogaType = stamps[0]
+        self.__record(self.segments, stage, hogaType, now - prev)
+        self.__record(self.elapsed, stage, hogaType, now - stamps[1])
+
+        if stage == "completed":
+            self.discard(rqName)
+
+    def ack(self, rqName, orderNo):
+        """ 주문번호 수신 시각을 기록하고, 이후 체잔 이벤트를 위해 주문번호를 연결 """
+
+        self.stamp(rqName, "ack")
+        if orderNo and rqName in self.__stamps:
+            self.__orderNos[orderNo] = rqName
+            self.__rqOrderNos[rqName] = orderNo
+
+    def discard(self, rqName):
+        """ 주문 실패 등으로 더 이상 기록하지 않을 주문을 제거 """
+
+        self.__stamps.pop(rqName, None)
+        orderNo = self.__rqOrderNos.pop(rqName, None)
+        if orderNo is not None:
+            self.__orderNos.pop(orderNo, None)
+
+    def onOrderEvent(self, order, record):
+        """ OrderBook listener, 체잔 이벤트로 접수/체결/완료 시각을 기록 """
+
+        rqName = self.__orderNos.get(order.orderNo)
+        if rqName is None:
+            return
+
+        status = record.ORDER_STATUS
+        if status == "접수":
+            self.stamp(rqName, "accepted")
+        elif status == "체결" and record.TRAN_QTY:
+            self.stamp(rqName, "firstFill")
+
+        if not order.isOpen and order.status != OrderStatus.PENDING:
+            self.stamp(rqName, "completed")
+
+    def __record(self, histograms, stage, hogaType, seconds):
+        micros = int(seconds * 1000000)
+        for key in ((stage, hogaType), (stage, self.ALL)):
+            histogram = histograms.get(key)
+            if histogram is None:
+                histogram = histograms[key] = LatencyHistogram()
+            histogram.record(micros)
+
+    ###### 조회 ######
+
+    def percentile(self, stage, p, hogaType=ALL, cumulative=False):
+        """ 단계별 latency percentile(마이크로초)
+
+        Parameters
+        ----------
+        stage: str
+            STAGES 참고
+        p: float
+            0 ~ 100
+        hogaType: str
+            거래구분, default="ALL"(전체)
+        cumulative: bool
+            True: Executor 진입으로부터의 누적시간, False: 직전 단계로부터의 소요시간
+        """
+
+        histograms = self.elapsed if cumulative else self.segments
+        histogram = histograms.get((stage, hogaType))
+        return histogram.percentile(p) if histogram is not None else None
+
+    def report(self, cumulative=False):
+        """ 단계별, 거래구분별 latency 요약(마이크로초)
+
+        Returns
+        ----------
+        dict
+            {stage: {hogaType: {"count", "mean", "min", "max", "p50", ...}}}
+        """
+
+        histograms = self.elapsed if cumulative else self.segments
+        result = {}
+        for stage in self.STAGES:
+            for (s, hogaType), histogram in histograms.items():
+                if s == stage:
+                    result.setdefault(stage, {})[hogaType] = histogram.summary()
+        return result
+
+    def dump(self, path):
+        """ 요약과 histogram을 JSON 파일로 저장 (장 마감 후 호출)
+
+        Parameters
+        ----------
+        path: str
+            저장할 폴더, 파일명은 latency-{YYYYMMDD}.json
+
+        Returns
+        ----------
+        str
+            저장한 파일 경로
+        """
+
+        filePath = os.path.join(
+            path, "latency-{}.json".format(dt.now().strftime("%Y%m%d"))
+        )
+        data = {
+            "summary": {"segment": self.report(), "elapsed": self.report(True)},
+            "histograms": {
+                kind: {
+                    "{}|{}".format(stage, hogaType): histogram.toDict()
+                    for (stage, hogaType), histogram in histograms.items()
+                }
+                for kind, histograms in (
+                    ("segment", self.segments),
+                    ("elapsed", self.elapsed),
+                )
+            },
+        }
+        with open(filePath, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+        return filePath
+
+    def reset(self):
+        self.__stamps.clear()
+        self.__orderNos.clear()
+        self.__rqOrderNos.clear()
+        self.segments.clear()
+        self.elapsed.clear()
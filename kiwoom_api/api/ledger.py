@@ -0,0 +1,299 @@
+import time
+
+import numpy as np
+import pandas as pd
+
+from ..utility.utility import removeSign
+from .order_book import normalizeCode
+
+
+def _toInt(x):
+    x = removeSign(x or "")
+    return int(x) if x else 0
+
+
+class Position:
+    """ 종목 한 개의 보유 현황을 담는 클래스입니다. """
+
+    __slots__ = (
+        "code",
+        "name",
+        "qty",
+        "avgPrice",
+        "buyAmount",
+        "orderableQty",
+        "curPrice",
+    )
+
+    def __init__(self, code, name=""):
+        self.code = code
+        self.name = name
+        self.qty = 0
+        self.avgPrice = 0
+        self.buyAmount = 0
+        self.orderableQty = 0
+        self.curPrice = 0
+
+    @property
+    def evalAmount(self):
+        """ 평가금액(현재가 기준) """
+
+        return self.qty * self.curPrice
+
+    @property
+    def pnl(self):
+        """ 평가손익(수수료, 세금 제외) """
+
+        return self.evalAmount - self.buyAmount
+
+    def toDict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def toList(self):
+        return [getattr(self, name) for name in self.__slots__]
+
+    @classmethod
+    def fromList(cls, values):
+        position = cls.__new__(cls)
+        for name, value in zip(cls.__slots__, values):
+            setattr(position, name, value)
+        return position
+
+    def __repr__(self):
+        return "Position({!r})".format(self.toDict())
+
+
+class AccountLedger:
+    """ 계좌 한 개의 보유 종목과 예수금을 담는 클래스입니다. """
+
+    def __init__(self, accNo):
+        self.accNo = accNo
+        self.positions = {}  # 종목코드: Position
+        self.deposit = 0  # 예수금(D+0), 잔고통보 FID 951
+        self.estimatedDeposit = 0  # D+2추정예수금, OPW00004
+        self.todaySellPnl = 0
+        self.todayRealizedPnl = 0
+        self.isSynced = False  # OPW00004로 초기화 되었는지 여부
+        self.syncedTime = 0  # OPW00004로 초기화한 시각(time.time()), 복원한 경우 0
+
+
+class PositionLedger:
+    """ 잔고통보(OnReceiveChejanData, gubun '1') 이벤트로 계좌별 보유 종목과
+    예수금을 관리하는 클래스입니다.
+
+    OPW00004(계좌평가잔고내역요청) 결과로 한 번 초기화(seed)한 뒤에는
+    잔고통보 이벤트만으로 갱신되므로, 보유 종목과 예수금을 TR 요청 없이 조회할 수 있습니다.
+    예수금(D+0)은 초기화 시 OPW00004의 예수금으로 설정되며, 이후에는 잔고통보에 포함된
+    예수금(FID 951)으로 갱신됩니다. D+2추정예수금은 잔고통보에 포함되지 않으므로
+    OPW00004로 초기화할 때만 갱신되며, 두 값은 따로 보관합니다.
+    """
+
+    def __init__(self):
+        self.accounts = {}  # 계좌번호: AccountLedger
+        self.listeners = []
+
+    def account(self, accNo):
+        ledger = self.accounts.get(accNo)
+        if ledger is None:
+            ledger = self.accounts[accNo] = AccountLedger(accNo)
+        return ledger
+
+    def isSynced(self, accNo):
+        ledger = self.accounts.get(accNo)
+        return ledger is not None and ledger.isSynced
+
+    def isFresh(self, accNo, maxAge):
+        """ OPW00004로 초기화한 뒤 maxAge(ms)가 지나지 않았으면 True """
+
+        ledger = self.accounts.get(accNo)
+        if ledger is None or not ledger.syncedTime:
+            return False
+        return (time.time() - ledger.syncedTime) * 1000 <= maxAge
+
+    ###### 갱신 ######
+
+    def apply(self, record):
+        """ BalanceRecord를 보유 현황에 반영합니다.
+
+        Parameters
+        ----------
+        record: BalanceRecord
+
+        Returns
+        ----------
+        Position
+        """
+
+        ledger = self.account(record.ACCOUNT_NO)
+        code = normalizeCode(record.TICKER)
+
+        position = ledger.positions.get(code)
+        if position is None:
+            position = ledger.positions[code] = Position(code, record.NAME or "")
+
+        position.qty = record.HOLDING_QTY or 0
+        position.avgPrice = record.AVG_PRICE or 0
+        position.buyAmount = record.TOTAL_BUY_PRICE or 0
+        position.orderableQty = record.ORDERABLE_QTY or 0
+        if record.CUR_PRICE:
+            position.curPrice = record.CUR_PRICE
+
+        if position.qty == 0:  # 전량 매도
+            del ledger.positions[code]
+
+        if record.DEPOSIT:
+            ledger.deposit = record.DEPOSIT
+        if record.TODAY_SELL_PNL is not None:
+            ledger.todaySellPnl = record.TODAY_SELL_PNL
+        if record.TODAY_REALIZED_PNL is not None:
+            ledger.todayRealizedPnl = record.TODAY_REALIZED_PNL
+
+        for listener in self.listeners:
+            listener(ledger, position)
+        return position
+
+    def seed(self, accNo, OPW00004):
+        """ OPW00004(계좌평가잔고내역요청) 결과로 계좌의 보유 현황을 초기화합니다.
+
+        Parameters
+        ----------
+        accNo: str
+        OPW00004: dict
+            DataFeeder.request("OPW00004")의 반환값
+        """
+
+        ledger = self.account(accNo)
+        single = OPW00004.get("싱글데이터") or {}
+        multi = OPW00004.get("멀티데이터") or []
+
+        positions = {}
+        for row in multi:
+            code = normalizeCode(row.get("종목코드", ""))
+            if not code:
+                continue
+            position = Position(code, row.get("종목명", ""))
+            position.qty = _toInt(row.get("보유수량"))
+            position.avgPrice = _toInt(row.get("평균단가"))
+            position.buyAmount = _toInt(row.get("매입금액"))
+            position.orderableQty = position.qty
+            position.curPrice = _toInt(row.get("현재가"))
+            if position.qty:
+                positions[code] = position
+
+        ledger.positions = positions
+        ledger.deposit = _toInt(single.get("예수금"))
+        ledger.estimatedDeposit = _toInt(single.get("D+2추정예수금"))
+        ledger.isSynced = True
+        ledger.syncedTime = time.time()
+        return ledger
+
+    def snapshot(self):
+        """ 계좌별 보유 현황을 dict로 반환 (checkpoint 저장용) """
+
+        return {
+            accNo: {
+                "deposit": ledger.deposit,
+                "estimatedDeposit": ledger.estimatedDeposit,
+                "todaySellPnl": ledger.todaySellPnl,
+                "todayRealizedPnl": ledger.todayRealizedPnl,
+                "isSynced": ledger.isSynced,
+                "positions": [p.toList() for p in ledger.positions.values()],
+            }
+            for accNo, ledger in self.accounts.items()
+        }
+
+    def restore(self, snapshot):
+        """ snapshot()으로 저장한 보유 현황을 복원 (기존 보유 현황은 삭제) """
+
+        self.accounts.clear()
+        for accNo, data in snapshot.items():
+            ledger = self.account(accNo)
+            ledger.deposit = data["deposit"]
+            ledger.estimatedDeposit = data.get("estimatedDeposit", data["deposit"])
+            ledger.todaySellPnl = data["todaySellPnl"]
+            ledger.todayRealizedPnl = data["todayRealizedPnl"]
+            ledger.isSynced = data["isSynced"]
+            for values in data["positions"]:
+                position = Position.fromList(values)
+                ledger.positions[position.code] = position
+
+    def addListener(self, listener):
+        """ 잔고통보가 반영될 때마다 listener(accountLedger, position) 형태로 호출됩니다. """
+
+        self.listeners.append(listener)
+
+    def removeListener(self, listener):
+        self.listeners.remove(listener)
+
+    ###### 조회 ######
+
+    def getPosition(self, accNo, code):
+        """ 보유 종목 조회, 보유하지 않은 종목이면 None """
+
+        ledger = self.accounts.get(accNo)
+        if ledger is None:
+            return None
+        return ledger.positions.get(normalizeCode(code))
+
+    def getQty(self, accNo, code):
+        position = self.getPosition(accNo, code)
+        return position.qty if position is not None else 0
+
+    def getCodes(self, accNo):
+        ledger = self.accounts.get(accNo)
+        return list(ledger.positions) if ledger is not None else []
+
+    def getDeposit(self, accNo):
+        """ D+2추정예수금 (마지막 OPW00004 기준, 잔고통보로 갱신되지 않음) """
+
+        ledger = self.accounts.get(accNo)
+        return ledger.estimatedDeposit if ledger is not None else 0
+
+    def getCashDeposit(self, accNo):
+        """ 예수금(D+0), 잔고통보로 갱신 """
+
+        ledger = self.accounts.get(accNo)
+        return ledger.deposit if ledger is not None else 0
+
+    def portfolio(self, accNo):
+        """ 계좌의 보유 종목을 DataFrame으로 반환합니다.
+        평가금액, 평가손익, 비중은 column 단위로 한 번에 계산합니다.
+
+        Returns
+        ----------
+        pd.DataFrame
+            index: 종목코드
+            columns: name, qty, avgPrice, curPrice, buyAmount, evalAmount, pnl, weight
+        """
+
+        ledger = self.accounts.get(accNo)
+        positions = list(ledger.positions.values()) if ledger is not None else []
+
+        qty = np.fromiter((p.qty for p in positions), dtype=np.int64, count=len(positions))
+        avgPrice = np.fromiter(
+            (p.avgPrice for p in positions), dtype=np.int64, count=len(positions)
+        )
+        curPrice = np.fromiter(
+            (p.curPrice for p in positions), dtype=np.int64, count=len(positions)
+        )
+        buyAmount = np.fromiter(
+            (p.buyAmount for p in positions), dtype=np.int64, count=len(positions)
+        )
+
+        evalAmount = qty * curPrice
+        total = evalAmount.sum()
+        weight = evalAmount / total if total else np.zeros(len(positions))
+
+        return pd.DataFrame(
+            {
+                "name": [p.name for p in positions],
+                "qty": qty,
+                "avgPrice": avgPrice,
+                "curPrice": curPrice,
+                "buyAmount": buyAmount,
+                "evalAmount": evalAmount,
+                "pnl": evalAmount - buyAmount,
+                "weight": weight,
+            },
+            index=pd.Index([p.code for p in positions], name="code"),
+        )
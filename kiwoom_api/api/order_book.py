@@ -0,0 +1,485 @@
+from ..utility.utility import str2int
+
+
+def normalizeCode(code):
+    """ 체잔 데이터의 종목코드(A005930)를 TR 종목코드(005930) 형태로 변환 """
+
+    if code and code[0] == "A":
+        return code[1:]
+    return code
+
+
+class OrderStatus:
+    """ OrderBook에서 관리하는 주문 상태 """
+
+    SUBMITTED = "접수"
+    PENDING = "확인대기"  # 확인을 기다리는 정정/취소 주문
+    PARTIAL = "부분체결"
+    FILLED = "체결완료"
+    CANCELLED = "취소"
+    REPLACED = "정정"
+    CONFIRMED = "확인"  # 취소/정정 주문 자체의 확인 상태
+    CLOSED = "종료"  # reconcile 결과 서버에 미체결 내역이 없는 주문
+
+    OPEN = (SUBMITTED, PARTIAL)
+
+
+class Order:
+    """ 주문 한 건의 상태를 담는 클래스입니다.
+
+    kind는 주문구분(ORDER_GUBUN)에 따라 "신규", "정정", "취소" 중 하나이며,
+    side는 "매수" 혹은 "매도" 입니다.
+    """
+
+    __slots__ = (
+        "orderNo",
+        "accNo",
+        "code",
+        "name",
+        "side",
+        "kind",
+        "hogaType",
+        "orderQty",
+        "orderPrice",
+        "unexQty",
+        "filledQty",
+        "filledAmount",
+        "originalOrderNo",
+        "status",
+        "lastTranNo",
+        "updatedTime",
+    )
+
+    def __init__(self, orderNo, accNo="", code="", orderGubun="", originalOrderNo=""):
+        self.orderNo = orderNo
+        self.accNo = accNo
+        self.code = normalizeCode(code)
+        self.name = ""
+        self.side = "매도" if "매도" in orderGubun else "매수"
+        if "취소" in orderGubun:
+            self.kind = "취소"
+        elif "정정" in orderGubun:
+            self.kind = "정정"
+        else:
+            self.kind = "신규"
+        self.hogaType = ""
+        self.orderQty = 0
+        self.orderPrice = 0
+        self.unexQty = 0
+        self.filledQty = 0
+        self.filledAmount = 0
+        # 원주문번호가 없으면 "0000000"으로 수신됨
+        self.originalOrderNo = originalOrderNo if originalOrderNo.strip("0") else ""
+        self.status = OrderStatus.SUBMITTED
+        self.lastTranNo = None
+        self.updatedTime = ""
+
+    @property
+    def isOpen(self):
+        return self.status in OrderStatus.OPEN
+
+    @property
+    def avgFillPrice(self):
+        """ 평균 체결가, 체결 내역이 없으면 0 """
+
+        if not self.filledQty:
+            return 0
+        return self.filledAmount / self.filledQty
+
+    def toDict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def toList(self):
+        """ __slots__ 순서의 값 list (checkpoint 저장용) """
+
+        return [getattr(self, name) for name in self.__slots__]
+
+    @classmethod
+    def fromList(cls, values):
+        order = cls.__new__(cls)
+        for name, value in zip(cls.__slots__, values):
+            setattr(order, name, value)
+        return order
+
+    def __repr__(self):
+        return "Order({!r})".format(self.toDict())
+
+
+class OrderBook:
+    """ 주문 이벤트(OnReceiveChejanData)로 자체 주문 상태를 관리하는 클래스입니다.
+
+    주문번호를 key로 주문을 저장하고, 종목코드별/원주문번호별 index를 함께 관리합니다.
+    미체결 주문, 잔량, 평균 체결가를 TR 요청 없이 조회할 수 있으며,
+    OPT10075(실시간미체결요청)는 reconcile() 용도로만 사용합니다.
+
+    주문 상태 전이
+    ----------
+    신규: 접수 -> 부분체결 -> 체결완료
+    취소/정정: 접수(확인대기) -> 확인, 원주문의 잔량에서 확인 수량만큼 차감
+        (원주문 잔량이 0이 되면 원주문은 취소/정정 상태로 종료,
+         정정주문은 확인 이후 새로운 미체결 주문이 됨)
+    """
+
+    def __init__(self):
+        self.orders = {}  # 주문번호: Order
+        self.openOrders = {}  # 주문번호: Order (미체결)
+        self.byCode = {}  # 종목코드: {주문번호: Order}
+        self.openByCode = {}  # 종목코드: {주문번호: Order} (미체결)
+        self.byOriginal = {}  # 원주문번호: {주문번호: Order}
+        self.listeners = []
+
+    def __len__(self):
+        return len(self.orders)
+
+    def __contains__(self, orderNo):
+        return orderNo in self.orders
+
+    ###### 이벤트 처리 ######
+
+    def apply(self, record):
+        """ ChejanRecord를 주문 상태에 반영합니다.
+
+        Parameters
+        ----------
+        record: ChejanRecord
+
+        Returns
+        ----------
+        Order
+        """
+
+        order = self.orders.get(record.ORDER_NO)
+        if order is None:
+            order = Order(
+                record.ORDER_NO,
+                accNo=record.ACCOUNT_NO or "",
+                code=record.TICKER or "",
+                orderGubun=record.ORDER_GUBUN or "",
+                originalOrderNo=record.ORIGINAL_ORDER_NO or "",
+            )
+            self.__add(order)
+
+        if record.NAME:
+            order.name = record.NAME
+        if record.HOGA_TYPE:
+            order.hogaType = record.HOGA_TYPE
+        if record.ORDER_QTY is not None:
+            order.orderQty = record.ORDER_QTY
+        if record.ORDER_PRICE is not None:
+            order.orderPrice = record.ORDER_PRICE
+        if record.ORDER_TRAN_TIME:
+            order.updatedTime = record.ORDER_TRAN_TIME
+
+        status = record.ORDER_STATUS
+        if status == "접수":
+            self.__onSubmitted(order, record)
+        elif status == "체결":
+            self.__onExecuted(order, record)
+        elif status == "확인":
+            self.__onConfirmed(order, record)
+
+        for listener in self.listeners:
+            listener(order, record)
+        return order
+
+    def __onSubmitted(self, order, record):
+        if order.kind != "신규":  # 정정/취소 주문은 확인 이후에 반영
+            if order.status == OrderStatus.SUBMITTED:
+                self.__setStatus(order, OrderStatus.PENDING)
+            return
+
+        if order.filledQty:  # 체결 이후에 늦게 도착한 접수 이벤트
+            return
+
+        order.unexQty = (
+            record.UNEX_QTY if record.UNEX_QTY is not None else order.orderQty
+        )
+        self.__setStatus(order, OrderStatus.SUBMITTED)
+
+    def __onExecuted(self, order, record):
+        tranQty = record.TRAN_QTY or 0
+        if tranQty and record.TRAN_NO and record.TRAN_NO == order.lastTranNo:
+            return  # 중복 이벤트
+
+        if tranQty:
+            order.filledQty += tranQty
+            order.filledAmount += tranQty * (record.TRAN_PRICE or 0)
+            order.lastTranNo = record.TRAN_NO
+
+        if record.UNEX_QTY is not None:
+            order.unexQty = record.UNEX_QTY
+
+        if order.unexQty > 0:
+            self.__setStatus(order, OrderStatus.PARTIAL)
+        elif order.filledQty:
+            self.__setStatus(order, OrderStatus.FILLED)
+        elif order.status in OrderStatus.OPEN:  # 잔량 0, 체결 없음: 취소/정정으로 종료
+            self.__setStatus(order, OrderStatus.CANCELLED)
+
+    def __onConfirmed(self, order, record):
+        confirmedQty = record.ORDER_QTY or 0
+
+        if order.kind == "정정":  # 정정주문은 확인 이후 새로운 미체결 주문이 됨
+            order.unexQty = confirmedQty - order.filledQty
+            self.__setStatus(order, OrderStatus.SUBMITTED)
+        else:
+            order.unexQty = 0
+            self.__setStatus(order, OrderStatus.CONFIRMED)
+
+        original = self.orders.get(order.originalOrderNo)
+        if original is None or not original.isOpen:
+            return
+
+        original.unexQty = max(0, original.unexQty - confirmedQty)
+        if original.unexQty == 0:
+            closedStatus = (
+                OrderStatus.REPLACED if order.kind == "정정" else OrderStatus.CANCELLED
+            )
+            self.__setStatus(original, closedStatus)
+
+    ###### index 관리 ######
+
+    def __add(self, order):
+        self.orders[order.orderNo] = order
+        self.byCode.setdefault(order.code, {})[order.orderNo] = order
+        if order.originalOrderNo:
+            self.byOriginal.setdefault(order.originalOrderNo, {})[order.orderNo] = order
+
+    def __setStatus(self, order, status):
+        order.status = status
+        if status in OrderStatus.OPEN:
+            self.openOrders[order.orderNo] = order
+            self.openByCode.setdefault(order.code, {})[order.orderNo] = order
+        else:
+            self.openOrders.pop(order.orderNo, None)
+            openOrders = self.openByCode.get(order.code)
+            if openOrders is not None:
+                openOrders.pop(order.orderNo, None)
+                if not openOrders:
+                    del self.openByCode[order.code]
+
+    ###### checkpoint ######
+
+    def snapshot(self):
+        """ 전체 주문 상태를 list로 반환 (Order.__slots__ 순서의 값 list) """
+
+        return [order.toList() for order in self.orders.values()]
+
+    def restore(self, rows):
+        """ snapshot()으로 저장한 주문 상태를 복원 (기존 주문 상태는 삭제) """
+
+        self.orders.clear()
+        self.openOrders.clear()
+        self.byCode.clear()
+        self.openByCode.clear()
+        self.byOriginal.clear()
+
+        for row in rows:
+            order = Order.fromList(row)
+            self.__add(order)
+            self.__setStatus(order, order.status)
+
+    ###### 조회 ######
+
+    def getOrder(self, orderNo):
+        return self.orders.get(orderNo)
+
+    def getOpenOrders(self, code=None, accNo=None):
+        """ 미체결 주문 목록
+
+        Parameters
+        ----------
+        code: str
+            종목코드, default=전체
+        accNo: str
+            계좌번호, default=전체
+
+        Returns
+        ----------
+        list of Order
+        """
+
+        if code is None:
+            orders = self.openOrders.values()
+        else:
+            orders = self.openByCode.get(normalizeCode(code), {}).values()
+
+        if accNo is None:
+            return list(orders)
+        return [order for order in orders if order.accNo == accNo]
+
+    def getOrdersByCode(self, code):
+        """ 종목코드의 전체 주문 (체결/취소 포함) """
+
+        return list(self.byCode.get(normalizeCode(code), {}).values())
+
+    def getChildOrders(self, originalOrderNo):
+        """ 원주문에 대한 정정/취소 주문 목록 """
+
+        return list(self.byOriginal.get(originalOrderNo, {}).values())
+
+    def hasOpenOrders(self, code=None):
+        if code is None:
+            return bool(self.openOrders)
+        return normalizeCode(code) in self.openByCode
+
+    def remainingQty(self, orderNo):
+        """ 미체결 잔량, 알 수 없는 주문이면 0 """
+
+        order = self.orders.get(orderNo)
+        return order.unexQty if (order is not None and order.isOpen) else 0
+
+    def avgFillPrice(self, orderNo):
+        """ 평균 체결가, 알 수 없는 주문이면 0 """
+
+        order = self.orders.get(orderNo)
+        return order.avgFillPrice if order is not None else 0
+
+    def addListener(self, listener):
+        """ 주문 상태가 변경될 때마다 listener(order, record) 형태로 호출됩니다. """
+
+        self.listeners.append(listener)
+
+    def removeListener(self, listener):
+        self.listeners.remove(listener)
+
+    ###### reconcile ######
+
+    def reconcile(self, unexOrders, accNo=None):
+        """ OPT10075(실시간미체결요청) 결과와 미체결 주문을 맞춥니다.
+
+        서버에는 없지만 로컬에는 미체결인 주문은 CLOSED로 종료하고,
+        로컬에 없는 서버의 미체결 주문은 새로 추가합니다.
+
+        Parameters
+        ----------
+        unexOrders: list of dict
+            OPT10075 멀티데이터
+        accNo: str
+            계좌번호, 지정하면 해당 계좌의 주문만 reconcile
+
+        Returns
+        ----------
+        dict
+            {"added": [주문번호, ..], "closed": [주문번호, ..]}
+        """
+
+        serverOrders = {row.get("주문번호"): row for row in unexOrders}
+        added, closed = [], []
+
+        for order in self.getOpenOrders(accNo=accNo):
+            if order.orderNo not in serverOrders:
+                self.__setStatus(order, OrderStatus.CLOSED)
+                closed.append(order.orderNo)
+
+        for orderNo, row in serverOrders.items():
+            unexQty = str2int(row.get("미체결수량") or "0")
+            order = self.orders.get(orderNo)
+            if order is None:
+                order = Order(
+                    orderNo,
+                    accNo=row.get("계좌번호", accNo or ""),
+                    code=row.get("종목코드", ""),
+                    orderGubun=row.get("주문구분", ""),
+                    originalOrderNo=row.get("원구문번호", ""),
+                )
+                order.name = row.get("종목명", "")
+                order.orderQty = str2int(row.get("주문수량") or "0")
+                order.orderPrice = str2int(row.get("주문가격") or "0")
+                order.filledQty = order.orderQty - unexQty
+                order.filledAmount = order.filledQty * str2int(row.get("체결가") or "0")
+                self.__add(order)
+                added.append(orderNo)
+
+            order.unexQty = unexQty
+            if unexQty > 0:
+                self.__setStatus(
+                    order,
+                    OrderStatus.PARTIAL if order.filledQty else OrderStatus.SUBMITTED,
+                )
+
+        return {"added": added, "closed": closed}
+
+    def reconcileHistory(self, orderRows, accNo=None, closeMissing=False):
+        """ OPW00007(계좌별주문체결내역상세요청) 결과와 주문 상태를 맞춥니다.
+
+        재시작 등으로 주문 이벤트를 수신하지 못한 동안의 체결과 잔량을 반영하며,
+        로컬에 없는 주문은 새로 추가합니다. 서버의 체결수량, 주문잔량을 기준으로 합니다.
+
+        Parameters
+        ----------
+        orderRows: list of dict
+            OPW00007 멀티데이터
+        accNo: str
+            계좌번호
+        closeMissing: bool
+            True이면 서버 내역에 없는 로컬 미체결 주문을 CLOSED로 종료
+            (연속조회로 내역이 잘린 경우에는 False를 사용)
+
+        Returns
+        ----------
+        dict
+            {"added": [주문번호, ..], "updated": [주문번호, ..], "closed": [주문번호, ..]}
+        """
+
+        added, updated, closed = [], [], []
+        serverOrderNos = set()
+
+        for row in orderRows:
+            orderNo = (row.get("주문번호") or "").strip()
+            if not orderNo:
+                continue
+            serverOrderNos.add(orderNo)
+
+            orderQty = str2int(row.get("주문수량") or "0")
+            filledQty = str2int(row.get("체결수량") or "0")
+            unexQty = str2int(row.get("주문잔량") or "0")
+
+            order = self.orders.get(orderNo)
+            if order is None:
+                order = Order(
+                    orderNo,
+                    accNo=accNo or "",
+                    code=(row.get("종목번호") or "").strip(),
+                    orderGubun=row.get("주문구분", ""),
+                    originalOrderNo=(row.get("원주문") or "").strip(),
+                )
+                order.name = (row.get("종목명") or "").strip()
+                order.orderQty = orderQty
+                order.orderPrice = str2int(row.get("주문단가") or "0")
+                self.__add(order)
+                added.append(orderNo)
+            elif (
+                order.filledQty == filledQty
+                and (order.unexQty == unexQty or not order.isOpen)
+                and order.status != OrderStatus.PENDING
+            ):
+                continue
+            else:
+                updated.append(orderNo)
+
+            if order.kind == "취소":
+                order.unexQty = 0
+                self.__setStatus(order, OrderStatus.CONFIRMED)
+                continue
+
+            if filledQty != order.filledQty:
+                order.filledQty = filledQty
+                order.filledAmount = filledQty * str2int(row.get("체결단가") or "0")
+            order.unexQty = unexQty
+
+            if unexQty > 0:
+                status = OrderStatus.PARTIAL if filledQty else OrderStatus.SUBMITTED
+            elif order.orderQty and filledQty >= order.orderQty:
+                status = OrderStatus.FILLED
+            else:
+                status = OrderStatus.CLOSED
+            self.__setStatus(order, status)
+
+        if closeMissing:
+            for order in self.getOpenOrders(accNo=accNo):
+                if order.orderNo not in serverOrderNos:
+                    self.__setStatus(order, OrderStatus.CLOSED)
+                    closed.append(order.orderNo)
+
+        return {"added": added, "updated": updated, "closed": closed}
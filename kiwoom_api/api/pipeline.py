@@ -0,0 +1,173 @@
+from collections import deque
+import functools
+import itertools
+
+from PyQt5.QtCore import QEventLoop, QTimer
+
+
+class RequestPipeline:
+    """ 여러 TR 요청을 응답을 기다리지 않고 요청 제한(1초 5회) 이내에서 연속으로 전송하고,
+    모든 응답을 수신할 때까지 대기하는 클래스입니다.
+
+    요청마다 고유한 rqName을 사용하므로 응답은 도착하는 즉시 해당 요청의 결과로 저장되며,
+    다음 요청은 앞선 요청의 응답과 무관하게 요청 제한이 허용하는 시각에 전송됩니다.
+
+    ex)
+        pipeline = RequestPipeline(kiwoom)
+        for chunk in chunks:
+            pipeline.add(functools.partial(kiwoom.commKwRqDataAsync, ";".join(chunk), len(chunk)))
+        results = pipeline.run()
+
+    Parameters
+    ----------
+    kiwoom: Kiwoom
+    scrNos: list of str
+        순서대로 돌아가며 사용할 화면번호 목록
+    timeout: int
+        마지막 요청을 전송한 뒤 응답을 기다리는 최대 시간(ms)
+    """
+
+    SCREEN_NUMBERS = tuple("{:04d}".format(n) for n in range(2000, 2020))
+
+    __seq = itertools.count(1)
+
+    def __init__(self, kiwoom, scrNos=SCREEN_NUMBERS, timeout=10000):
+        self.kiwoom = kiwoom
+        self.scrNos = tuple(scrNos)
+        self.timeout = timeout
+
+        self.results = []
+        self.errors = {}  # 요청 index: 실패 사유
+        self.usedScrNos = set()
+
+        self.__jobs = deque()
+        self.__inflight = {}  # rqName: 요청 index
+        self.__remaining = 0
+        self.__running = False
+        self.__loop = None
+        self.__callback = None
+
+    def __len__(self):
+        return len(self.results)
+
+    def add(self, send):
+        """ 요청을 추가합니다.
+
+        Parameters
+        ----------
+        send: callable
+            send(rqName, scrNo, callback) 형태로 호출되어 요청을 전송하는 함수
+            (ex: commKwRqDataAsync, commRqDataAsync의 partial)
+
+        Returns
+        ----------
+        int
+            요청 index, run()이 반환하는 list의 위치
+        """
+
+        index = len(self.results)
+        self.results.append(None)
+        self.__jobs.append((index, send))
+        return index
+
+    def run(self):
+        """ 추가된 요청을 모두 전송하고 응답을 기다립니다.
+
+        Returns
+        ----------
+        list
+            요청 순서대로 수신한 data, 실패하거나 timeout된 요청은 None (errors 참고)
+        """
+
+        self.__loop = QEventLoop()
+        self.start()
+        if self.__running:
+            self.__loop.exec_()
+
+        self.__loop = None
+        return self.results
+
+    def start(self, callback=None):
+        """ 추가된 요청의 전송을 시작하고 즉시 반환합니다. (run()의 비동기 버전)
+
+        Parameters
+        ----------
+        callback: callable
+            모든 응답을 수신하거나 timeout되면 callback(results) 형태로 호출
+        """
+
+        self.__callback = callback
+        self.__remaining = len(self.__jobs)
+        self.__running = True
+        if not self.__remaining:
+            self.__finish()
+            return
+        self.__dispatch()
+
+    def __dispatch(self):
+        delayCheck = self.kiwoom.requestDelayCheck
+
+        while self.__jobs:
+            delay = delayCheck.nextDelay()
+            if delay > 0:
+                QTimer.singleShot(int(delay * 1000) + 1, self.__dispatch)
+                return
+
+            index, send = self.__jobs.popleft()
+            rqName = "pipeline#{}".format(next(self.__seq))
+            scrNo = self.scrNos[index % len(self.scrNos)]
+
+            delayCheck.record()
+            self.__inflight[rqName] = index
+            try:
+                send(rqName, scrNo, functools.partial(self.__onData, rqName))
+            except Exception as e:
+                del self.__inflight[rqName]
+                self.__fail(index, str(e))
+                continue
+            self.usedScrNos.add(scrNo)
+
+        # 마지막 요청 이후 timeout
+        if self.__remaining:
+            QTimer.singleShot(self.timeout, self.__expire)
+
+    def __onData(self, rqName, data, isNext):
+        index = self.__inflight.pop(rqName, None)
+        if index is None:  # timeout 이후에 도착한 응답
+            return
+
+        self.results[index] = data
+        self.__done()
+
+    @staticmethod
+    def __dropLate(data, isNext):
+        pass
+
+    def __fail(self, index, msg):
+        self.errors[index] = msg
+        self.kiwoom.logger.error("ERROR: RequestPipeline : {}".format(msg))
+        self.__done()
+
+    def __done(self):
+        self.__remaining -= 1
+        if self.__remaining == 0:
+            self.__finish()
+
+    def __finish(self):
+        self.__running = False
+        if self.__loop is not None:
+            self.__loop.exit()
+        if self.__callback is not None:
+            self.__callback(self.results)
+
+    def __expire(self):
+        if not self.__running:
+            return
+
+        # 늦게 도착한 응답이 동기 요청(commRqData)의 응답으로 처리되지 않도록 버리는 handler를 남김
+        for rqName, index in list(self.__inflight.items()):
+            self.kiwoom.trHandlers[rqName] = self.__dropLate
+            self.errors[index] = "timeout"
+        self.__inflight.clear()
+        self.__remaining = 0
+        self.__finish()
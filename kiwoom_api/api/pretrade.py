@@ -0,0 +1,225 @@
+from datetime import datetime as dt
+
+import numpy as np
+
+from ..utility import TickCaculator
+from ..utility.utility import removeSign
+from .errors import KiwoomProcessingError
+from .order_book import normalizeCode
+
+
+def _toInt(x):
+    if isinstance(x, str):
+        x = removeSign(x.strip())
+        return abs(int(x)) if x else 0
+    return abs(int(x)) if x is not None and x == x else 0  # NaN
+
+
+class PreTradeTable:
+    """ 주문 전 검증(pre-trade check)에 사용하는 종목별 기준 정보 테이블입니다.
+
+    세션(일자)마다 한 번 상한가/하한가, 기준가, 관리종목/거래정지 여부, 시장구분을
+    종목별 numpy array로 적재해 두고, 주문 검증은 종목코드 index 조회와
+    array 연산만으로 처리합니다. (주문시 COM 호출 없음)
+    적재는 DataFeeder.loadPreTradeTable()을 참고하시길 바랍니다.
+
+    Parameters
+    ----------
+    allowManaged: bool
+        False이면 관리종목 신규매수 주문을 거부, default=False
+    """
+
+    MARKETS = ("KOSPI", "KOSDAQ", "ETF")
+
+    # 가격을 검증하는 거래구분 (지정가, 조건부지정가, IOC/FOK 지정가, 시간외단일가)
+    LIMIT_HOGA_TYPES = ("00", "05", "10", "20", "62")
+
+    # 검증 실패 사유, 여러 항목에 해당하면 앞의 사유를 반환
+    REASONS = (
+        ("unknown", "종목코드 없음"),
+        ("qty", "주문수량 오류"),
+        ("halted", "거래정지 종목"),
+        ("managed", "관리종목 매수 제한"),
+        ("upper", "상한가 초과"),
+        ("lower", "하한가 미만"),
+        ("tick", "호가단위 오류"),
+    )
+
+    def __init__(self, allowManaged=False):
+        self.allowManaged = allowManaged
+        self.tickCalculator = TickCaculator()
+        self.loadedDate = None
+        self.build([], [], {}, {})
+
+    @property
+    def isLoaded(self):
+        return self.loadedDate is not None
+
+    def __len__(self):
+        return len(self.codes)
+
+    def __contains__(self, code):
+        return normalizeCode(code) in self.index
+
+    def build(self, codes, markets, states, quotes):
+        """ 수집한 종목 정보로 테이블을 생성합니다.
+
+        Parameters
+        ----------
+        codes: list of str
+            종목코드
+        markets: list of str
+            종목별 시장구분("KOSPI", "KOSDAQ", "ETF")
+        states: dict
+            {종목코드: GetMasterStockState 결과 list}
+        quotes: dict
+            {종목코드: {"상한가", "하한가", "기준가"}}, OPTKWFID 멀티데이터 row 혹은 snapshot() 결과
+        """
+
+        n = len(codes)
+        self.codes = list(codes)
+        self.index = {code: i for i, code in enumerate(self.codes)}
+
+        marketIndex = {market: i for i, market in enumerate(self.MARKETS)}
+        self.market = np.fromiter(
+            (marketIndex[market] for market in markets), dtype=np.int8, count=n
+        )
+
+        def column(key):
+            return np.fromiter(
+                (_toInt(quotes.get(code, {}).get(key)) for code in self.codes),
+                dtype=np.int64,
+                count=n,
+            )
+
+        self.upperLimit = column("상한가")
+        self.lowerLimit = column("하한가")
+        self.basePrice = column("기준가")
+
+        def flag(state):
+            return np.fromiter(
+                (state in states.get(code, ()) for code in self.codes),
+                dtype=bool,
+                count=n,
+            )
+
+        self.isManaged = flag("관리종목")
+        self.isHalted = flag("거래정지")
+
+        self.loadedDate = dt.now().strftime("%Y%m%d") if n else None
+        return self
+
+    ###### 조회 ######
+
+    def getMarket(self, code):
+        """ 시장구분("KOSPI", "KOSDAQ", "ETF"), 없는 종목이면 None """
+
+        i = self.index.get(normalizeCode(code))
+        return self.MARKETS[self.market[i]] if i is not None else None
+
+    def getPriceLimit(self, code):
+        """ (하한가, 상한가), 없는 종목이면 None """
+
+        i = self.index.get(normalizeCode(code))
+        if i is None:
+            return None
+        return int(self.lowerLimit[i]), int(self.upperLimit[i])
+
+    def hasIssue(self, code):
+        """ 관리종목 혹은 거래정지 종목이면 True """
+
+        i = self.index.get(normalizeCode(code))
+        return i is not None and bool(self.isManaged[i] or self.isHalted[i])
+
+    def tickSize(self, indices, prices):
+        """ 종목별 시장의 호가단위를 array로 반환 """
+
+        indices = np.asarray(indices)
+        prices = np.asarray(prices)
+        ticks = np.ones(len(prices), dtype=np.int64)
+        markets = self.market[indices]
+        for i, market in enumerate(self.MARKETS):
+            mask = markets == i
+            if mask.any():
+                ticks[mask] = self.tickCalculator.calcTickSize(prices[mask], market)
+        return ticks
+
+    ###### 검증 ######
+
+    def check(self, orderSpec):
+        """ 주문정보 한 건을 검증합니다.
+
+        Parameters
+        ----------
+        orderSpec: dict
+            Executor.createOrderSpec()으로 생성한 주문정보
+
+        Returns
+        ----------
+        str
+            검증 실패 사유, 통과하면 빈 문자열
+        """
+
+        return self.checkBatch([orderSpec])[0]
+
+    def checkBatch(self, orderSpecs):
+        """ 여러 주문정보를 array 연산으로 한 번에 검증합니다.
+
+        신규/정정 주문은 거래정지 여부와 (지정가 주문인 경우) 상한가/하한가,
+        호가단위를 검증하며, 취소 주문은 종목코드와 수량만 검증합니다.
+
+        Returns
+        ----------
+        list of str
+            주문별 검증 실패 사유, 통과한 주문은 빈 문자열
+        """
+
+        if not self.isLoaded:
+            raise KiwoomProcessingError("ERROR: pre-trade table not loaded")
+
+        n = len(orderSpecs)
+        index = self.index
+        indices = np.fromiter(
+            (index.get(normalizeCode(spec["code"]), -1) for spec in orderSpecs),
+            dtype=np.int64,
+            count=n,
+        )
+        orderType = np.fromiter(
+            (int(spec["orderType"]) for spec in orderSpecs), dtype=np.int64, count=n
+        )
+        qty = np.fromiter((int(spec["qty"]) for spec in orderSpecs), dtype=np.int64, count=n)
+        price = np.fromiter(
+            (int(spec["price"]) for spec in orderSpecs), dtype=np.int64, count=n
+        )
+        isLimit = np.fromiter(
+            (spec["hogaType"] in self.LIMIT_HOGA_TYPES for spec in orderSpecs),
+            dtype=bool,
+            count=n,
+        )
+
+        known = indices >= 0
+        i = np.where(known, indices, 0)
+        isCancel = (orderType == 3) | (orderType == 4)
+        upper = self.upperLimit[i]
+        lower = self.lowerLimit[i]
+
+        # 상한가/하한가를 조회하지 못한 종목(0)은 가격 검증 제외
+        priced = known & isLimit & ~isCancel & (upper > 0)
+        ticks = self.tickSize(i, price)
+
+        masks = {
+            "unknown": ~known,
+            "qty": (qty < 0) | ((qty == 0) & ~isCancel),  # 취소수량 0은 전량취소
+            "halted": known & ~isCancel & self.isHalted[i],
+            "managed": known & (orderType == 1) & self.isManaged[i],
+            "upper": priced & (price > upper),
+            "lower": priced & (price < lower),
+            "tick": priced & (price % ticks != 0),
+        }
+        if self.allowManaged:
+            masks["managed"][:] = False
+
+        reasons = np.full(n, "", dtype=object)
+        for key, reason in reversed(self.REASONS):
+            reasons[masks[key]] = reason
+        return reasons.tolist()
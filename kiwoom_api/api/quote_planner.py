@@ -0,0 +1,119 @@
+import functools
+
+from PyQt5.QtCore import QTimer
+
+from .order_book import normalizeCode
+from .pipeline import RequestPipeline
+
+
+class QuotePlanner:
+    """ 종목별 현재가 조회 요청을 짧은 시간 동안 모아 OPTKWFID 요청으로 묶어 전송하는 클래스입니다.
+
+    request()로 들어온 요청은 window(ms) 동안 대기열에 쌓이며, window가 지나면
+    중복을 제거한 종목코드를 100종목씩 나누어 RequestPipeline으로 전송합니다.
+    응답의 멀티데이터는 종목코드별로 나누어 요청한 callback에 전달하므로,
+    같은 window 안의 요청 100건이 요청 제한(1초 5회, 1시간 1,000회)을 1회만 사용합니다.
+    DataFeeder.requestQuote(), DataFeeder.getQuote()를 참고하시길 바랍니다.
+
+    Parameters
+    ----------
+    kiwoom: Kiwoom
+    window: int
+        요청을 모으는 시간(ms)
+    timeout: int
+        마지막 요청을 전송한 뒤 응답을 기다리는 최대 시간(ms)
+    scrNos: list of str
+        OPTKWFID 요청에 사용할 화면번호 목록
+    """
+
+    MAX_CODES = 100
+
+    SCREEN_NUMBERS = tuple("{:04d}".format(n) for n in range(2100, 2110))
+
+    def __init__(self, kiwoom, window=5, timeout=10000, scrNos=SCREEN_NUMBERS):
+        self.kiwoom = kiwoom
+        self.window = window
+        self.timeout = timeout
+        self.scrNos = tuple(scrNos)
+
+        # 종목코드: [callback, ..]
+        self.pending = {}
+
+        # 종목별 요청 수, 전송한 OPTKWFID 요청 수
+        self.requested = 0
+        self.sent = 0
+
+        self.__scheduled = False
+
+    @property
+    def savings(self):
+        """ OPTKWFID 1회가 대신한 종목별 요청 수 (요청 제한 절감 배수) """
+
+        return self.requested / self.sent if self.sent else 0.0
+
+    def request(self, code, callback):
+        """ 종목 현재가 조회를 대기열에 추가합니다.
+
+        Parameters
+        ----------
+        code: str
+            종목코드
+        callback: callable
+            callback(row) 형태로 호출, row는 OPTKWFID 멀티데이터의 해당 종목 dict
+            (조회에 실패하면 None)
+        """
+
+        code = normalizeCode(code.strip())
+        self.pending.setdefault(code, []).append(callback)
+        self.requested += 1
+
+        if not self.__scheduled:
+            self.__scheduled = True
+            QTimer.singleShot(self.window, self.flush)
+
+    def flush(self):
+        """ 대기 중인 요청을 즉시 전송합니다. """
+
+        self.__scheduled = False
+        pending, self.pending = self.pending, {}
+        if not pending:
+            return
+
+        codes = list(pending)
+        chunks = [codes[i : i + self.MAX_CODES] for i in range(0, len(codes), self.MAX_CODES)]
+
+        pipeline = RequestPipeline(self.kiwoom, scrNos=self.scrNos, timeout=self.timeout)
+        for chunk in chunks:
+            pipeline.add(
+                functools.partial(self.kiwoom.commKwRqDataAsync, ";".join(chunk), len(chunk))
+            )
+        self.sent += len(chunks)
+
+        self.kiwoom.logger.debug(
+            "QuotePlanner : {} codes, {} requests".format(len(codes), len(chunks))
+        )
+        pipeline.start(functools.partial(self.__onResults, pipeline, chunks, pending))
+
+    def __onResults(self, pipeline, chunks, pending, results):
+        for scrNo in pipeline.usedScrNos:
+            self.kiwoom.disconnectRealData(scrNo)
+
+        for i, error in sorted(pipeline.errors.items()):
+            self.kiwoom.logger.error(
+                "ERROR: QuotePlanner : {} ({} ~ {})".format(error, chunks[i][0], chunks[i][-1])
+            )
+
+        rows = {}
+        for data in results:
+            for row in (data or {}).get("멀티데이터", []):
+                rows.setdefault(normalizeCode(row["종목코드"].strip()), row)
+
+        for code, callbacks in pending.items():
+            row = rows.get(code)
+            for callback in callbacks:
+                try:
+                    callback(row)
+                except Exception as e:
+                    self.kiwoom.logger.error(
+                        "ERROR: QuotePlanner callback ({}) : {}".format(code, e)
+                    )
@@ -0,0 +1,227 @@
+from datetime import datetime as dt
+import json
+import os
+import threading
+import time
+
+from PyQt5.QtCore import QTimer
+
+from .chejan import BALANCE_PLAN, CHEJAN_PLANS
+from .errors import KiwoomProcessingError
+from .journal import JournalReader
+from .ledger import Position
+from .order_book import Order
+
+
+class OrderRecovery:
+    """ 재시작한 프로세스의 주문 상태(OrderBook)와 보유 현황(PositionLedger)을
+    당일 journal로 복구하는 클래스입니다.
+
+    checkpoint(주문/보유 현황 snapshot과 journal 파일 위치)가 있으면 snapshot을 복원한 뒤
+    checkpoint 이후의 이벤트만 재생(replay)하고, 없으면 당일 journal 전체를 재생합니다.
+    checkpoint의 파일 위치는 journal이 기록을 마친 위치이므로, snapshot에 이미 반영되었지만
+    아직 기록되지 않았던 이벤트는 SEQ로 구분하여 재생하지 않습니다.
+    재생 범위는 인스턴스 생성 시점의 journal 파일 크기까지이므로,
+    이후에 수신되어 기록된 이벤트가 두 번 반영되지 않습니다.
+
+    Parameters
+    ----------
+    journal: OrderJournal
+    orderBook: OrderBook
+    ledger: PositionLedger
+    """
+
+    CHECKPOINT_PREFIX = "recovery"
+
+    # journal table: record class
+    RECORD_CLASSES = {
+        plan.table: plan.recordClass
+        for plan in list(CHEJAN_PLANS.values()) + [BALANCE_PLAN]
+    }
+
+    def __init__(self, journal, orderBook, ledger, logger=None):
+        self.journal = journal
+        self.orderBook = orderBook
+        self.ledger = ledger
+        self.logger = logger
+        self.reader = JournalReader(journal.path, journal.prefix)
+
+        self.date = dt.now().strftime("%Y%m%d")
+        filePath = journal.filePath(self.date)
+        self.endOffset = os.path.getsize(filePath) if os.path.exists(filePath) else 0
+
+        self.isRecovered = False
+        self.__timer = None
+        self.__writer = None
+
+    def checkpointPath(self, date):
+        return os.path.join(
+            self.journal.path, "{}-{}.json".format(self.CHECKPOINT_PREFIX, date)
+        )
+
+    ###### 복구 ######
+
+    def replay(self):
+        """ checkpoint와 당일 journal로 주문 상태와 보유 현황을 복구합니다.
+        이벤트를 수신하기 전(commConnect() 이전)에 한 번만 호출하는 것을 권장합니다.
+
+        Returns
+        ----------
+        dict
+            {"checkpoint": bool, "events": 재생한 이벤트 수, "orders": 주문 수,
+             "openOrders": 미체결 주문 수, "elapsed": 소요시간(초)}
+        """
+
+        if self.isRecovered:
+            raise KiwoomProcessingError("ERROR: replay() : already recovered")
+
+        start = time.perf_counter()
+        checkpoint = self.__loadCheckpoint()
+        offset, seq = 0, 0
+        if checkpoint is not None:
+            self.orderBook.restore(checkpoint["orders"])
+            self.ledger.restore(checkpoint["ledger"])
+            offset = checkpoint["offset"]
+            seq = checkpoint.get("seq", 0)
+
+        events = 0
+        recordClasses = self.RECORD_CLASSES
+        balanceTable = BALANCE_PLAN.table
+        for _, data in self.reader.iterRecordsWithOffset(
+            self.date, offset=offset, end=self.endOffset
+        ):
+            if data["SEQ"] <= seq:  # checkpoint에 반영된 이벤트
+                continue
+
+            table = data["TABLE"]
+            recordClass = recordClasses.get(table)
+            if recordClass is None:
+                continue
+
+            record = recordClass.fromDict(table, data)
+            if table == balanceTable:
+                self.ledger.apply(record)
+            else:
+                self.orderBook.apply(record)
+            events += 1
+
+        self.isRecovered = True
+        result = {
+            "checkpoint": checkpoint is not None,
+            "events": events,
+            "orders": len(self.orderBook),
+            "openOrders": len(self.orderBook.openOrders),
+            "elapsed": round(time.perf_counter() - start, 4),
+        }
+        if self.logger:
+            self.logger.debug("Order recovery: {}".format(result))
+        return result
+
+    def __loadCheckpoint(self):
+        """ 당일 checkpoint, 없거나 형식이 다르면 None """
+
+        filePath = self.checkpointPath(self.date)
+        if not os.path.exists(filePath):
+            return None
+
+        try:
+            with open(filePath, "r", encoding="utf-8") as f:
+                checkpoint = json.load(f)
+        except (OSError, ValueError) as e:
+            if self.logger:
+                self.logger.error("ERROR: Invalid recovery checkpoint {}".format(e))
+            return None
+
+        # 저장 이후 Order/Position 항목이 바뀌었거나, journal보다 앞선 checkpoint는 사용하지 않음
+        if (
+            checkpoint.get("orderFields") != list(Order.__slots__)
+            or checkpoint.get("positionFields") != list(Position.__slots__)
+            or checkpoint.get("offset", 0) > self.endOffset
+        ):
+            return None
+        return checkpoint
+
+    ###### checkpoint ######
+
+    def checkpoint(self, wait=False):
+        """ 현재 주문 상태와 보유 현황을 journal 파일 위치와 함께 저장합니다.
+        snapshot은 호출한 thread에서 만들고, 파일 기록은 background thread에서 수행합니다.
+        journal의 기록을 기다리지 않고 journal이 기록을 마친 위치(OrderJournal.committed)와
+        queue에 남은 이벤트 수로 snapshot에 반영된 마지막 SEQ를 저장합니다.
+        복구(replay) 이전에는 상태가 완전하지 않으므로 저장하지 않습니다.
+
+        Parameters
+        ----------
+        wait: bool
+            True이면 파일 기록이 끝날 때까지 대기
+
+        Returns
+        ----------
+        str
+            저장할 파일 경로, 저장하지 않은 경우 None
+        """
+
+        if not self.isRecovered:
+            return None
+
+        # 이전 checkpoint를 기록 중이면 건너뜀
+        if self.__writer is not None and self.__writer.is_alive():
+            return None
+
+        # 기록을 마친 위치 이후에 queue에 남은 이벤트는 SEQ가 순서대로 이어짐
+        date = dt.now().strftime("%Y%m%d")
+        committed = self.journal.committed
+        queued = self.journal.enqueued - (committed.count if committed is not None else 0)
+        if committed is not None and committed.date == date:
+            offset, seq = committed.offset, committed.seq + queued
+        elif queued == 0:  # 기록 중인 이벤트가 없으므로 파일 크기를 사용
+            filePath = self.journal.filePath(date)
+            offset = os.path.getsize(filePath) if os.path.exists(filePath) else 0
+            seq = 0
+        else:  # 당일 첫 이벤트를 기록 중이면 다음에 저장
+            return None
+
+        checkpoint = {
+            "date": date,
+            "offset": offset,
+            "seq": seq,
+            "orderFields": list(Order.__slots__),
+            "positionFields": list(Position.__slots__),
+            "orders": self.orderBook.snapshot(),
+            "ledger": self.ledger.snapshot(),
+        }
+
+        checkpointPath = self.checkpointPath(date)
+        self.__writer = threading.Thread(
+            target=self.__write,
+            args=(checkpointPath, checkpoint),
+            name="OrderRecovery",
+            daemon=True,
+        )
+        self.__writer.start()
+        if wait:
+            self.__writer.join()
+        return checkpointPath
+
+    def __write(self, checkpointPath, checkpoint):
+        tmpPath = checkpointPath + ".tmp"
+        try:
+            with open(tmpPath, "w", encoding="utf-8") as f:
+                json.dump(checkpoint, f, ensure_ascii=False, separators=(",", ":"))
+            os.replace(tmpPath, checkpointPath)
+        except Exception as e:
+            if self.logger:
+                self.logger.error("ERROR: Recovery checkpoint write failed {}".format(e))
+
+    def startCheckpoint(self, interval=60000):
+        """ interval(ms)마다 checkpoint()를 실행 """
+
+        self.stopCheckpoint()
+        self.__timer = QTimer()
+        self.__timer.timeout.connect(self.checkpoint)
+        self.__timer.start(interval)
+
+    def stopCheckpoint(self):
+        if self.__timer is not None:
+            self.__timer.stop()
+            self.__timer = None
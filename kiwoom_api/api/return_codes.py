@@ -124,6 +124,23 @@ class FidList(object):
         "914": "TRAN_PRICE",  # 단위체결가
         "915": "TRAN_QTY",  # 단위체결량
     }
+    BALANCE = {
+        "9201": "ACCOUNT_NO",  # 계좌번호
+        "9001": "TICKER",  # 종목코드
+        "302": "NAME",  # 종목명
+        "10": "CUR_PRICE",  # 현재가
+        "930": "HOLDING_QTY",  # 보유수량
+        "931": "AVG_PRICE",  # 매입단가
+        "932": "TOTAL_BUY_PRICE",  # 총매입가
+        "933": "ORDERABLE_QTY",  # 주문가능수량
+        "945": "TODAY_NET_BUY_QTY",  # 당일순매수수량
+        "946": "BUY_SELL_GUBUN",  # 매도/매수구분
+        "950": "TODAY_SELL_PNL",  # 당일총매도손익
+        "951": "DEPOSIT",  # 예수금
+        "990": "TODAY_REALIZED_PNL",  # 당일실현손익(유가)
+    }
+
+
 class ReturnCode(object):
     """ 키움 OpenApi+ 함수들이 반환하는 값 """
 
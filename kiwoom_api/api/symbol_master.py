@@ -0,0 +1,220 @@
+from datetime import datetime as dt
+import json
+import os
+import re
+
+from .errors import KiwoomProcessingError
+
+
+class SymbolMaster:
+    """ 종목 기본 정보(종목명, 시장구분, 종목상태, 증거금비율)를 일자별로 저장하는 클래스입니다.
+
+    거래일마다 한 번 GetCodeListByMarket, GetMasterCodeName, GetMasterStockState로
+    전체 종목을 수집하여 symbols-{YYYYMMDD}.json 파일에 column 형태로 저장하고,
+    같은 날 다시 시작하면 COM 호출 없이 파일에서 읽습니다.
+    조회는 종목코드 dict index로 처리합니다.
+    수집은 DataFeeder.loadSymbolMaster()를 참고하시길 바랍니다.
+
+    Parameters
+    ----------
+    path: str
+        저장 폴더
+    """
+
+    PREFIX = "symbols"
+
+    # 시장구분: getMarketByCode() 반환값, 여러 시장에 속한 종목은 앞의 시장으로 분류
+    MARKETS = (("0", "KSP"), ("10", "KDQ"), ("8", "ETF"))
+
+    FIELDS = ("codes", "names", "markets", "states")
+
+    def __init__(self, path):
+        if not os.path.exists(path):
+            os.makedirs(path)
+
+        self.path = path
+        self.date = None
+        self.build([], [], [], [], {})
+
+    @property
+    def isLoaded(self):
+        return self.date is not None
+
+    def __len__(self):
+        return len(self.codes)
+
+    def __contains__(self, code):
+        return code in self.index
+
+    def filePath(self, date):
+        return os.path.join(self.path, "{}-{}.json".format(self.PREFIX, date))
+
+    @property
+    def dates(self):
+        """ 저장된 일자(YYYYMMDD) 목록 """
+
+        pattern = re.compile(r"^{}-(\d{{8}})\.json$".format(self.PREFIX))
+        return sorted(
+            match.group(1)
+            for match in map(pattern.match, os.listdir(self.path))
+            if match is not None
+        )
+
+    ###### 생성 ######
+
+    def build(self, codes, names, markets, states, codeLists, date=None):
+        """ 수집한 종목 정보로 index를 생성합니다.
+
+        Parameters
+        ----------
+        codes, names, markets, states: list of str
+            종목별 종목코드, 종목명, 시장구분("KSP", "KDQ", "ETF"), GetMasterStockState 결과
+        codeLists: dict
+            {시장구분("0", "10", "8"): GetCodeListByMarket 결과 list}
+        date: str
+            기준일자(YYYYMMDD)
+        """
+
+        self.codes = list(codes)
+        self.names = list(names)
+        self.markets = list(markets)
+        self.states = list(states)
+        self.codeLists = {market: list(codeList) for market, codeList in codeLists.items()}
+        self.index = {code: i for i, code in enumerate(self.codes)}
+        self.date = date
+        return self
+
+    def save(self):
+        """ symbols-{date}.json 파일로 저장
+
+        Returns
+        ----------
+        str
+            저장한 파일 경로
+        """
+
+        if not self.isLoaded:
+            raise KiwoomProcessingError("ERROR: symbol master not loaded")
+
+        data = {"date": self.date, "codeLists": self.codeLists}
+        for field in self.FIELDS:
+            data[field] = getattr(self, field)
+
+        filePath = self.filePath(self.date)
+        tmpPath = filePath + ".tmp"
+        with open(tmpPath, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(tmpPath, filePath)
+        return filePath
+
+    def load(self, date=None):
+        """ 저장된 파일을 읽습니다.
+
+        Parameters
+        ----------
+        date: str
+            기준일자(YYYYMMDD), default=None(당일)
+
+        Returns
+        ----------
+        bool
+            파일이 없으면 False
+        """
+
+        date = date or dt.now().strftime("%Y%m%d")
+        data = self.__read(date)
+        if data is None:
+            return False
+
+        self.build(*[data[field] for field in self.FIELDS], data["codeLists"], date=date)
+        return True
+
+    def __read(self, date):
+        filePath = self.filePath(date)
+        if not os.path.exists(filePath):
+            return None
+
+        with open(filePath, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def compare(self, date=None):
+        """ 이전 거래일(저장된 파일 중 기준일자 직전) 대비 변경 내역
+
+        Parameters
+        ----------
+        date: str
+            비교할 일자, default=None(기준일자 직전에 저장된 일자)
+
+        Returns
+        ----------
+        dict
+            {"date": 비교한 일자, "listed": [신규 종목코드, ..], "delisted": [제외된 종목코드, ..],
+             "renamed": {종목코드: (이전 종목명, 종목명)},
+             "stateChanged": {종목코드: (이전 종목상태, 종목상태)}},
+            비교할 파일이 없으면 None
+        """
+
+        if date is None:
+            previous = [d for d in self.dates if d < (self.date or "")]
+            if not previous:
+                return None
+            date = previous[-1]
+
+        data = self.__read(date)
+        if data is None:
+            return None
+
+        prevIndex = {code: i for i, code in enumerate(data["codes"])}
+        renamed, stateChanged = {}, {}
+        for code, i in self.index.items():
+            j = prevIndex.get(code)
+            if j is None:
+                continue
+            if data["names"][j] != self.names[i]:
+                renamed[code] = (data["names"][j], self.names[i])
+            if data["states"][j] != self.states[i]:
+                stateChanged[code] = (data["states"][j], self.states[i])
+
+        return {
+            "date": date,
+            "listed": [code for code in self.codes if code not in prevIndex],
+            "delisted": [code for code in data["codes"] if code not in self.index],
+            "renamed": renamed,
+            "stateChanged": stateChanged,
+        }
+
+    ###### 조회 ######
+
+    def getName(self, code):
+        """ 종목명, 없는 종목이면 None """
+
+        i = self.index.get(code)
+        return self.names[i] if i is not None else None
+
+    def getMarket(self, code):
+        """ 시장구분("KSP", "KDQ", "ETF"), 없는 종목이면 None """
+
+        i = self.index.get(code)
+        return self.markets[i] if i is not None else None
+
+    def getStates(self, code):
+        """ GetMasterStockState 결과 list, 없는 종목이면 None """
+
+        i = self.index.get(code)
+        return self.states[i].split("|") if i is not None else None
+
+    def getMarginRate(self, code):
+        """ 증거금비율(%), 없으면 None """
+
+        i = self.index.get(code)
+        if i is None:
+            return None
+
+        match = re.search(r"증거금(\d+)%", self.states[i])
+        return int(match.group(1)) if match is not None else None
+
+    def hasIssue(self, code):
+        """ 관리종목 혹은 거래정지 종목이면 True """
+
+        states = self.getStates(code) or ()
+        return ("관리종목" in states) or ("거래정지" in states)
@@ -0,0 +1,170 @@
+from datetime import datetime as dt
+import hashlib
+import json
+import os
+import re
+import zlib
+
+
+class TrCache:
+    """ 과거 데이터 TR의 응답을 파일에 저장하여 같은 요청은 서버에 보내지 않도록 하는 cache 입니다.
+
+    요청은 (trCode, 입력값, page, 이전 page 응답의 digest)의 hash로 구분하며,
+    연속조회 page는 이전 page의 응답 내용에 연결되므로 시작 page가 달라지면 다른 요청이 됩니다.
+    응답은 멀티데이터를 column 형태로 변환하여 zlib으로 압축한 파일({trCode}/{hash}.z)로 저장합니다.
+
+    아래 조건을 모두 만족하여 이후에 변하지 않는 응답만 저장하며, 저장된 응답은 만료되지 않습니다.
+    - 멀티데이터의 일자(일자, 날짜, 체결시간)가 모두 당일 이전
+    - 첫 page는 입력값에 당일 이전의 조회 일자(ex: 기준일자, 일자)가 있는 경우
+      (일자 입력값이 없는 TR의 첫 page는 매일 내용이 달라지므로 저장하지 않음)
+    - 수정주가 요청(수정주가구분=1)이 아닌 경우 (권리 발생시 과거 데이터가 변경됨)
+
+    Kiwoom.commRqData()가 요청 전에 확인하므로 DataFeeder.request()와 연속조회에 그대로 적용됩니다.
+
+    Parameters
+    ----------
+    path: str
+        저장 폴더
+    """
+
+    DATE_KEYS = ("일자", "날짜", "체결시간")
+
+    EXTENSION = ".z"
+
+    def __init__(self, path):
+        if not os.path.exists(path):
+            os.makedirs(path)
+
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+
+    @staticmethod
+    def key(trCode, inputs, page=0, prevDigest=None):
+        """ 요청 hash """
+
+        identity = [trCode.upper(), sorted(inputs.items()), page, prevDigest]
+        return hashlib.sha1(
+            json.dumps(identity, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        ).hexdigest()
+
+    @staticmethod
+    def digest(data, isNext):
+        """ 응답 내용의 hash, 다음 page 요청 hash에 사용 """
+
+        return hashlib.sha1(TrCache.encode(data, isNext)).hexdigest()
+
+    def filePath(self, trCode, key):
+        return os.path.join(self.path, trCode.upper(), key + self.EXTENSION)
+
+    ###### 직렬화 ######
+
+    @staticmethod
+    def encode(data, isNext):
+        """ data를 column 형태의 JSON으로 변환 """
+
+        rows = data.get("멀티데이터") or []
+        columns = list(rows[0]) if rows else []
+        payload = {
+            "single": data.get("싱글데이터"),
+            "columns": columns,
+            "values": [[row.get(column, "") for row in rows] for column in columns],
+            "isNext": isNext,
+        }
+        return json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+    @staticmethod
+    def decode(raw):
+        """ encode()의 역변환
+
+        Returns
+        ----------
+        tuple
+            (data, isNext)
+        """
+
+        payload = json.loads(raw.decode("utf-8"))
+        data = {}
+        if payload["single"] is not None:
+            data["싱글데이터"] = payload["single"]
+        if payload["columns"]:
+            data["멀티데이터"] = [dict(zip(payload["columns"], values)) for values in zip(*payload["values"])]
+        else:
+            data["멀티데이터"] = []
+        return data, payload["isNext"]
+
+    ###### 조회/저장 ######
+
+    def get(self, trCode, key):
+        """ 저장된 응답
+
+        Returns
+        ----------
+        tuple
+            (data, isNext), 없으면 None
+        """
+
+        filePath = self.filePath(trCode, key)
+        try:
+            with open(filePath, "rb") as f:
+                raw = zlib.decompress(f.read())
+        except (OSError, zlib.error):
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return self.decode(raw)
+
+    def put(self, trCode, key, data, isNext):
+        """ 응답 저장 """
+
+        filePath = self.filePath(trCode, key)
+        folder = os.path.dirname(filePath)
+        if not os.path.exists(folder):
+            os.makedirs(folder)
+
+        tmpPath = filePath + ".tmp"
+        with open(tmpPath, "wb") as f:
+            f.write(zlib.compress(self.encode(data, isNext)))
+        os.replace(tmpPath, filePath)
+        self.stores += 1
+
+    def isImmutable(self, inputs, data, page=0, today=None):
+        """ 이후에 변하지 않는 응답인지 여부 (저장 조건) """
+
+        today = today or dt.now().strftime("%Y%m%d")
+
+        if inputs.get("수정주가구분") == "1":
+            return False
+
+        rows = data.get("멀티데이터") or []
+        dateKey = next((key for key in self.DATE_KEYS if rows and key in rows[0]), None)
+        if dateKey is None:
+            return False
+
+        dates = [row[dateKey].strip()[:8] for row in rows]
+        if not all(dates) or max(dates) >= today:
+            return False
+
+        if page == 0:
+            inputDates = [
+                value
+                for key, value in inputs.items()
+                if ("일자" in key or "날짜" in key) and re.match(r"^\d{8}$", value)
+            ]
+            return bool(inputDates) and max(inputDates) < today
+
+        return True
+
+    def clear(self, trCode=None):
+        """ 저장된 응답 삭제, trCode가 None이면 전체 """
+
+        trCodes = [trCode.upper()] if trCode is not None else os.listdir(self.path)
+        for code in trCodes:
+            folder = os.path.join(self.path, code)
+            if not os.path.isdir(folder):
+                continue
+            for name in os.listdir(folder):
+                if name.endswith(self.EXTENSION):
+                    os.remove(os.path.join(folder, name))
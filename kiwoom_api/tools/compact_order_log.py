@@ -0,0 +1,344 @@
+""" 주문 이벤트 JSON 파일(.kiwoom_order_log)을 일자별 columnar 파일로 변환하는 도구
+
+eventReceiveChejanData()가 이벤트마다 기록하던 {table}-{YYYYmmddHHMMSSffffff} 형태의
+JSON 파일을 일자별로 묶어 orders-{YYYYMMDD}.npz 파일로 변환합니다.
+
+    python -m kiwoom_api.tools.compact_order_log SRC DST [--workers 4] [--delete | --archive DIR]
+
+- 일자 단위로 worker process에서 변환하며, 변환된 파일은 (TICKER, ORDER_NO, EVENT_TIME)
+  순서로 정렬되어 종목/주문번호 조회시 index로 사용됩니다.
+- 이미 변환된 이벤트(TABLE, EVENT_TIME)는 다시 추가하지 않으므로 중단 후 재실행할 수 있습니다.
+- --delete: 변환된 원본 파일 삭제, --archive: 일자별 zip 파일로 보관 후 삭제
+"""
+
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+import argparse
+import json
+import os
+import re
+import sys
+import time
+import zipfile
+
+import numpy as np
+import pandas as pd
+
+from ..api.chejan import CHEJAN_PLANS, ChejanPlan, ChejanRecord, toInt
+from ..api.order_book import normalizeCode
+
+
+TABLES = tuple(plan.table for plan in CHEJAN_PLANS.values())
+
+# {table}-{YYYYmmddHHMMSSffffff}
+FILE_PATTERN = re.compile(r"^({})-(\d{{20}})$".format("|".join(TABLES)))
+
+COLUMNS = ("TABLE", "EVENT_TIME") + ChejanRecord.__slots__[1:]
+INT_COLUMNS = tuple(
+    name for name in COLUMNS if ChejanPlan.CONVERTERS.get(name) is toInt
+)
+KEY_COLUMNS = ("TICKER", "ORDER_NO", "EVENT_TIME")
+
+
+def scanSourceFiles(src):
+    """ src 폴더의 원본 파일을 일자별로 분류
+
+    Returns
+    ----------
+    dict
+        {YYYYMMDD: [파일명, ..]}
+    """
+
+    days = defaultdict(list)
+    with os.scandir(src) as entries:
+        for entry in entries:
+            match = FILE_PATTERN.match(entry.name)
+            if match is not None:
+                days[match.group(2)[:8]].append(entry.name)
+    return days
+
+
+def parseSourceFile(filePath, table, timestamp):
+    """ 원본 JSON 파일 한 개를 column 형태의 dict로 변환 """
+
+    with open(filePath, "r", encoding="utf-8") as f:
+        data = json.load(f)
+
+    row = {name: data.get(name, "") for name in COLUMNS}
+    row["TABLE"] = table
+    row["EVENT_TIME"] = toEventTime(timestamp)
+    row["TICKER"] = normalizeCode(row["TICKER"].strip())
+    for name in INT_COLUMNS:
+        row[name] = toInt(row[name] or "")
+    return row
+
+
+def outputPath(dst, date):
+    return os.path.join(dst, "orders-{}.npz".format(date))
+
+
+def loadColumns(filePath):
+    """ 변환된 파일의 column을 dict로 반환 """
+
+    with np.load(filePath, allow_pickle=False) as data:
+        return {name: data[name] for name in data.files}
+
+
+def toEventTime(timestamp):
+    """ 파일명의 시각(YYYYmmddHHMMSSffffff)을 datetime64[us]로 변환 """
+
+    t = timestamp
+    return np.datetime64(
+        "{}-{}-{}T{}:{}:{}.{}".format(t[:4], t[4:6], t[6:8], t[8:10], t[10:12], t[12:14], t[14:]),
+        "us",
+    )
+
+
+def toArrays(rows):
+    """ row(dict) 목록을 typed column array의 dict로 변환 """
+
+    arrays = {}
+    for name in COLUMNS:
+        values = [row[name] for row in rows]
+        if name == "EVENT_TIME":
+            arrays[name] = np.array(values, dtype="datetime64[us]")
+        elif name in INT_COLUMNS:
+            arrays[name] = np.array(values, dtype=np.int64)
+        else:
+            arrays[name] = np.array(values, dtype=str)
+    return arrays
+
+
+def compactDay(src, dst, date, fileNames, mode="keep", archive=None):
+    """ 하루치 원본 파일을 orders-{date}.npz로 변환 (worker process에서 실행)
+
+    Parameters
+    ----------
+    mode: str
+        "keep"(원본 유지), "delete"(삭제), "archive"(zip 보관 후 삭제)
+    archive: str
+        mode="archive"인 경우 zip 파일을 저장할 폴더
+
+    Returns
+    ----------
+    dict
+        {"date", "files": 처리한 파일 수, "added": 추가된 이벤트 수,
+         "rows": 변환된 파일의 전체 이벤트 수, "errors": [읽지 못한 파일명, ..]}
+    """
+
+    filePath = outputPath(dst, date)
+    existing = loadColumns(filePath) if os.path.exists(filePath) else None
+
+    # 이미 변환된 이벤트 (TABLE, EVENT_TIME)
+    done = set()
+    if existing is not None:
+        done = set(
+            zip(existing["TABLE"].tolist(), existing["EVENT_TIME"].astype(np.int64).tolist())
+        )
+
+    rows, converted, errors = [], [], []
+    for fileName in fileNames:
+        table, timestamp = FILE_PATTERN.match(fileName).groups()
+        if done and (table, int(toEventTime(timestamp).astype(np.int64))) in done:
+            converted.append(fileName)
+            continue
+
+        try:
+            rows.append(parseSourceFile(os.path.join(src, fileName), table, timestamp))
+        except (OSError, ValueError, AttributeError):  # 기록 중 중단된 파일 등
+            errors.append(fileName)
+            continue
+        converted.append(fileName)
+
+    if rows:
+        arrays = toArrays(rows)
+        if existing is not None:
+            arrays = {
+                name: np.concatenate([existing[name], arrays[name]]) for name in COLUMNS
+            }
+
+        # (TICKER, ORDER_NO, EVENT_TIME) 순서로 정렬하여 조회 index로 사용
+        order = np.lexsort([arrays[name] for name in reversed(KEY_COLUMNS)])
+        arrays = {name: values[order] for name, values in arrays.items()}
+
+        tmpPath = filePath + ".tmp.npz"
+        np.savez_compressed(tmpPath, **arrays)
+        os.replace(tmpPath, filePath)
+        total = len(arrays["TABLE"])
+    else:
+        total = len(existing["TABLE"]) if existing is not None else 0
+
+    if mode == "archive":
+        archiveSourceFiles(src, archive, date, converted)
+    if mode in ("delete", "archive"):
+        for fileName in converted:
+            os.remove(os.path.join(src, fileName))
+
+    return {
+        "date": date,
+        "files": len(converted),
+        "added": len(rows),
+        "rows": total,
+        "errors": errors,
+    }
+
+
+def archiveSourceFiles(src, archive, date, fileNames):
+    """ 원본 파일을 {archive}/orders-{date}.zip에 추가 (이미 있는 파일은 제외) """
+
+    zipPath = os.path.join(archive, "orders-{}.zip".format(date))
+    with zipfile.ZipFile(zipPath, "a", compression=zipfile.ZIP_DEFLATED) as zf:
+        archived = set(zf.namelist())
+        for fileName in fileNames:
+            if fileName not in archived:
+                zf.write(os.path.join(src, fileName), arcname=fileName)
+
+
+def compactDirectory(src, dst, workers=None, mode="keep", archive=None, log=None):
+    """ src 폴더의 원본 파일을 일자별로 dst 폴더에 변환
+
+    Parameters
+    ----------
+    src: str
+        원본 파일 폴더 (Kiwoom.order_log_path)
+    dst: str
+        변환된 파일을 저장할 폴더
+    workers: int
+        worker process 수, default=None(CPU 수), 1이면 현재 process에서 실행
+    mode: str
+        "keep", "delete", "archive"
+    archive: str
+        mode="archive"인 경우 zip 파일을 저장할 폴더
+    log: callable
+        일자별 결과를 전달받을 함수, ex) print
+
+    Returns
+    ----------
+    list of dict
+        일자별 compactDay() 결과
+    """
+
+    if mode not in ("keep", "delete", "archive"):
+        raise ValueError("mode는 keep, delete, archive 중 하나여야 합니다.")
+    if mode == "archive" and not archive:
+        raise ValueError("mode=archive인 경우 archive 폴더를 지정해야 합니다.")
+
+    for path in (dst, archive):
+        if path and not os.path.exists(path):
+            os.makedirs(path)
+
+    days = scanSourceFiles(src)
+    jobs = [(src, dst, date, days[date], mode, archive) for date in sorted(days)]
+
+    results = []
+    if workers == 1:
+        for job in jobs:
+            results.append(compactDay(*job))
+            if log is not None:
+                log(results[-1])
+        return results
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(compactDay, *job) for job in jobs]
+        for future in futures:
+            results.append(future.result())
+            if log is not None:
+                log(results[-1])
+    return results
+
+
+class CompactOrderLog:
+    """ compactDirectory()로 변환된 일자별 주문 이벤트를 읽는 클래스입니다.
+
+    Parameters
+    ----------
+    path: str
+        변환된 파일 폴더
+    """
+
+    def __init__(self, path):
+        self.path = path
+
+    @property
+    def dates(self):
+        """ 변환된 일자(YYYYMMDD) 목록 """
+
+        pattern = re.compile(r"^orders-(\d{8})\.npz$")
+        return sorted(
+            match.group(1)
+            for match in map(pattern.match, os.listdir(self.path))
+            if match is not None
+        )
+
+    def load(self, date, ticker=None, orderNo=None, tables=None):
+        """ 일자의 주문 이벤트를 DataFrame으로 반환
+
+        ticker, orderNo를 지정하면 정렬 index로 해당 구간만 반환합니다.
+
+        Parameters
+        ----------
+        date: str
+            일자(YYYYMMDD)
+        ticker: str
+            종목코드
+        orderNo: str
+            주문번호 (ticker와 함께 지정)
+        tables: list of str
+            orders_submitted, orders_executed, orders_cancelled 중 반환할 table
+        """
+
+        columns = loadColumns(outputPath(self.path, date))
+
+        start, end = 0, len(columns["TABLE"])
+        if ticker is not None:
+            tickers = columns["TICKER"]
+            ticker = normalizeCode(ticker)
+            start = np.searchsorted(tickers, ticker, side="left")
+            end = np.searchsorted(tickers, ticker, side="right")
+
+            if orderNo is not None:
+                orderNos = columns["ORDER_NO"][start:end]
+                end = start + np.searchsorted(orderNos, orderNo, side="right")
+                start = start + np.searchsorted(orderNos, orderNo, side="left")
+
+        df = pd.DataFrame({name: columns[name][start:end] for name in COLUMNS})
+        if tables is not None:
+            df = df[df["TABLE"].isin(tables)].reset_index(drop=True)
+        return df
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="주문 이벤트 JSON 파일을 일자별 columnar 파일(orders-YYYYMMDD.npz)로 변환"
+    )
+    parser.add_argument("src", help="원본 파일 폴더 (.kiwoom_order_log)")
+    parser.add_argument("dst", help="변환된 파일을 저장할 폴더")
+    parser.add_argument("--workers", type=int, default=None, help="worker process 수")
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument("--delete", action="store_true", help="변환된 원본 파일 삭제")
+    group.add_argument("--archive", metavar="DIR", help="원본 파일을 일자별 zip으로 보관 후 삭제")
+    args = parser.parse_args(argv)
+
+    mode = "archive" if args.archive else ("delete" if args.delete else "keep")
+
+    def log(result):
+        print(
+            "{date}: files={files} added={added} rows={rows} errors={errors}".format(
+                **dict(result, errors=len(result["errors"]))
+            )
+        )
+
+    start = time.time()
+    results = compactDirectory(
+        args.src, args.dst, workers=args.workers, mode=mode, archive=args.archive, log=log
+    )
+    print(
+        "{} days, {} files, {:.1f}s".format(
+            len(results), sum(r["files"] for r in results), time.time() - start
+        )
+    )
+    return 1 if any(r["errors"] for r in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,6 +1,8 @@
 import os
 import sys
 
+import numpy as np
+
 from ..api.errors import ParameterTypeError, ParameterValueError
 
 
@@ -27,6 +29,36 @@ class TickCaculator:
         ),
     }
 
+    # 가격 구간의 경계와 구간별 호가단위
+    tickBoundaryDict = {
+        "KOSPI": np.array([1000, 5000, 10000, 50000, 100000, 500000]),
+        "KOSDAQ": np.array([1000, 5000, 10000, 50000]),
+        "ETF": np.array([], dtype=np.int64),
+    }
+    tickSizeDict = {
+        "KOSPI": np.array([1, 5, 10, 50, 100, 500, 1000]),
+        "KOSDAQ": np.array([1, 5, 10, 50, 100]),
+        "ETF": np.array([5]),
+    }
+
+    def calcTickSize(self, price, market):
+        """
+        가격에 해당하는 호가단위를 반환합니다.
+        price에 array를 입력하면 호가단위를 array로 한 번에 계산합니다.
+        ex) 6000 == calcTickSize(6000, "KOSPI") -> 10
+
+        params
+        ==========================================
+
+        price: int or array-like, 가격
+        market: str, KOSPI, KOSDAQ, ETF
+        """
+        if market not in self.tickSizeDict:
+            raise ParameterValueError()
+
+        idx = np.searchsorted(self.tickBoundaryDict[market], price, side="right")
+        return self.tickSizeDict[market][idx]
+
     def calcShiftedPrice(self, price, tickShift, market):
         """
         현재가 기준으로 k틱 기준 가격을 반홥합니다.
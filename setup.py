@@ -11,6 +11,11 @@ setup(
     download_url="https://github.com/DonghyungKo/kiwoom_api_handler/archive/master.zip",
     install_requires=["pandas==0.25.1", "PyQt5==5.14.1"],
     packages=find_packages(exclude=[]),
+    entry_points={
+        "console_scripts": [
+            "kiwoom-compact-order-log=kiwoom_api.tools.compact_order_log:main",
+        ]
+    },
     keywords=["Kiwoom", "Kiwoom OPEN API+", "Kiwoom API", "키움증권"],
     python_requires=">=3.6",
     long_description=open("README.md", encoding="utf-8").read(),
@@ -0,0 +1,69 @@
+import time
+import unittest
+
+from kiwoom_api.api.account_snapshot import AccountSnapshot
+
+
+OPW00004 = {
+    "싱글데이터": {
+        "계좌명": "홍길동    ",
+        "예수금": "000000001000000",
+        "D+2추정예수금": "000000000800000",
+        "당일투자손익": "-00000000012000",
+        "당일손익율": "-1.25",
+    },
+    "멀티데이터": [
+        {"종목코드": "A005930 ", "종목명": "삼성전자", "보유수량": "000000000010",
+         "평균단가": "000000050000", "현재가": "49000", "매입금액": "000000500000",
+         "평가금액": "000000490000", "손익금액": "-00000010000", "손익율": "-2.00"},
+        {"종목코드": "A000660 ", "종목명": "SK하이닉스", "보유수량": "000000000000",
+         "평균단가": "0", "현재가": "90000", "매입금액": "0",
+         "평가금액": "0", "손익금액": "0", "손익율": "0"},
+    ],
+}
+
+OPT10075 = {
+    "멀티데이터": [
+        {"주문번호": "0012345", "원구문번호": "0000000", "종목코드": "035720", "종목명": "카카오",
+         "주문구분": "+매수", "주문상태": "접수", "주문수량": "10", "주문가격": "-150000",
+         "미체결수량": "7", "시간": "090102"},
+    ]
+}
+
+
+class TestAccountSnapshot(unittest.TestCase):
+    def testFromTr(self):
+        snapshot = AccountSnapshot.fromTr("8000000011", OPW00004, OPT10075)
+
+        self.assertEqual(snapshot.summary["계좌명"], "홍길동")
+        self.assertEqual(snapshot.summary["당일투자손익"], -12000)
+        self.assertEqual(snapshot.summary["당일손익율"], -1.25)
+        self.assertEqual(snapshot.deposit, 800000)
+
+        # 보유수량이 0인 종목 제외
+        self.assertEqual(snapshot.codes, ["005930"])
+        holding = snapshot.getHolding("005930")
+        self.assertEqual((holding.qty, holding.avgPrice, holding.pnl), (10, 50000, -10000))
+        self.assertIsNone(snapshot.getHolding("000660"))
+
+        order = snapshot.unExOrders[0]
+        self.assertEqual((order.orderNo, order.price, order.unExQty), ("0012345", 150000, 7))
+
+    def testImmutable(self):
+        snapshot = AccountSnapshot.fromTr("8000000011", OPW00004, OPT10075)
+        with self.assertRaises(AttributeError):
+            snapshot.timestamp = 0
+        with self.assertRaises(TypeError):
+            snapshot.summary["예수금"] = 0
+        with self.assertRaises(AttributeError):
+            snapshot.holdings[0].qty = 0
+
+    def testFreshness(self):
+        snapshot = AccountSnapshot.fromTr("8000000011", OPW00004, OPT10075, timestamp=time.time() - 1)
+        self.assertTrue(snapshot.isFresh(5000))
+        self.assertFalse(snapshot.isFresh(500))
+        self.assertGreaterEqual(snapshot.age, 1000)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,52 @@
+import unittest
+
+import numpy as np
+
+from kiwoom_api.api.adjust import PriceAdjuster
+
+
+def bars(close, adjType, adjRatio):
+    n = len(close)
+    close = np.array(close, dtype=np.int64)
+    return {
+        "time": np.arange(n).astype("datetime64[s]"),
+        "open": close,
+        "high": close,
+        "low": close,
+        "close": close,
+        "volume": np.full(n, 100, dtype=np.int64),
+        "adjType": np.array(adjType, dtype=np.int32),
+        "adjRatio": np.array(adjRatio, dtype=np.float64),
+    }
+
+
+class TestPriceAdjuster(unittest.TestCase):
+    def testAdjust(self):
+        # 3번째 bar에서 1:2 액면분할(수정비율 50%)
+        adjusted = PriceAdjuster().adjust(
+            bars([1000, 1010, 505, 510], [0, 0, 8, 0], [0, 0, 50.0, 0])
+        )
+
+        self.assertEqual(adjusted["close"].tolist(), [500, 505, 505, 510])
+        self.assertEqual(adjusted["volume"].tolist(), [200, 200, 100, 100])
+        self.assertEqual(adjusted["factor"].tolist(), [0.5, 0.5, 1.0, 1.0])
+
+    def testIncremental(self):
+        adjuster = PriceAdjuster()
+        data = bars([1000, 1010, 506, 510, 520, 260], [0, 0, 8, 0, 0, 8], [0, 0, 50.0, 0, 0, 50.0])
+
+        head = {name: column[:4] for name, column in data.items()}
+        adjuster.adjust(head, key="005930")
+        adjusted = adjuster.adjust(data, key="005930", start=2)
+
+        # 추가된 bar의 권리도 이전 bar에 반영
+        self.assertEqual(adjusted["close"].tolist(), [253, 255, 260, 260])
+        self.assertEqual(adjuster.cumulative["005930"][1], 6)
+        np.testing.assert_array_equal(
+            adjuster.factors(data["adjType"], data["adjRatio"], key="005930"),
+            adjuster.factors(data["adjType"], data["adjRatio"]),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,108 @@
+import logging
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+
+from kiwoom_api.api.backfill import BackfillJob
+from kiwoom_api.api.kiwoom import APIDelayCheck
+
+
+BUSINESS_DAYS = [
+    str(d).replace("-", "")
+    for d in np.arange(np.datetime64("2020-01-01"), np.datetime64("2020-03-14"))
+    if np.is_busday(d)
+][::-1]
+
+
+class FakeKiwoom:
+    """ 요청한 일자부터 20일씩 연속조회되는 OPT10059 """
+
+    def __init__(self, failAt=None):
+        self.logger = logging.getLogger("test_backfill")
+        self.requestDelayCheck = APIDelayCheck(logger=self.logger)
+        self.inputs = {}
+        self.requests = []
+        self.failAt = failAt
+        self.isNext = 0
+
+    def setInputValue(self, key, value):
+        self.inputs[key] = value
+
+    def commRqData(self, rqName, trCode, inquiry, scrNo):
+        if len(self.requests) == self.failAt:
+            raise RuntimeError("interrupted")
+        self.requests.append((self.inputs["종목코드"], self.inputs["일자"], inquiry))
+
+        if inquiry == 0:
+            self.days = [d for d in BUSINESS_DAYS if d <= self.inputs["일자"]]
+            self.pos = 0
+        rows = [{"일자": d, "개인투자자": "100"} for d in self.days[self.pos : self.pos + 20]]
+        self.pos += 20
+        self.isNext = 2 if self.pos < len(self.days) else 0
+        self.OPT10059 = {"멀티데이터": rows}
+
+
+class FakeFeeder:
+    def __init__(self, kiwoom):
+        self.kiwoom = kiwoom
+
+
+class TestBackfillJob(unittest.TestCase):
+    TEMPLATE = {"일자": "{date}", "종목코드": "{code}", "금액수량구분": "1"}
+
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+        self.checkpointPath = os.path.join(self.path, "checkpoint.json")
+        self.rows = []
+
+    def tearDown(self):
+        shutil.rmtree(self.path)
+
+    def createJob(self, kiwoom):
+        return BackfillJob(
+            FakeFeeder(kiwoom),
+            "OPT10059",
+            self.TEMPLATE,
+            ["005930", "000660"],
+            start="20200201",
+            end="20200313",
+            sink=lambda code, rows: self.rows.extend((code, row["일자"]) for row in rows),
+            checkpointPath=self.checkpointPath,
+            rowsPerPage=20,
+        )
+
+    def testPlan(self):
+        plan = self.createJob(FakeKiwoom()).plan()
+        self.assertEqual(plan["pending"], 2)
+        self.assertEqual(plan["requests"], 4)  # 30영업일 / 20
+        self.assertEqual(plan["budget"], 1000)
+
+    def testRun(self):
+        kiwoom = FakeKiwoom()
+        result = self.createJob(kiwoom).run()
+
+        self.assertEqual(result, {"005930": 30, "000660": 30})
+        self.assertEqual(len(kiwoom.requests), 4)
+        self.assertEqual(min(d for _, d in self.rows), "20200203")
+
+    def testResume(self):
+        kiwoom = FakeKiwoom(failAt=3)  # 두 번째 종목의 첫 page 이후 중단
+        with self.assertRaises(RuntimeError):
+            self.createJob(kiwoom).run()
+
+        kiwoom = FakeKiwoom()
+        job = self.createJob(kiwoom)
+        self.assertEqual(job.pendingCodes, ["000660"])
+        job.run()
+
+        # 마지막으로 받은 일자 이전부터 요청
+        self.assertEqual(kiwoom.requests, [("000660", "20200216", 0)])
+        self.assertEqual(len(self.rows), 60)
+        self.assertEqual(len(set(self.rows)), 60)
+
+
+if __name__ == "__main__":
+    unittest.main()
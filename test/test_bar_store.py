@@ -0,0 +1,233 @@
+import logging
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+
+from kiwoom_api.api.adjust import PriceAdjuster
+from kiwoom_api.api.bar_store import BarStore, SyncState, dailyBarColumns, minuteBarColumns
+from kiwoom_api.api.data_feeder import DataFeeder
+
+
+def minuteRows(start, count):
+    """ start부터 count개의 1분봉, OPT10080과 같이 최근 bar부터 """
+
+    times = np.datetime64(start) + np.arange(count) * np.timedelta64(60, "s")
+    rows = []
+    for i, t in enumerate(times.astype(object)):
+        rows.append(
+            {
+                "체결시간": t.strftime("%Y%m%d%H%M%S"),
+                "현재가": "-{}".format(1000 + i),
+                "시가": "1000",
+                "고가": "+1010",
+                "저가": "990",
+                "거래량": str(10 + i),
+                "수정주가구분": "",
+                "수정비율": "",
+                "수정주가이벤트": "",
+                "전일종가": "1000",
+            }
+        )
+    return rows[::-1]
+
+
+class FakeKiwoom:
+    """ 종목별 bars(최근 bar부터)를 900개씩 연속조회하는 OPT10080 """
+
+    def __init__(self, path, bars, failAt=None):
+        self.bar_path = path
+        self.bars = bars
+        self.failAt = failAt
+        self.logger = logging.getLogger("test_bar_store")
+        self.priceAdjuster = PriceAdjuster()
+        self.inputs = {}
+        self.requests = []
+        self.adjustedRequests = []
+        self.isNext = 0
+
+    def setInputValue(self, key, value):
+        self.inputs[key] = value
+
+    def commRqData(self, rqName, trCode, inquiry, scrNo):
+        if len(self.requests) == self.failAt:
+            raise RuntimeError("interrupted")
+        code = self.inputs["종목코드"]
+        self.requests.append((code, inquiry))
+        self.adjustedRequests.append(self.inputs["수정주가구분"])
+
+        self.pos = self.pos + 900 if inquiry == 2 else 0
+        rows = self.bars[code]
+        self.OPT10080 = {"멀티데이터": rows[self.pos : self.pos + 900]}
+        self.isNext = 2 if self.pos + 900 < len(rows) else 0
+
+
+class TestBarStore(unittest.TestCase):
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+        self.store = BarStore(os.path.join(self.path, "minute1"))
+
+    def tearDown(self):
+        shutil.rmtree(self.path)
+
+    def testMinuteBarColumns(self):
+        columns = minuteBarColumns(minuteRows("2020-03-13T09:00:00", 3))
+        self.assertEqual(columns["time"][0], np.datetime64("2020-03-13T09:02:00"))
+        self.assertEqual(columns["close"].tolist(), [1002, 1001, 1000])
+        self.assertEqual(columns["adjRatio"].tolist(), [0.0, 0.0, 0.0])
+
+    def testAppend(self):
+        self.assertIsNone(self.store.lastTime("005930"))
+
+        columns = minuteBarColumns(minuteRows("2020-03-13T09:00:00", 10))
+        self.assertEqual(self.store.append("005930", columns), 10)
+        self.assertEqual(self.store.lastTime("A005930"), np.datetime64("2020-03-13T09:09:00"))
+
+        # 이미 저장된 bar는 제외
+        columns = minuteBarColumns(minuteRows("2020-03-13T09:05:00", 10))
+        self.assertEqual(self.store.append("005930", columns), 5)
+
+        data = BarStore(self.store.path).read("005930")
+        self.assertEqual(len(data["time"]), 15)
+        self.assertTrue((np.diff(data["time"]) == np.timedelta64(60, "s")).all())
+        self.assertEqual(data["close"][-1], 1009)
+        self.assertEqual(self.store.codes, ["005930"])
+
+    def testTruncateInterruptedAppend(self):
+        columns = minuteBarColumns(minuteRows("2020-03-13T09:00:00", 3))
+        self.store.append("005930", columns)
+
+        # meta.json 갱신 전에 중단된 append
+        with open(self.store.columnPath("005930", "close"), "ab") as f:
+            f.write(np.arange(5, dtype=np.int64).tobytes())
+
+        columns = minuteBarColumns(minuteRows("2020-03-13T09:03:00", 2))
+        self.store.append("005930", columns)
+        data = self.store.read("005930")
+        self.assertEqual(
+            os.path.getsize(self.store.columnPath("005930", "close")), 5 * 8
+        )
+        self.assertEqual(data["close"].tolist(), [1000, 1001, 1002, 1000, 1001])
+
+    def appendDays(self, code, days, start="09:00:00", count=390):
+        for day in days:
+            rows = minuteRows("{}T{}".format(day, start), count)
+            self.store.append(code, minuteBarColumns(rows))
+
+    def testDateIndex(self):
+        self.appendDays("005930", ["2020-03-12", "2020-03-13"], count=30)
+        self.appendDays("005930", ["2020-03-13"], start="09:30:00", count=30)
+        self.appendDays("005930", ["2020-03-16"], count=30)
+
+        dates, offsets = self.store.dateIndex("005930")
+        self.assertEqual([str(d) for d in dates], ["2020-03-12", "2020-03-13", "2020-03-16"])
+        self.assertEqual(offsets.tolist(), [0, 30, 90])
+
+        self.assertEqual(self.store.seek("005930", "20200313", "20200313"), (30, 90))
+        self.assertEqual(self.store.seek("005930", "2020-03-13 09:45"), (75, 120))
+        self.assertEqual(self.store.seek("005930", None, "2020-03-12 09:10"), (0, 11))
+        self.assertEqual(self.store.seek("005930", "20200314", "20200315"), (90, 90))
+        self.assertEqual(self.store.seek("000660", "20200313"), (0, 0))
+
+    def testRebuildIndex(self):
+        self.appendDays("005930", ["2020-03-12", "2020-03-13"], count=10)
+
+        # index가 없는 이전 형식의 meta.json
+        metaPath = os.path.join(self.store.codePath("005930"), BarStore.META_FILE)
+        with open(metaPath, "w") as f:
+            f.write('{"rows": 20}')
+
+        store = BarStore(self.store.path)
+        self.assertEqual(store.dateIndex("005930")[1].tolist(), [0, 10])
+        self.assertEqual(store.seek("005930", "20200313"), (10, 20))
+
+    def testLoad(self):
+        self.appendDays("005930", ["2020-03-12", "2020-03-13"], count=5)
+        self.appendDays("000660", ["2020-03-13"], start="09:02:00", count=5)
+
+        data = self.store.load(["005930", "000660"], "20200313", "20200313", columns=["close"])
+        self.assertEqual(data["codes"], ["005930", "000660"])
+        self.assertEqual(len(data["time"]), 7)
+        self.assertEqual(data["close"].shape, (7, 2))
+        self.assertEqual(data["close"][:, 0].tolist()[:5], [1000, 1001, 1002, 1003, 1004])
+        self.assertTrue(np.isnan(data["close"][:2, 1]).all())
+
+        df = self.store.load(["005930", "000660"], "20200313", frame=True)
+        self.assertEqual(len(df), 10)
+        self.assertEqual(df.loc[("000660", np.datetime64("2020-03-13T09:02:00")), "volume"], 10)
+
+    def testDailyBarColumns(self):
+        rows = [
+            {"날짜": "20200313", "시가": "1000", "고가": "1100", "저가": "900", "종가": "1050", "거래량": "10"},
+            {"날짜": "20200312", "시가": "990", "고가": "1000", "저가": "980", "종가": "1000", "거래량": "20"},
+        ]
+        self.assertEqual(self.store.append("005930", dailyBarColumns(rows)), 2)
+        self.assertEqual(self.store.read("005930")["close"].tolist(), [1000, 1050])
+
+    def testSyncState(self):
+        filePath = os.path.join(self.path, "sync-state.json")
+        state = SyncState(filePath)
+        state.mark("005930", 10)
+
+        state = SyncState(filePath)
+        self.assertIn("005930", state)
+        self.assertNotIn("000660", state)
+
+        state.clear()
+        self.assertNotIn("005930", SyncState(filePath))
+
+        state = SyncState(filePath, job={"codes": ["005930"]})
+        state.mark("005930", 10)
+        self.assertIn("005930", SyncState(filePath, job={"codes": ["005930"]}))
+        self.assertNotIn("005930", SyncState(filePath, job={"codes": ["005930", "000660"]}))
+
+    def testSyncTwiceInOneDay(self):
+        bars = {
+            "005930": minuteRows("2020-03-13T09:00:00", 10),
+            "000660": minuteRows("2020-03-13T09:00:00", 5),
+        }
+        kiwoom = FakeKiwoom(self.path, bars)
+        feeder = DataFeeder(kiwoom)
+        self.assertEqual(feeder.syncMinuteBars(["005930", "000660"]), {"005930": 10, "000660": 5})
+
+        # 같은 날 새로 생긴 bar는 다음 동기화에서 추가
+        bars["005930"] = minuteRows("2020-03-13T09:00:00", 15)
+        self.assertEqual(feeder.syncMinuteBars(["005930", "000660"]), {"005930": 5, "000660": 0})
+        self.assertEqual(len(feeder.getMinuteBarStore().read("005930")["time"]), 15)
+
+    def testResumeInterruptedSync(self):
+        bars = {code: minuteRows("2020-03-13T09:00:00", 10) for code in ("005930", "000660")}
+        kiwoom = FakeKiwoom(self.path, bars, failAt=1)
+        feeder = DataFeeder(kiwoom)
+        with self.assertRaises(RuntimeError):
+            feeder.syncMinuteBars(["005930", "000660"])
+
+        # 완료한 종목은 다시 요청하지 않음
+        kiwoom.failAt = None
+        kiwoom.requests = []
+        self.assertEqual(feeder.syncMinuteBars(["005930", "000660"]), {"005930": 10, "000660": 10})
+        self.assertEqual([code for code, _ in kiwoom.requests], ["000660"])
+
+    def testRawAndAdjustedStores(self):
+        raw = minuteRows("2020-03-13T09:00:00", 10)
+        kiwoom = FakeKiwoom(self.path, {"005930": raw})
+        feeder = DataFeeder(kiwoom)
+
+        self.assertEqual(feeder.syncMinuteBars("005930", adjusted=False), {"005930": 10})
+        self.assertEqual(kiwoom.adjustedRequests, ["0"])
+        self.assertIsNone(feeder.getMinuteBarStore(adjusted=True).lastTime("005930"))
+
+        # 수정주가 동기화는 원주가 저장소의 진행 상황과 무관하게 요청
+        self.assertEqual(feeder.syncMinuteBars("005930", adjusted=True), {"005930": 10})
+        self.assertEqual(kiwoom.adjustedRequests, ["0", "1"])
+
+        bars = feeder.getAdjustedMinuteBars("005930")
+        stored = feeder.getMinuteBarStore(adjusted=False).read("005930")
+        self.assertEqual(bars["close"].tolist(), stored["close"].tolist())
+        self.assertTrue((bars["factor"] == 1).all())
+
+
+if __name__ == "__main__":
+    unittest.main()
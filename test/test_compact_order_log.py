@@ -0,0 +1,103 @@
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+import zipfile
+
+from kiwoom_api.tools.compact_order_log import CompactOrderLog, compactDirectory
+
+
+def writeSourceFile(path, table, timestamp, **kwargs):
+    data = {"BASC_DT": "2020-03-13", "ACCOUNT_NO": "8888888811"}
+    data.update(kwargs)
+    with open(os.path.join(path, "{}-{}".format(table, timestamp)), "w", encoding="utf-8") as f:
+        f.write(json.dumps(data, ensure_ascii=False, indent="\t"))
+
+
+class TestCompactOrderLog(unittest.TestCase):
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+        self.src = os.path.join(self.path, "src")
+        self.dst = os.path.join(self.path, "dst")
+        os.mkdir(self.src)
+
+        writeSourceFile(
+            self.src,
+            "orders_submitted",
+            "20200313090000000001",
+            ORDER_NO="0000002",
+            TICKER="A005930",
+            ORDER_QTY="10",
+            ORDER_PRICE="50,000",
+            ORDER_STATUS="접수",
+        )
+        writeSourceFile(
+            self.src,
+            "orders_executed",
+            "20200313090001000001",
+            ORDER_NO="0000002",
+            TICKER="A005930",
+            TRAN_QTY="10",
+            TRAN_PRICE="+50000",
+            ORDER_STATUS="체결",
+        )
+        writeSourceFile(
+            self.src, "orders_submitted", "20200313090002000001", ORDER_NO="0000001", TICKER="A000660"
+        )
+        writeSourceFile(
+            self.src, "orders_submitted", "20200316090000000001", ORDER_NO="0000001", TICKER="A005930"
+        )
+
+    def tearDown(self):
+        shutil.rmtree(self.path)
+
+    def testCompact(self):
+        results = compactDirectory(self.src, self.dst, workers=1)
+        self.assertEqual([(r["date"], r["added"]) for r in results], [("20200313", 3), ("20200316", 1)])
+
+        log = CompactOrderLog(self.dst)
+        self.assertEqual(log.dates, ["20200313", "20200316"])
+
+        df = log.load("20200313")
+        self.assertEqual(list(df["TICKER"]), ["000660", "005930", "005930"])
+
+        df = log.load("20200313", ticker="A005930", orderNo="0000002")
+        self.assertEqual(list(df["TABLE"]), ["orders_submitted", "orders_executed"])
+        self.assertEqual(df["ORDER_PRICE"].iloc[0], 50000)
+        self.assertEqual(df["TRAN_PRICE"].iloc[1], 50000)
+
+    def testResumeAndArchive(self):
+        compactDirectory(self.src, self.dst, workers=1)
+        writeSourceFile(
+            self.src, "orders_cancelled", "20200313100000000001", ORDER_NO="0000003", TICKER="A005930"
+        )
+
+        archive = os.path.join(self.path, "archive")
+        results = compactDirectory(self.src, self.dst, workers=1, mode="archive", archive=archive)
+        self.assertEqual([r["added"] for r in results], [1, 0])
+        self.assertEqual(os.listdir(self.src), [])
+        with zipfile.ZipFile(os.path.join(archive, "orders-20200313.zip")) as zf:
+            self.assertEqual(len(zf.namelist()), 4)
+
+        self.assertEqual(len(CompactOrderLog(self.dst).load("20200313")), 4)
+
+    def testRunWithoutQAxContainer(self):
+        # QAxContainer가 없는 분석용 환경에서도 실행 가능
+        code = (
+            "import runpy, sys; sys.modules['PyQt5.QAxContainer'] = None; "
+            "sys.argv = ['compact_order_log', '--help']; "
+            "runpy.run_module('kiwoom_api.tools.compact_order_log', run_name='__main__')"
+        )
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        result = subprocess.run(
+            [sys.executable, "-c", code], cwd=root, stdout=subprocess.PIPE, stderr=subprocess.PIPE
+        )
+        self.assertEqual(result.returncode, 0, result.stderr.decode("utf-8", "replace"))
+        self.assertIn(b"usage", result.stdout)
+
+
+if __name__ == "__main__":
+    unittest.main()
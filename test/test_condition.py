@@ -0,0 +1,86 @@
+import time
+import unittest
+
+from kiwoom_api.api.condition import ConditionDelayCheck, ConditionRegistry
+from kiwoom_api.api.errors import KiwoomProcessingError, ParameterValueError
+
+
+class TestConditionDelayCheck(unittest.TestCase):
+    def setUp(self):
+        self.delayCheck = ConditionDelayCheck()
+
+    def testRequestPerSec(self):
+        now = time.time()
+        for i in range(ConditionDelayCheck.REQUEST_PER_SEC):
+            self.delayCheck.rqHistory.append(now - 0.8 + i * 0.01)
+
+        start = time.time()
+        self.delayCheck.checkDelay("급등주")
+        elapsed = time.time() - start
+        self.assertGreaterEqual(elapsed, 0.15)
+        self.assertLess(elapsed, 0.5)
+
+    def testSameConditionInterval(self):
+        self.delayCheck.checkDelay("급등주")
+        # 요청이 실패하면 기록하지 않으므로 다시 요청 가능
+        self.delayCheck.checkDelay("급등주")
+
+        self.delayCheck.record("급등주")
+        self.assertGreater(self.delayCheck.remaining("급등주"), 59)
+        with self.assertRaises(KiwoomProcessingError):
+            self.delayCheck.checkDelay("급등주")
+
+        # 연속조회와 다른 조건식은 제한 없음
+        self.delayCheck.checkDelay("급등주", isNext=True)
+        self.delayCheck.checkDelay("거래량")
+
+        self.delayCheck.lastRequestTime["급등주"] -= ConditionDelayCheck.SAME_CONDITION_INTERVAL
+        self.assertEqual(self.delayCheck.remaining("급등주"), 0)
+
+    def testMaxRealConditions(self):
+        self.delayCheck.checkDelay("급등주", realTimeCount=9, isRealTime=True)
+        with self.assertRaises(KiwoomProcessingError):
+            self.delayCheck.checkDelay("거래량", realTimeCount=10, isRealTime=True)
+        self.delayCheck.checkDelay("거래량", realTimeCount=10, isRealTime=False)
+
+
+class TestConditionRegistry(unittest.TestCase):
+    def setUp(self):
+        self.registry = ConditionRegistry()
+        self.registry.loadNameList("000^급등주;001^거래량;")
+
+    def testLoadNameList(self):
+        self.assertTrue(self.registry.isLoaded)
+        self.assertEqual(self.registry.getIndex("거래량"), 1)
+        with self.assertRaises(ParameterValueError):
+            self.registry.getIndex("없는조건")
+
+    def testSetMatches(self):
+        self.registry.setMatches("급등주", "005930;000660;")
+        self.registry.setMatches("급등주", "035420;", isNext=True)
+        self.assertEqual(self.registry.getMatches("급등주"), {"005930", "000660", "035420"})
+
+        self.registry.setMatches("급등주", "035720;")
+        self.assertEqual(self.registry.getMatches("급등주"), {"035720"})
+
+    def testApplyRealEvent(self):
+        events = []
+        self.registry.addListener(lambda *args: events.append(args))
+        self.registry.setMatches("급등주", "005930;")
+
+        self.assertTrue(self.registry.applyRealEvent("000660", "I", "급등주"))
+        self.assertFalse(self.registry.applyRealEvent("000660", "I", "급등주"))
+        self.assertTrue(self.registry.applyRealEvent("005930", "D", "급등주"))
+        self.assertFalse(self.registry.applyRealEvent("005930", "D", "급등주"))
+        self.assertFalse(self.registry.applyRealEvent("035420", "X", "급등주"))
+
+        self.assertEqual(self.registry.getMatches("급등주"), {"000660"})
+        self.assertEqual(events, [("급등주", "000660", True), ("급등주", "005930", False)])
+
+        # getMatches()는 복사본
+        self.registry.getMatches("급등주").add("999999")
+        self.assertEqual(self.registry.getMatches("급등주"), {"000660"})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,19 @@
+import time
+import unittest
+
+from kiwoom_api.api.kiwoom import APIDelayCheck
+
+
+class TestAPIDelayCheck(unittest.TestCase):
+    def testEstimate(self):
+        delayCheck = APIDelayCheck()
+        self.assertEqual(delayCheck.estimate(5), 0)
+        self.assertAlmostEqual(delayCheck.estimate(10), 1, places=3)
+
+        delayCheck.rqHistory.extend([time.time()] * 1000)
+        self.assertEqual(delayCheck.remaining(), 0)
+        self.assertGreater(delayCheck.estimate(1), 3600)
+
+
+if __name__ == "__main__":
+    unittest.main()
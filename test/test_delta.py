@@ -0,0 +1,58 @@
+import unittest
+
+from kiwoom_api.api.delta import TrDelta
+from kiwoom_api.api.errors import ParameterValueError
+
+
+def unExOrder(orderNo, unExQty):
+    return {"주문번호": orderNo, "종목코드": "005930", "미체결수량": unExQty}
+
+
+class TestTrDelta(unittest.TestCase):
+    INPUTS = {"계좌번호": "8000000011", "체결구분": "1"}
+
+    def testDiff(self):
+        trDelta = TrDelta()
+
+        delta = trDelta.diff(
+            "OPT10075", self.INPUTS, {"멀티데이터": [unExOrder("001", "10"), unExOrder("002", "5")]}
+        )
+        self.assertEqual(len(delta.inserted), 2)
+
+        delta = trDelta.diff(
+            "OPT10075", self.INPUTS, {"멀티데이터": [unExOrder("002", "3"), unExOrder("003", "1")]}
+        )
+        self.assertEqual(delta.inserted, [unExOrder("003", "1")])
+        self.assertEqual(delta.updated, [unExOrder("002", "3")])
+        self.assertEqual(delta.deleted, [unExOrder("001", "10")])
+        self.assertIsNone(delta.single)
+
+        delta = trDelta.diff(
+            "OPT10075", self.INPUTS, {"멀티데이터": [unExOrder("002", "3"), unExOrder("003", "1")]}
+        )
+        self.assertTrue(delta.isEmpty)
+
+        # 입력값이 다르면 별도로 보관
+        other = dict(self.INPUTS, 계좌번호="8000000021")
+        self.assertEqual(len(trDelta.diff("OPT10075", other, {"멀티데이터": [unExOrder("002", "3")]}).inserted), 1)
+
+    def testSingleData(self):
+        trDelta = TrDelta()
+        data = {"싱글데이터": {"예수금": "1000"}, "멀티데이터": []}
+        self.assertEqual(trDelta.diff("OPW00004", {}, data).single, {"예수금": "1000"})
+        self.assertTrue(trDelta.diff("OPW00004", {}, data).isEmpty)
+
+        trDelta.reset("OPW00004")
+        self.assertFalse(trDelta.diff("OPW00004", {}, data).isEmpty)
+
+    def testRowKey(self):
+        trDelta = TrDelta()
+        with self.assertRaises(ParameterValueError):
+            trDelta.diff("OPT10081", {}, {"멀티데이터": []})
+
+        data = {"멀티데이터": [{"일자": "20200313", "현재가": "100"}]}
+        self.assertEqual(len(trDelta.diff("OPT10081", {}, data, rowKey="일자").inserted), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,112 @@
+from datetime import datetime as dt
+import logging
+import os
+import shutil
+import tempfile
+import time
+import unittest
+
+from kiwoom_api.api.chejan import ChejanRecord
+from kiwoom_api.api.event_log import EventLogHandler, readEvents
+
+
+def makeRecord(msg, created, level=logging.DEBUG):
+    record = logging.LogRecord("test_event_log", level, "", 0, msg, (), None)
+    record.created = created
+    return record
+
+
+class TestEventLog(unittest.TestCase):
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+        self.day1 = time.mktime(dt(2020, 3, 12, 15, 0).timetuple())
+        self.day2 = time.mktime(dt(2020, 3, 13, 9, 0).timetuple())
+
+    def tearDown(self):
+        shutil.rmtree(self.path)
+
+    def write(self, handler):
+        handler.handle(makeRecord({"EVENT": "eventReceiveTrData", "TR_CODE": "OPT10001"}, self.day1))
+        for i in range(10):
+            handler.handle(
+                makeRecord({"EVENT": "eventReceiveTrData", "TR_CODE": "OPT10081", "i": i}, self.day2 + i)
+            )
+        handler.handle(makeRecord({"EVENT": "eventReceiveTrCondition", "TIME": dt(2020, 3, 13)}, self.day2 + 5))
+        handler.handle(makeRecord("commRqData 주식기본정보요청", self.day2 + 6, logging.INFO))
+        handler.close()
+
+    def testRotation(self):
+        self.write(EventLogHandler(self.path, maxBytes=300))
+
+        names = sorted(os.listdir(self.path))
+        # 마지막 segment는 다음 실행에서 압축
+        self.assertTrue(all(name.endswith(".jsonl.gz") for name in names[:-1]))
+        self.assertTrue(names[-1].endswith(".jsonl"))
+        self.assertEqual(names[0], "20200312-0001.jsonl.gz")
+        self.assertGreater(len([name for name in names if name.startswith("20200313")]), 1)
+
+    def testReadEvents(self):
+        self.write(EventLogHandler(self.path, maxBytes=300))
+
+        events = list(readEvents(self.path))
+        self.assertEqual(len(events), 13)
+        self.assertEqual(events[-1]["d"], {"msg": "commRqData 주식기본정보요청"})
+        self.assertEqual(events[-1]["lv"], "INFO")
+
+        events = list(readEvents(self.path, event="eventReceiveTrData", start="20200313 090002", end="20200313090005"))
+        self.assertEqual([e["d"]["i"] for e in events], [2, 3, 4])
+
+        events = list(readEvents(self.path, event="eventReceiveTrCondition"))
+        self.assertEqual(events[0]["d"], {"TIME": "2020-03-13 00:00:00"})
+
+    def testResume(self):
+        handler = EventLogHandler(self.path, compress=False)
+        handler.handle(makeRecord({"EVENT": "a"}, self.day2))
+        handler.close()
+        self.assertEqual(os.listdir(self.path), ["20200313-0001.jsonl"])
+
+        # 다음 실행에서 이전 segment를 압축하고 새 segment에 기록
+        handler = EventLogHandler(self.path)
+        handler.handle(makeRecord({"EVENT": "b"}, self.day2 + 1))
+        handler.close()
+        self.assertEqual(
+            sorted(os.listdir(self.path)), ["20200313-0001.jsonl.gz", "20200313-0002.jsonl"]
+        )
+        self.assertEqual([e["ev"] for e in readEvents(self.path)], ["a", "b"])
+
+    def testStartupCompression(self):
+        today = dt.now().strftime("%Y%m%d")
+        for name in ("20200312-0001.jsonl", "{}-0001.jsonl".format(today)):
+            with open(os.path.join(self.path, name), "wb") as f:
+                f.write(b'{"t":0,"lv":"DEBUG","ev":"","d":{}}\n')
+
+        handler = EventLogHandler(self.path)
+        handler.handle(makeRecord({"EVENT": "eventReceiveTrData"}, time.time()))
+        handler.close()
+
+        # 당일 segment는 압축하지 않고, 새 번호의 segment에 기록
+        self.assertEqual(
+            sorted(os.listdir(self.path)),
+            ["20200312-0001.jsonl.gz", "{}-0001.jsonl".format(today), "{}-0002.jsonl".format(today)],
+        )
+
+    def testChejanRecord(self):
+        record = ChejanRecord("orders_executed", "2020-03-13", "체결")
+        record.ORDER_NO = "0000001"
+        record.TICKER = "A005930"
+        record.TRAN_QTY = 10
+
+        handler = EventLogHandler(self.path)
+        handler.handle(makeRecord(record, self.day2))
+        handler.handle(makeRecord({"EVENT": "eventReceiveTrData"}, self.day2 + 1))
+        handler.close()
+
+        events = list(readEvents(self.path, event="orders_executed"))
+        self.assertEqual(len(events), 1)
+        self.assertEqual(events[0]["d"], record.toDict())
+        restored = ChejanRecord.fromDict("orders_executed", events[0]["d"])
+        self.assertEqual(restored.toDict(), record.toDict())
+
+
+if __name__ == "__main__":
+    unittest.main()
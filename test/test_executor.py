@@ -0,0 +1,264 @@
+import logging
+import unittest
+
+from PyQt5.QtCore import QCoreApplication, QEventLoop, QTimer
+
+from kiwoom_api.api.chejan import ChejanRecord
+from kiwoom_api.api.executor import Executor, OrderHandle
+from kiwoom_api.api.kiwoom import APIDelayCheck, Kiwoom
+from kiwoom_api.api.latency import LatencyRecorder
+from kiwoom_api.api.order_book import OrderBook
+from kiwoom_api.api.pretrade import PreTradeTable
+
+
+class FakeKiwoom:
+    """ SendOrder 호출에 종목코드별로 정해진 응답을 보내는 Kiwoom 대용
+
+    script: {종목코드: ("ack", 주문번호, latency) | ("reject", 메시지, latency) | None(응답 없음)}
+    주문 응답 처리는 Kiwoom의 이벤트 메서드를 그대로 사용합니다.
+    """
+
+    ORDER_TR_CODE = "KOA_NORMAL_BUY_KP_ORD"
+
+    eventReceiveTrData = Kiwoom.eventReceiveTrData
+    eventReceiveMsg = Kiwoom.eventReceiveMsg
+    _Kiwoom__expireOrderHandle = Kiwoom._Kiwoom__expireOrderHandle
+
+    def __init__(self, script, ackTimeout=5000):
+        self.script = script
+        self.ackTimeout = ackTimeout
+        self.logger = logging.getLogger("test_executor")
+        self.orderDelayCheck = APIDelayCheck(logger=self.logger)
+        self.latency = LatencyRecorder()
+        self.orderBook = OrderBook()
+        self.preTrade = PreTradeTable()
+        self.orderHandles = {}
+        self.expiredOrderHandles = {}
+        self.calls = []  # (signature, params)
+        self.orderNo = ""
+
+    @property
+    def connectState(self):
+        return 1
+
+    def isValidCode(self, code):
+        return True
+
+    def sendOrderAsync(self, handle):
+        Kiwoom.sendOrderAsync(self, handle, ackTimeout=self.ackTimeout)
+
+    def dynamicCall(self, signature, params):
+        self.calls.append((signature, params))
+        rqName, code = params[0], params[4]
+        action = self.script.get(code)
+        if action is None:
+            return 0
+
+        kind, value, latency = action
+
+        def respond():
+            if kind == "reject":
+                self.eventReceiveMsg("0000", rqName, self.ORDER_TR_CODE, value)
+                self.orderNo = ""
+            else:
+                self.orderNo = value
+            self.eventReceiveTrData("0000", rqName, self.ORDER_TR_CODE, "", "0")
+
+        QTimer.singleShot(latency, respond)
+        return 0
+
+    def getCommData(self, trCode, recordName, index, key):
+        return self.orderNo
+
+    @property
+    def sentOrders(self):
+        return [params for signature, params in self.calls if signature.startswith("SendOrder")]
+
+
+def orderSpec(code, qty=1, price=1000, orderType=1, originOrderNo="", rqName="order"):
+    return {
+        "rqName": rqName,
+        "scrNo": "0101",
+        "accNo": "8888888811",
+        "orderType": orderType,
+        "code": code,
+        "qty": qty,
+        "price": price,
+        "hogaType": "00",
+        "originOrderNo": originOrderNo,
+    }
+
+
+def submitted(orderNo, code, qty, price, gubun="+매수", originalOrderNo="", accNo="8888888811"):
+    record = ChejanRecord("orders_submitted", "2020-03-13", "접수")
+    record.ACCOUNT_NO = accNo
+    record.ORDER_NO = orderNo
+    record.TICKER = "A" + code
+    record.ORDER_GUBUN = gubun
+    record.ORDER_QTY = qty
+    record.ORDER_PRICE = price
+    record.UNEX_QTY = qty
+    record.ORIGINAL_ORDER_NO = originalOrderNo
+    return record
+
+
+class TestExecutor(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QCoreApplication.instance() or QCoreApplication([])
+
+    def testAckRoutedByRqName(self):
+        # 먼저 보낸 주문의 응답이 나중에 도착
+        kiwoom = FakeKiwoom({"005930": ("ack", "0000001", 200), "000660": ("ack", "0000002", 20)})
+        executor = Executor(kiwoom)
+
+        first = executor.submit(orderSpec("005930"))
+        second = executor.submit(orderSpec("000660"))
+        self.assertEqual(first.status, OrderHandle.SENT)
+        self.assertEqual(second.status, OrderHandle.SENT)
+        self.assertNotEqual(first.rqName, second.rqName)
+
+        self.assertEqual(second.result(timeout=1000)["orderNo"], "0000002")
+        self.assertFalse(first.done())
+        self.assertEqual(first.result(timeout=1000)["orderNo"], "0000001")
+        self.assertTrue(first.isAccepted and second.isAccepted)
+
+    def testRejectByMsg(self):
+        kiwoom = FakeKiwoom({"005930": ("reject", "[00Z218] 주문가능금액 부족", 10)})
+        executor = Executor(kiwoom)
+
+        called = []
+        handle = executor.submit(orderSpec("005930"), callback=called.append)
+        response = handle.result(timeout=1000)
+
+        self.assertEqual(response["status"], OrderHandle.REJECTED)
+        self.assertEqual(response["orderNo"], "")
+        self.assertIn("주문가능금액 부족", response["msg"])
+        self.assertEqual(called, [handle])
+
+    def testAckTimeout(self):
+        kiwoom = FakeKiwoom({}, ackTimeout=50)
+        executor = Executor(kiwoom)
+
+        handle = executor.submit(orderSpec("005930"))
+        handle.result(timeout=1000)
+
+        self.assertEqual(handle.status, OrderHandle.REJECTED)
+        self.assertIn("timeout", handle.msg)
+        self.assertNotIn(handle.rqName, kiwoom.orderHandles)
+
+    def testLateAck(self):
+        kiwoom = FakeKiwoom({"005930": ("ack", "0000001", 200)}, ackTimeout=50)
+        executor = Executor(kiwoom)
+
+        # 동기 주문(sendOrder)이 응답을 기다리는 중
+        kiwoom.orderResponse = {"orderNo": ""}
+
+        handle = executor.submit(orderSpec("005930"))
+        handle.result(timeout=1000)
+        self.assertEqual(handle.status, OrderHandle.REJECTED)
+        self.assertIn(handle.rqName, kiwoom.expiredOrderHandles)
+
+        loop = QEventLoop()
+        QTimer.singleShot(300, loop.exit)
+        loop.exec_()
+
+        # 늦게 도착한 주문번호는 동기 주문의 응답이 아닌 해당 handle에 반영
+        self.assertEqual(kiwoom.orderResponse, {"orderNo": ""})
+        self.assertEqual(handle.status, OrderHandle.ACCEPTED)
+        self.assertEqual(handle.orderNo, "0000001")
+        self.assertTrue(handle.isLateAck)
+        self.assertEqual(kiwoom.expiredOrderHandles, {})
+
+    def testLateAckWithoutSyncOrder(self):
+        kiwoom = FakeKiwoom({"005930": ("ack", "0000001", 100), "000660": ("ack", "", 100)}, ackTimeout=20)
+        executor = Executor(kiwoom)
+        accepted = executor.submit(orderSpec("005930"))
+        rejected = executor.submit(orderSpec("000660"))
+
+        loop = QEventLoop()
+        QTimer.singleShot(300, loop.exit)
+        loop.exec_()
+
+        self.assertFalse(hasattr(kiwoom, "orderResponse"))
+        self.assertTrue(accepted.isLateAck)
+        self.assertEqual(rejected.status, OrderHandle.REJECTED)
+        self.assertFalse(rejected.isLateAck)
+
+    def testSubmitBatchPriority(self):
+        script = {
+            "005930": ("ack", "0000001", 10),
+            "000660": ("reject", "[00Z112] 호가단위 오류", 10),
+            "035420": ("ack", "0000003", 10),
+        }
+        kiwoom = FakeKiwoom(script)
+        executor = Executor(kiwoom)
+
+        specs = [orderSpec("005930", qty=1), orderSpec("000660", qty=3), orderSpec("035420", qty=2)]
+        result = executor.submit_batch(specs, key=lambda spec: spec["qty"])
+        self.assertEqual([params[4] for params in kiwoom.sentOrders], ["000660", "035420", "005930"])
+
+        result.wait(timeout=1000)
+        self.assertTrue(result.done())
+        self.assertFalse(result.ok)
+        self.assertEqual(result.summary(), {"total": 3, "accepted": 2, "rejected": 1, "pending": 0})
+        self.assertEqual(list(result.errors.values()), ["[00Z112] 호가단위 오류"])
+        self.assertEqual([handle.orderNo for handle in result.accepted], ["0000001", "0000003"])
+
+    def testSubmitBatchInvalidSpec(self):
+        kiwoom = FakeKiwoom({"005930": ("ack", "0000001", 10)})
+        executor = Executor(kiwoom)
+
+        invalid = orderSpec("000660", qty="ten")
+        result = executor.submit_batch([orderSpec("005930"), invalid]).wait(timeout=1000)
+        self.assertEqual(result.summary()["rejected"], 1)
+        self.assertEqual(len(kiwoom.sentOrders), 1)
+
+    def testCoalesceQueuedAmends(self):
+        kiwoom = FakeKiwoom({"005930": ("ack", "0000002", 10)})
+        kiwoom.orderBook.apply(submitted("0000001", "005930", 10, 50000))
+        executor = Executor(kiwoom)
+
+        # 주문 제한(1초 5회)을 모두 사용하여 이후 주문은 대기
+        for _ in range(5):
+            executor.submit(orderSpec("000660"))
+        executor.submit(orderSpec("035420"), priority=5)
+
+        cancel = executor.cancel("0000001")
+        modify = executor.modify("0000001", 51000, priority=10)
+        self.assertIs(modify, cancel)
+        self.assertEqual(cancel.spec["orderType"], 3)
+        self.assertEqual(cancel.spec["price"], 0)
+
+        self.assertEqual(executor.coalescedCount, 1)
+        self.assertEqual(executor.pendingCount, 2)
+
+        # 합쳐진 취소 주문은 높은 우선순위(10)로 먼저 전송
+        cancel.result(timeout=2000)
+        codes = [params[4] for params in kiwoom.sentOrders[5:]]
+        self.assertEqual(codes[0], "005930")
+
+    def testCancelAllFromOrderBook(self):
+        kiwoom = FakeKiwoom({"005930": ("ack", "0000010", 10), "000660": ("ack", "0000011", 10)})
+        book = kiwoom.orderBook
+        book.apply(submitted("0000001", "005930", 10, 50000))
+        book.apply(submitted("0000002", "000660", 5, 200000, gubun="-매도"))
+        book.apply(submitted("0000003", "035420", 1, 300000))
+        book.apply(submitted("0000004", "035420", 1, 300000, gubun="매수취소", originalOrderNo="0000003"))
+        book.apply(submitted("0000005", "035720", 1, 10000, accNo="8888888821"))
+
+        result = Executor(kiwoom).cancel_all("8888888811").wait(timeout=1000)
+
+        # 취소 주문이 대기 중인 주문과 다른 계좌의 주문은 제외, 미체결 금액이 큰 주문부터 취소
+        sent = kiwoom.sentOrders
+        self.assertEqual([params[8] for params in sent], ["0000002", "0000001"])
+        self.assertEqual([params[3] for params in sent], [4, 3])
+        self.assertEqual([params[5] for params in sent], [5, 10])
+        self.assertTrue(result.ok)
+
+        # OPT10075 등 TR 조회 없이 SendOrder만 호출
+        self.assertEqual(len(kiwoom.calls), len(sent))
+
+
+if __name__ == "__main__":
+    unittest.main()
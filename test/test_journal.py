@@ -0,0 +1,120 @@
+from datetime import datetime as dt
+import os
+import shutil
+import tempfile
+import time
+import unittest
+
+from kiwoom_api.api.journal import JournalReader, OrderJournal
+
+
+class TestOrderJournal(unittest.TestCase):
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+        self.date = dt.now().strftime("%Y%m%d")
+
+    def tearDown(self):
+        shutil.rmtree(self.path)
+
+    def testWriteAndRead(self):
+        journal = OrderJournal(self.path, fsync="always")
+        for i in range(1000):
+            table = "orders_executed" if i % 2 else "orders_submitted"
+            journal.write(table, {"ORDER_NO": str(i), "NAME": "삼성전자"})
+        journal.close()
+
+        reader = JournalReader(self.path)
+        records = list(reader.iterRecords(self.date))
+        self.assertEqual(len(records), 1000)
+        self.assertEqual([r["SEQ"] for r in records], list(range(1, 1001)))
+        self.assertEqual(records[0]["NAME"], "삼성전자")
+
+        executed = list(reader.iterRecords(self.date, tables=["orders_executed"]))
+        self.assertEqual(len(executed), 500)
+        self.assertTrue(all(r["TABLE"] == "orders_executed" for r in executed))
+
+    def testAppendContinuesSequence(self):
+        journal = OrderJournal(self.path, fsync="never")
+        journal.write("orders_submitted", {"ORDER_NO": "1"})
+        journal.close()
+
+        journal = OrderJournal(self.path, fsync="never")
+        journal.write("orders_submitted", {"ORDER_NO": "2"})
+        self.assertTrue(journal.flush(timeout=5))
+        journal.close()
+
+        records = list(JournalReader(self.path).iterRecords(self.date))
+        self.assertEqual([r["SEQ"] for r in records], [1, 2])
+
+    def testReadFromOffset(self):
+        journal = OrderJournal(self.path)
+        for i in range(10):
+            journal.write("orders_submitted", {"ORDER_NO": str(i)})
+        journal.close()
+
+        reader = JournalReader(self.path)
+        offsets = [pos for pos, _ in reader.iterRecordsWithOffset(self.date)]
+        tail = list(reader.iterRecords(self.date, offset=offsets[4]))
+        self.assertEqual([r["ORDER_NO"] for r in tail], [str(i) for i in range(5, 10)])
+
+    def testRetryOpenFailure(self):
+        journal = OrderJournal(self.path, fsync="never", flushInterval=0.01)
+        open_ = journal._OrderJournal__open
+        failures = []
+
+        def failingOpen(date):
+            if not failures:
+                failures.append(date)
+                raise OSError("disk busy")
+            return open_(date)
+
+        journal._OrderJournal__open = failingOpen
+        for i in range(100):
+            journal.write("orders_submitted", {"ORDER_NO": str(i)})
+        self.assertTrue(journal.flush(timeout=5))
+        journal.close()
+
+        self.assertEqual(len(failures), 1)
+        records = list(JournalReader(self.path).iterRecords(self.date))
+        self.assertEqual([r["ORDER_NO"] for r in records], [str(i) for i in range(100)])
+
+    def testDropAfterRetriesOnClose(self):
+        journal = OrderJournal(self.path, flushInterval=0.001, maxRetries=2, maxBackoff=0.01)
+
+        def failingOpen(date):
+            raise OSError("disk full")
+
+        journal._OrderJournal__open = failingOpen
+        journal.write("orders_submitted", {"ORDER_NO": "1"})
+        self.assertFalse(journal.flush(timeout=0.05))
+        journal.close()
+        self.assertEqual(list(JournalReader(self.path).iterRecords(self.date)), [])
+
+    def testFlushReturnsAfterRetries(self):
+        journal = OrderJournal(self.path, flushInterval=0.001, maxRetries=2, maxBackoff=0.01)
+        open_ = journal._OrderJournal__open
+        failing = [True]
+
+        def failingOpen(date):
+            if failing[0]:
+                raise OSError("disk full")
+            return open_(date)
+
+        journal._OrderJournal__open = failingOpen
+        journal.write("orders_submitted", {"ORDER_NO": "1"})
+        self.assertFalse(journal.flush())
+
+        # 재시도는 계속되므로 파일을 열 수 있게 되면 기록
+        failing[0] = False
+        time.sleep(0.05)
+        self.assertTrue(journal.flush(timeout=5))
+        journal.close()
+        self.assertEqual(len(list(JournalReader(self.path).iterRecords(self.date))), 1)
+
+    def testInvalidFsyncPolicy(self):
+        with self.assertRaises(Exception):
+            OrderJournal(os.path.join(self.path, "x"), fsync="sometimes")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,50 @@
+import unittest
+
+from kiwoom_api.api.latency import LatencyHistogram, LatencyRecorder
+
+
+class TestLatencyHistogram(unittest.TestCase):
+    def testPercentile(self):
+        histogram = LatencyHistogram()
+        for value in range(1, 10001):
+            histogram.record(value)
+
+        self.assertEqual(histogram.count, 10000)
+        self.assertEqual(histogram.min, 1)
+        self.assertEqual(histogram.max, 10000)
+        for p in (50, 90, 99):
+            expected = p * 100
+            self.assertAlmostEqual(histogram.percentile(p), expected, delta=expected * 0.02)
+
+    def testMergeAndSerialize(self):
+        a, b = LatencyHistogram(), LatencyHistogram()
+        a.record(100)
+        b.record(1000000)
+        a.merge(b)
+
+        restored = LatencyHistogram.fromDict(a.toDict())
+        self.assertEqual(restored.count, 2)
+        self.assertEqual(restored.max, 1000000)
+        self.assertEqual(restored.percentile(100), 1000000)
+
+
+class TestLatencyRecorder(unittest.TestCase):
+    def testStages(self):
+        recorder = LatencyRecorder()
+        recorder.start("buy#1", "00")
+        recorder.stamp("buy#1", "release")
+        recorder.stamp("buy#1", "sent")
+        recorder.ack("buy#1", "0000001")
+
+        report = recorder.report()
+        self.assertEqual(set(report), {"release", "sent", "ack"})
+        self.assertEqual(report["ack"]["00"]["count"], 1)
+        self.assertEqual(report["ack"]["ALL"]["count"], 1)
+
+        recorder.discard("buy#1")
+        recorder.stamp("buy#1", "completed")
+        self.assertNotIn("completed", recorder.report())
+
+
+if __name__ == "__main__":
+    unittest.main()
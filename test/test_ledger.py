@@ -0,0 +1,151 @@
+import unittest
+
+from kiwoom_api.api.chejan import BalanceRecord
+from kiwoom_api.api.data_feeder import DataFeeder
+from kiwoom_api.api.ledger import PositionLedger
+
+
+def makeRecord(**kwargs):
+    record = BalanceRecord("balance", "2020-03-13")
+    record.ACCOUNT_NO = "8888888811"
+    for k, v in kwargs.items():
+        setattr(record, k, v)
+    return record
+
+
+class TestPositionLedger(unittest.TestCase):
+    def setUp(self):
+        self.accNo = "8888888811"
+        self.ledger = PositionLedger()
+        self.ledger.seed(
+            self.accNo,
+            {
+                "싱글데이터": {"예수금": "1,200,000", "D+2추정예수금": "1,000,000"},
+                "멀티데이터": [
+                    {
+                        "종목코드": "A005930",
+                        "종목명": "삼성전자",
+                        "보유수량": "10",
+                        "평균단가": "50000",
+                        "현재가": "51000",
+                        "매입금액": "500000",
+                    }
+                ],
+            },
+        )
+
+    def testSeed(self):
+        self.assertTrue(self.ledger.isSynced(self.accNo))
+        self.assertEqual(self.ledger.getDeposit(self.accNo), 1000000)
+        self.assertEqual(self.ledger.getCodes(self.accNo), ["005930"])
+        self.assertEqual(self.ledger.getQty(self.accNo, "005930"), 10)
+
+    def testApplyBalanceEvents(self):
+        ledger = self.ledger
+        ledger.apply(
+            makeRecord(
+                TICKER="A000660",
+                NAME="SK하이닉스",
+                HOLDING_QTY=3,
+                AVG_PRICE=90000,
+                TOTAL_BUY_PRICE=270000,
+                CUR_PRICE=91000,
+                DEPOSIT=730000,
+            )
+        )
+        self.assertEqual(sorted(ledger.getCodes(self.accNo)), ["000660", "005930"])
+        self.assertEqual(ledger.getCashDeposit(self.accNo), 730000)
+
+        ledger.apply(makeRecord(TICKER="A005930", HOLDING_QTY=0, DEPOSIT=1240000))
+        self.assertEqual(ledger.getCodes(self.accNo), ["000660"])
+        self.assertIsNone(ledger.getPosition(self.accNo, "005930"))
+
+    def testDepositSeparatedFromEstimate(self):
+        ledger = self.ledger
+        self.assertEqual(ledger.getCashDeposit(self.accNo), 1200000)
+
+        # 잔고통보의 예수금(D+0)은 D+2추정예수금과 다름
+        ledger.apply(makeRecord(TICKER="A005930", HOLDING_QTY=5, DEPOSIT=1455000))
+        self.assertEqual(ledger.getCashDeposit(self.accNo), 1455000)
+        self.assertEqual(ledger.getDeposit(self.accNo), 1000000)
+
+        restored = type(ledger)()
+        restored.restore(ledger.snapshot())
+        self.assertEqual(restored.getCashDeposit(self.accNo), 1455000)
+        self.assertEqual(restored.getDeposit(self.accNo), 1000000)
+
+        ledger.seed(self.accNo, {"싱글데이터": {"예수금": "1,455,000", "D+2추정예수금": "1,255,000"}})
+        self.assertEqual(ledger.getDeposit(self.accNo), 1255000)
+
+    def testIsFresh(self):
+        ledger = self.ledger
+        self.assertTrue(ledger.isFresh(self.accNo, 1000))
+        ledger.account(self.accNo).syncedTime -= 2
+        self.assertFalse(ledger.isFresh(self.accNo, 1000))
+        self.assertFalse(ledger.isFresh("8888888821", 1000))
+
+        # 복원한 값은 최신 여부를 알 수 없음
+        restored = type(ledger)()
+        restored.restore(ledger.snapshot())
+        self.assertFalse(restored.isFresh(self.accNo, 60000))
+
+    def testPortfolio(self):
+        frame = self.ledger.portfolio(self.accNo)
+        self.assertEqual(list(frame.index), ["005930"])
+        self.assertEqual(frame.loc["005930", "evalAmount"], 510000)
+        self.assertEqual(frame.loc["005930", "pnl"], 10000)
+        self.assertAlmostEqual(frame["weight"].sum(), 1.0)
+
+
+class FakeKiwoom:
+    """ OPW00004 조회 횟수를 세는 Kiwoom 대용 """
+
+    def __init__(self, estimatedDeposit):
+        self.ledger = PositionLedger()
+        self.estimatedDeposit = estimatedDeposit
+        self.requested = []
+
+    def setInputValue(self, key, value):
+        pass
+
+    def commRqData(self, rqName, trCode, inquiry, scrNo):
+        self.requested.append(trCode)
+        self.OPW00004 = {
+            "싱글데이터": {"예수금": "1,000,000", "D+2추정예수금": self.estimatedDeposit},
+            "멀티데이터": [],
+        }
+
+
+class TestGetDeposit(unittest.TestCase):
+    def testRequestEveryCall(self):
+        kiwoom = FakeKiwoom("800,000")
+        feeder = DataFeeder(kiwoom)
+        self.assertEqual(feeder.getDeposit("8888888811"), 800000)
+
+        # 체결로 D+2추정예수금이 바뀌어도 잔고통보에는 포함되지 않으므로 다시 조회
+        kiwoom.estimatedDeposit = "300,000"
+        self.assertEqual(feeder.getDeposit("8888888811"), 300000)
+        self.assertEqual(kiwoom.requested, ["OPW00004", "OPW00004"])
+
+    def testMaxAge(self):
+        kiwoom = FakeKiwoom("800,000")
+        feeder = DataFeeder(kiwoom)
+        self.assertEqual(feeder.getDeposit("8888888811", maxAge=60000), 800000)
+        kiwoom.estimatedDeposit = "300,000"
+        self.assertEqual(feeder.getDeposit("8888888811", maxAge=60000), 800000)
+        self.assertEqual(len(kiwoom.requested), 1)
+
+        kiwoom.ledger.account("8888888811").syncedTime -= 61
+        self.assertEqual(feeder.getDeposit("8888888811", maxAge=60000), 300000)
+        self.assertEqual(len(kiwoom.requested), 2)
+
+    def testAccountDictDoesNotSeedLedger(self):
+        kiwoom = FakeKiwoom("800,000")
+        feeder = DataFeeder(kiwoom)
+        self.assertEqual(feeder.getAccountDict("8888888811")["D+2추정예수금"], "800,000")
+        self.assertEqual(feeder.getInventoryDict("8888888811"), [])
+        self.assertFalse(kiwoom.ledger.isSynced("8888888811"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,92 @@
+from datetime import datetime as dt
+import logging
+import os
+import shutil
+import tempfile
+import unittest
+
+from kiwoom_api.api._logger import Logger
+
+
+class Counted:
+    """ 문자열로 변환된 횟수를 기록 """
+
+    count = 0
+
+    def __repr__(self):
+        Counted.count += 1
+        return "counted"
+
+    __str__ = __repr__
+
+
+class TestLogger(unittest.TestCase):
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+        Counted.count = 0
+
+    def tearDown(self):
+        shutil.rmtree(self.path)
+
+    def read(self, logger):
+        logger.close()
+        fileName = "{}.txt".format(dt.now().strftime("%Y%m%d"))
+        with open(os.path.join(self.path, "log", fileName)) as f:
+            return f.read()
+
+    def testLazyFormat(self):
+        logger = Logger(os.path.join(self.path, "log"), name="test_logger_lazy", level=logging.INFO)
+
+        # level 이하의 호출은 format 하지 않음
+        logger.debug("{} debug", Counted())
+        logger.debug({"value": Counted()})
+        self.assertEqual(Counted.count, 0)
+
+        logger.info("{}  commRqData {}", "now", "OPT10001")
+        logger.info({"TIME": dt(2020, 3, 13, 9, 0, 0, 1), "BASC_DT": dt(2020, 3, 13).date()})
+        logger.info([1, 2], pretty=False)
+
+        lines = self.read(logger).splitlines()
+        self.assertEqual(lines[0], "now  commRqData OPT10001")
+        self.assertEqual(lines[1], "{'BASC_DT': '2020-03-13', 'TIME': '2020-03-13 09:00:00.000001'}")
+        self.assertEqual(lines[2], "[1, 2]")
+        self.assertEqual(Counted.count, 0)
+
+    def testPositionalPretty(self):
+        logger = Logger(os.path.join(self.path, "log"), name="test_logger_pretty")
+
+        # 이전 signature (msg, pretty)로 호출
+        with self.assertWarns(DeprecationWarning):
+            logger.debug({"value": 1}, False)
+        with self.assertWarns(DeprecationWarning):
+            logger.info("{}", True)
+        logger.info("{} {}", True, False)
+
+        lines = self.read(logger).splitlines()
+        self.assertEqual(lines, ["{'value': 1}", "{}", "True False"])
+
+    def testBackgroundFormat(self):
+        logger = Logger(os.path.join(self.path, "log"), name="test_logger_background")
+        logger.debug("{}", Counted())
+
+        self.assertIn("counted", self.read(logger))
+        self.assertEqual(Counted.count, 1)
+
+    def testReplaceLogger(self):
+        first = Logger(os.path.join(self.path, "first"), name="test_logger_replace")
+        listener = first._Logger__listener
+        second = Logger(os.path.join(self.path, "log"), name="test_logger_replace")
+
+        # 이전 listener thread는 종료되고, 새 Logger의 handler만 남음
+        self.assertIsNone(first._Logger__listener)
+        self.assertFalse(listener._thread)
+        handlers = logging.getLogger("test_logger_replace").handlers
+        self.assertEqual(handlers, [second._Logger__queueHandler])
+
+        second.info("replaced")
+        self.assertIn("replaced", self.read(second))
+        self.assertEqual(logging.getLogger("test_logger_replace").handlers, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,156 @@
+import unittest
+
+from kiwoom_api.api.chejan import ChejanRecord
+from kiwoom_api.api.order_book import OrderBook, OrderStatus
+
+
+def makeRecord(status, orderNo, **kwargs):
+    table = {"접수": "orders_submitted", "체결": "orders_executed", "확인": "orders_cancelled"}
+    record = ChejanRecord(table[status], "2020-03-13", status)
+    record.ACCOUNT_NO = "8888888811"
+    record.ORDER_NO = orderNo
+    record.TICKER = "A005930"
+    record.ORDER_GUBUN = "+매수"
+    for k, v in kwargs.items():
+        setattr(record, k, v)
+    return record
+
+
+class TestOrderBook(unittest.TestCase):
+    def setUp(self):
+        self.book = OrderBook()
+
+    def testPartialThenFilled(self):
+        book = self.book
+        book.apply(makeRecord("접수", "0000001", ORDER_QTY=10, ORDER_PRICE=50000, UNEX_QTY=10))
+        self.assertEqual(book.remainingQty("0000001"), 10)
+        self.assertTrue(book.hasOpenOrders("005930"))
+
+        book.apply(makeRecord("체결", "0000001", UNEX_QTY=4, TRAN_NO="1", TRAN_QTY=6, TRAN_PRICE=50000))
+        order = book.getOrder("0000001")
+        self.assertEqual(order.status, OrderStatus.PARTIAL)
+        self.assertEqual(book.remainingQty("0000001"), 4)
+
+        book.apply(makeRecord("체결", "0000001", UNEX_QTY=0, TRAN_NO="2", TRAN_QTY=4, TRAN_PRICE=50100))
+        self.assertEqual(order.status, OrderStatus.FILLED)
+        self.assertAlmostEqual(book.avgFillPrice("0000001"), 50040)
+        self.assertEqual(book.getOpenOrders(), [])
+        self.assertFalse(book.hasOpenOrders("005930"))
+
+    def testDuplicatedExecutionIgnored(self):
+        book = self.book
+        book.apply(makeRecord("접수", "0000001", ORDER_QTY=10, UNEX_QTY=10))
+        executed = makeRecord("체결", "0000001", UNEX_QTY=5, TRAN_NO="1", TRAN_QTY=5, TRAN_PRICE=100)
+        book.apply(executed)
+        book.apply(executed)
+        self.assertEqual(book.getOrder("0000001").filledQty, 5)
+
+    def testCancel(self):
+        book = self.book
+        book.apply(makeRecord("접수", "0000001", ORDER_QTY=10, UNEX_QTY=10))
+        book.apply(makeRecord("체결", "0000001", UNEX_QTY=7, TRAN_NO="1", TRAN_QTY=3, TRAN_PRICE=100))
+
+        cancel = {"ORDER_GUBUN": "매수취소", "ORIGINAL_ORDER_NO": "0000001", "ORDER_QTY": 7}
+        book.apply(makeRecord("접수", "0000002", **cancel))
+        self.assertEqual(book.getOrder("0000002").status, OrderStatus.PENDING)
+        self.assertEqual(book.remainingQty("0000001"), 7)
+
+        book.apply(makeRecord("확인", "0000002", **cancel))
+        self.assertEqual(book.getOrder("0000001").status, OrderStatus.CANCELLED)
+        self.assertEqual(book.getOrder("0000002").status, OrderStatus.CONFIRMED)
+        self.assertEqual([o.orderNo for o in book.getChildOrders("0000001")], ["0000002"])
+        self.assertEqual(book.getOpenOrders(), [])
+
+    def testModify(self):
+        book = self.book
+        book.apply(makeRecord("접수", "0000001", ORDER_QTY=10, ORDER_PRICE=100, UNEX_QTY=10))
+
+        modify = {
+            "ORDER_GUBUN": "매수정정",
+            "ORIGINAL_ORDER_NO": "0000001",
+            "ORDER_QTY": 10,
+            "ORDER_PRICE": 105,
+        }
+        book.apply(makeRecord("접수", "0000002", **modify))
+        book.apply(makeRecord("확인", "0000002", **modify))
+
+        self.assertEqual(book.getOrder("0000001").status, OrderStatus.REPLACED)
+        self.assertEqual([o.orderNo for o in book.getOpenOrders()], ["0000002"])
+        self.assertEqual(book.remainingQty("0000002"), 10)
+
+    def testReconcile(self):
+        book = self.book
+        book.apply(makeRecord("접수", "0000001", ORDER_QTY=10, UNEX_QTY=10))
+        unExOrders = [
+            {
+                "계좌번호": "8888888811",
+                "주문번호": "0000009",
+                "종목코드": "000660",
+                "주문구분": "-매도",
+                "주문수량": "5",
+                "주문가격": "90000",
+                "미체결수량": "5",
+            }
+        ]
+
+        result = book.reconcile(unExOrders, accNo="8888888811")
+        self.assertEqual(result, {"added": ["0000009"], "closed": ["0000001"]})
+        self.assertEqual(book.getOrder("0000001").status, OrderStatus.CLOSED)
+        self.assertEqual(book.getOpenOrders(code="000660")[0].side, "매도")
+
+    def testReconcileHistory(self):
+        book = self.book
+        book.apply(makeRecord("접수", "0000001", ORDER_QTY=10, ORDER_PRICE=100, UNEX_QTY=10))
+        book.apply(makeRecord("접수", "0000002", ORDER_QTY=5, ORDER_PRICE=100, UNEX_QTY=5))
+        orderRows = [
+            {
+                "주문번호": "0000001",
+                "종목번호": "A005930",
+                "주문구분": "현금매수",
+                "주문수량": "10",
+                "주문단가": "100",
+                "체결수량": "10",
+                "체결단가": "100",
+                "주문잔량": "0",
+                "원주문": "0000000",
+            },
+            {
+                "주문번호": "0000003",
+                "종목번호": "A000660",
+                "주문구분": "현금매도",
+                "주문수량": "3",
+                "주문단가": "90000",
+                "체결수량": "1",
+                "체결단가": "90000",
+                "주문잔량": "2",
+                "원주문": "0000000",
+            },
+        ]
+
+        result = book.reconcileHistory(orderRows, accNo="8888888811", closeMissing=True)
+        self.assertEqual(
+            result, {"added": ["0000003"], "updated": ["0000001"], "closed": ["0000002"]}
+        )
+        self.assertEqual(book.getOrder("0000001").status, OrderStatus.FILLED)
+        self.assertEqual(book.getOrder("0000003").status, OrderStatus.PARTIAL)
+        self.assertEqual(book.remainingQty("0000003"), 2)
+
+        # 같은 내역으로 다시 맞추면 변경 없음
+        result = book.reconcileHistory(orderRows, accNo="8888888811")
+        self.assertEqual(result, {"added": [], "updated": [], "closed": []})
+
+    def testSnapshotRestore(self):
+        book = self.book
+        book.apply(makeRecord("접수", "0000001", ORDER_QTY=10, UNEX_QTY=10))
+        book.apply(makeRecord("접수", "0000002", ORDER_QTY=10, UNEX_QTY=10))
+        book.apply(makeRecord("체결", "0000002", UNEX_QTY=0, TRAN_NO="1", TRAN_QTY=10, TRAN_PRICE=100))
+
+        restored = OrderBook()
+        restored.restore(book.snapshot())
+        self.assertEqual(len(restored), 2)
+        self.assertEqual([o.orderNo for o in restored.getOpenOrders(code="005930")], ["0000001"])
+        self.assertEqual(restored.avgFillPrice("0000002"), 100)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,256 @@
+import logging
+import time
+import unittest
+
+from PyQt5.QtCore import QCoreApplication, QEventLoop, QTimer
+
+from kiwoom_api.api.data_feeder import DataFeeder
+from kiwoom_api.api.kiwoom import APIDelayCheck, Kiwoom
+from kiwoom_api.api.pipeline import RequestPipeline
+from kiwoom_api.api.return_codes import TRKeys
+
+
+class FakeKiwoom:
+    """ 요청 후 latency(ms) 뒤에 응답하는 Kiwoom 대용 """
+
+    def __init__(self, latency):
+        self.latency = latency
+        self.logger = logging.getLogger("test_pipeline")
+        self.requestDelayCheck = APIDelayCheck(logger=self.logger)
+        self.trHandlers = {}
+        self.sent = []
+
+    def send(self, value, rqName, scrNo, callback):
+        self.sent.append((time.time(), rqName, scrNo))
+        self.trHandlers[rqName] = callback
+        if value is None:  # 응답 없음
+            return
+
+        def respond():
+            handler = self.trHandlers.pop(rqName, None)
+            if handler is not None:
+                handler({"value": value}, 0)
+
+        QTimer.singleShot(self.latency, respond)
+
+
+class FakeEventKiwoom(FakeKiwoom):
+    """ 응답 처리에 Kiwoom.eventReceiveTrData를 그대로 사용하는 Kiwoom 대용 """
+
+    eventReceiveTrData = Kiwoom.eventReceiveTrData
+
+    def __init__(self):
+        super().__init__(latency=0)
+        self.responses = {}  # rqName: data
+
+    def _Kiwoom__getData(self, trCode, rqName):
+        return self.responses[rqName]
+
+    def respond(self, rqName, data, latency):
+        self.responses[rqName] = data
+        QTimer.singleShot(
+            latency, lambda: self.eventReceiveTrData("0101", rqName, "OPT10001", "", "0")
+        )
+
+
+class FakeAccountKiwoom(FakeKiwoom):
+    """ 계좌별로 latency가 다른 commRqDataAsync """
+
+    accNos = ["8000000011", "8000000021", "8000000031"]
+
+    def __init__(self):
+        super().__init__(latency=0)
+        self.inputs = {}
+
+    def setInputValue(self, key, value):
+        self.inputs[key] = value
+
+    def commRqDataAsync(self, rqName, trCode, inquiry, scrNo, callback):
+        accNo = self.inputs["계좌번호"]
+        self.latency = 300 - 100 * self.accNos.index(accNo)
+        self.send({"trCode": trCode, "계좌번호": accNo}, rqName, scrNo, callback)
+
+
+class FakeSnapshotKiwoom(FakeKiwoom):
+    """ OPTKWFID 요청에 종목별 행을 역순으로 응답, noResponse 종목이 포함된 요청은 응답 없음 """
+
+    def __init__(self, noResponse=()):
+        super().__init__(latency=10)
+        self.noResponse = set(noResponse)
+        self.requested = []
+        self.disconnected = []
+
+    def commKwRqDataAsync(self, arrCode, codeCount, rqName, scrNo, callback, typeFlag=0):
+        codes = arrCode.split(";")
+        self.requested.append(codes)
+        if self.noResponse & set(codes):
+            self.send(None, rqName, scrNo, callback)
+            return
+
+        columns = TRKeys.OPTKWFID["멀티데이터"]
+        rows = []
+        for code in reversed(codes):
+            row = dict.fromkeys(columns, "")
+            row.update(
+                {
+                    "종목코드": code,
+                    "종목명": " 종목{} ".format(code),
+                    "현재가": "-{}".format(code.lstrip("0")),
+                    "거래량": " 1000",
+                }
+            )
+            rows.append(row)
+        self.send(None, rqName, scrNo, callback)
+        QTimer.singleShot(self.latency, lambda: self.trHandlers.pop(rqName)({"멀티데이터": rows}, 0))
+
+    def disconnectRealData(self, scrNo):
+        self.disconnected.append(scrNo)
+
+
+class TestRequestPipeline(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QCoreApplication.instance() or QCoreApplication([])
+
+    def testPipelined(self):
+        kiwoom = FakeKiwoom(latency=300)
+        pipeline = RequestPipeline(kiwoom)
+        for value in range(5):
+            pipeline.add(lambda *args, value=value: kiwoom.send(value, *args))
+
+        start = time.time()
+        results = pipeline.run()
+        elapsed = time.time() - start
+
+        # 응답을 기다리지 않고 전송하므로 5회의 latency가 누적되지 않음
+        self.assertEqual([r["value"] for r in results], list(range(5)))
+        self.assertLess(elapsed, 1.0)
+        self.assertEqual(len({rqName for _, rqName, _ in kiwoom.sent}), 5)
+        self.assertEqual(len(pipeline.usedScrNos), 5)
+        self.assertEqual(pipeline.errors, {})
+
+    def testRateLimit(self):
+        kiwoom = FakeKiwoom(latency=10)
+        pipeline = RequestPipeline(kiwoom)
+        for value in range(7):
+            pipeline.add(lambda *args, value=value: kiwoom.send(value, *args))
+        pipeline.run()
+
+        # 1초 5회 제한
+        times = [t for t, _, _ in kiwoom.sent]
+        self.assertGreaterEqual(times[5] - times[0], 1.0)
+
+    def testTimeout(self):
+        kiwoom = FakeKiwoom(latency=10)
+        pipeline = RequestPipeline(kiwoom, timeout=200)
+        pipeline.add(lambda *args: kiwoom.send(1, *args))
+        pipeline.add(lambda *args: kiwoom.send(None, *args))
+
+        results = pipeline.run()
+        self.assertEqual(results[0], {"value": 1})
+        self.assertIsNone(results[1])
+        self.assertEqual(pipeline.errors, {1: "timeout"})
+
+        # timeout된 요청의 handler는 응답을 버리는 handler로 대체
+        rqName = kiwoom.sent[1][1]
+        kiwoom.trHandlers.pop(rqName)({"value": 2}, 0)
+        self.assertIsNone(pipeline.results[1])
+        self.assertEqual(kiwoom.trHandlers, {})
+
+    def testLateResponseDuringSyncRequest(self):
+        kiwoom = FakeEventKiwoom()
+        pipeline = RequestPipeline(kiwoom, timeout=50)
+        pipeline.add(lambda *args: kiwoom.send(None, *args))
+        pipeline.run()
+        self.assertEqual(pipeline.errors, {0: "timeout"})
+
+        # 동기 요청(commRqData)이 응답을 기다리는 중에 timeout된 요청의 응답이 먼저 도착
+        lateRqName = kiwoom.sent[0][1]
+        kiwoom.respond(lateRqName, {"late": True}, 20)
+        kiwoom.respond("sync", {"late": False}, 150)
+
+        kiwoom.requestLoop = QEventLoop()
+        start = time.time()
+        kiwoom.requestLoop.exec_()
+
+        self.assertGreaterEqual(time.time() - start, 0.1)
+        self.assertEqual(kiwoom.OPT10001, {"late": False})
+        self.assertNotIn(lateRqName, kiwoom.trHandlers)
+
+
+class TestForAccounts(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QCoreApplication.instance() or QCoreApplication([])
+
+    def testFanOut(self):
+        kiwoom = FakeAccountKiwoom()
+        arrived = []
+
+        start = time.time()
+        results = DataFeeder(kiwoom).forAccounts(
+            None, "OPW00001", callback=lambda accNo, data: arrived.append(accNo), 조회구분="2"
+        )
+        elapsed = time.time() - start
+
+        # 계좌별 요청을 동시에 전송하고, 응답이 먼저 도착한 계좌부터 전달
+        self.assertLess(elapsed, 0.6)
+        self.assertEqual(arrived, kiwoom.accNos[::-1])
+        self.assertEqual(list(results), kiwoom.accNos)
+        self.assertEqual(results["8000000021"]["value"]["계좌번호"], "8000000021")
+        self.assertEqual(len({scrNo for _, _, scrNo in kiwoom.sent}), 3)
+
+
+    def testCallbackError(self):
+        kiwoom = FakeAccountKiwoom()
+
+        def callback(accNo, data):
+            if accNo == "8000000021":
+                raise ValueError(accNo)
+
+        with self.assertLogs("test_pipeline", level="ERROR") as logs:
+            results = DataFeeder(kiwoom).forAccounts(None, "OPW00001", callback=callback)
+
+        # callback에서 예외가 발생한 계좌도 응답은 반환
+        self.assertTrue(all(results[accNo] is not None for accNo in kiwoom.accNos))
+        self.assertEqual(len(logs.output), 1)
+        self.assertIn("8000000021", logs.output[0])
+
+
+class TestSnapshot(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QCoreApplication.instance() or QCoreApplication([])
+
+    def testChunkedSnapshot(self):
+        codes = ["{:06d}".format(i) for i in range(1, 251)]
+        # "A" prefix, 공백, 중복된 종목코드
+        requested = ["A" + code if i % 3 == 0 else code for i, code in enumerate(codes)]
+        requested += [" {} ".format(code) for code in codes[:20]]
+
+        kiwoom = FakeSnapshotKiwoom(noResponse=["000150"])
+        df = DataFeeder(kiwoom).snapshot(requested, timeout=300)
+
+        # 중복 제거 후 100종목씩 3회 요청
+        self.assertEqual([len(chunk) for chunk in kiwoom.requested], [100, 100, 50])
+        self.assertEqual(sum(kiwoom.requested, []), codes)
+        self.assertEqual(len(kiwoom.disconnected), 3)
+
+        # 응답이 없는 요청의 종목은 제외, 요청한 순서로 정렬
+        expected = codes[:100] + codes[200:]
+        self.assertEqual(list(df.index), expected)
+        self.assertEqual(df.loc["000003", "종목명"], "종목000003")
+        self.assertEqual(df.loc["000003", "현재가"], 3)
+        self.assertTrue((df["현재가"] > 0).all())
+        self.assertEqual(df["거래량"].dtype.kind, "i")
+        self.assertTrue(df["시가"].isna().all())
+
+    def testEmptySnapshot(self):
+        kiwoom = FakeSnapshotKiwoom(noResponse=["005930"])
+        df = DataFeeder(kiwoom).snapshot("005930", timeout=100)
+        self.assertTrue(df.empty)
+        self.assertEqual(df.index.name, "종목코드")
+
+
+if __name__ == "__main__":
+    unittest.main()
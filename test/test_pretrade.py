@@ -0,0 +1,81 @@
+import unittest
+
+from kiwoom_api.api.pretrade import PreTradeTable
+
+
+def makeSpec(code, price, qty=1, orderType=1, hogaType="00"):
+    return {
+        "code": code,
+        "orderType": orderType,
+        "qty": qty,
+        "price": price,
+        "hogaType": hogaType,
+    }
+
+
+class TestPreTradeTable(unittest.TestCase):
+    def setUp(self):
+        codes = ["069500", "005930", "035720", "000040", "000020"]
+        markets = ["ETF", "KOSPI", "KOSDAQ", "KOSPI", "KOSPI"]
+        states = {
+            "000040": ["증거금100%", "관리종목"],
+            "000020": ["증거금100%", "거래정지"],
+        }
+        quotes = {
+            "069500": {"상한가": "+39,000", "하한가": "-21,000", "기준가": "30000"},
+            "005930": {"상한가": "+65,000", "하한가": "-35,000", "기준가": "50000"},
+            "035720": {"상한가": "+13,000", "하한가": "-7,000", "기준가": "10000"},
+            "000040": {"상한가": "+1,300", "하한가": "-700", "기준가": "1000"},
+            "000020": {"상한가": "+13,000", "하한가": "-7,000", "기준가": "10000"},
+        }
+        self.table = PreTradeTable().build(codes, markets, states, quotes)
+
+    def testLookup(self):
+        table = self.table
+        self.assertTrue(table.isLoaded)
+        self.assertIn("A005930", table)
+        self.assertEqual(table.getMarket("035720"), "KOSDAQ")
+        self.assertEqual(table.getPriceLimit("005930"), (35000, 65000))
+        self.assertTrue(table.hasIssue("000040"))
+        self.assertFalse(table.hasIssue("005930"))
+
+    def testCheck(self):
+        check = self.table.check
+        self.assertEqual(check(makeSpec("005930", 50100)), "")
+        self.assertEqual(check(makeSpec("005930", 50050)), "호가단위 오류")
+        self.assertEqual(check(makeSpec("005930", 65100)), "상한가 초과")
+        self.assertEqual(check(makeSpec("005930", 34900)), "하한가 미만")
+        self.assertEqual(check(makeSpec("005930", 0, hogaType="03")), "")
+        self.assertEqual(check(makeSpec("999999", 1000)), "종목코드 없음")
+        self.assertEqual(check(makeSpec("005930", 50000, qty=0)), "주문수량 오류")
+
+    def testTickRegime(self):
+        check = self.table.check
+        self.assertEqual(check(makeSpec("069500", 30005)), "")  # ETF 5원
+        self.assertEqual(check(makeSpec("035720", 10050)), "")  # KOSDAQ 50원
+        self.assertEqual(check(makeSpec("035720", 10010)), "호가단위 오류")
+
+    def testIssues(self):
+        check = self.table.check
+        self.assertEqual(check(makeSpec("000020", 10000)), "거래정지 종목")
+        self.assertEqual(check(makeSpec("000020", 0, qty=0, orderType=3)), "")
+        self.assertEqual(check(makeSpec("000040", 1000)), "관리종목 매수 제한")
+        self.assertEqual(check(makeSpec("000040", 1000, orderType=2)), "")
+
+        self.table.allowManaged = True
+        self.assertEqual(check(makeSpec("000040", 1000)), "")
+
+    def testCheckBatch(self):
+        specs = [
+            makeSpec("005930", 50100),
+            makeSpec("005930", 70000),
+            makeSpec("000020", 10000),
+            makeSpec("A035720", 9990),
+        ]
+        self.assertEqual(
+            self.table.checkBatch(specs), ["", "상한가 초과", "거래정지 종목", ""]
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
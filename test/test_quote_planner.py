@@ -0,0 +1,91 @@
+import logging
+import unittest
+
+from PyQt5.QtCore import QCoreApplication, QEventLoop, QTimer
+
+from kiwoom_api.api.kiwoom import APIDelayCheck
+from kiwoom_api.api.quote_planner import QuotePlanner
+
+
+class FakeKiwoom:
+    """ commKwRqDataAsync 요청 후 10ms 뒤에 종목별 현재가를 응답하는 Kiwoom 대용 """
+
+    def __init__(self):
+        self.logger = logging.getLogger("test_quote_planner")
+        self.requestDelayCheck = APIDelayCheck(logger=self.logger)
+        self.trHandlers = {}
+        self.requests = []
+        self.disconnected = []
+
+    def commKwRqDataAsync(self, arrCode, codeCount, rqName, scrNo, callback, typeFlag=0):
+        codes = arrCode.split(";")
+        self.requests.append(codes)
+        self.trHandlers[rqName] = callback
+
+        rows = [{"종목코드": code, "현재가": "-" + code[-3:]} for code in codes if code != "999999"]
+
+        def respond():
+            self.trHandlers.pop(rqName)({"멀티데이터": rows}, 0)
+
+        QTimer.singleShot(10, respond)
+
+    def disconnectRealData(self, scrNo):
+        self.disconnected.append(scrNo)
+
+
+class TestQuotePlanner(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QCoreApplication.instance() or QCoreApplication([])
+
+    def wait(self, count):
+        loop = QEventLoop()
+        QTimer.singleShot(2000, loop.exit)
+
+        def check():
+            if len(self.rows) >= count:
+                loop.exit()
+            else:
+                QTimer.singleShot(5, check)
+
+        QTimer.singleShot(0, check)
+        loop.exec_()
+
+    def setUp(self):
+        self.rows = []
+
+    def onQuote(self, code, row):
+        self.rows.append((code, row))
+
+    def testBatching(self):
+        kiwoom = FakeKiwoom()
+        planner = QuotePlanner(kiwoom)
+        codes = ["{:06d}".format(n) for n in range(150)]
+        for code in codes + ["000001"]:
+            planner.request(code, lambda row, code=code: self.onQuote(code, row))
+        self.wait(151)
+
+        # 중복을 제거한 150종목을 100종목씩 2회 요청
+        self.assertEqual([len(chunk) for chunk in kiwoom.requests], [100, 50])
+        self.assertEqual(planner.requested, 151)
+        self.assertEqual(planner.sent, 2)
+        self.assertEqual(len(self.rows), 151)
+        for code, row in self.rows:
+            self.assertEqual(row["종목코드"], code)
+        self.assertEqual(sorted(kiwoom.disconnected), ["2100", "2101"])
+
+    def testWindow(self):
+        kiwoom = FakeKiwoom()
+        planner = QuotePlanner(kiwoom, window=20)
+        planner.request("005930", lambda row: self.onQuote("005930", row))
+        QTimer.singleShot(5, lambda: planner.request("999999", lambda row: self.onQuote("999999", row)))
+        self.wait(2)
+
+        # window 안에 들어온 요청은 한 번에 전송, 응답에 없는 종목은 None
+        self.assertEqual(kiwoom.requests, [["005930", "999999"]])
+        self.assertEqual(dict(self.rows)["999999"], None)
+        self.assertEqual(dict(self.rows)["005930"]["현재가"], "-930")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,160 @@
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+
+from kiwoom_api.api.chejan import BalanceRecord, ChejanRecord
+from kiwoom_api.api.journal import OrderJournal
+from kiwoom_api.api.ledger import PositionLedger
+from kiwoom_api.api.order_book import OrderBook, OrderStatus
+from kiwoom_api.api.recovery import OrderRecovery
+
+
+def submitted(orderNo, qty):
+    record = ChejanRecord("orders_submitted", "2020-03-13", "접수")
+    record.ACCOUNT_NO = "8888888811"
+    record.ORDER_NO = orderNo
+    record.TICKER = "A005930"
+    record.ORDER_GUBUN = "+매수"
+    record.ORDER_QTY = qty
+    record.ORDER_PRICE = 50000
+    record.UNEX_QTY = qty
+    return record
+
+
+def executed(orderNo, tranNo, tranQty, unexQty):
+    record = ChejanRecord("orders_executed", "2020-03-13", "체결")
+    record.ACCOUNT_NO = "8888888811"
+    record.ORDER_NO = orderNo
+    record.TICKER = "A005930"
+    record.ORDER_GUBUN = "+매수"
+    record.TRAN_NO = tranNo
+    record.TRAN_QTY = tranQty
+    record.TRAN_PRICE = 50000
+    record.UNEX_QTY = unexQty
+    return record
+
+
+def balance(qty):
+    record = BalanceRecord("balance", "2020-03-13")
+    record.ACCOUNT_NO = "8888888811"
+    record.TICKER = "A005930"
+    record.HOLDING_QTY = qty
+    record.AVG_PRICE = 50000
+    record.DEPOSIT = 1000000
+    return record
+
+
+class TestOrderRecovery(unittest.TestCase):
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.path)
+
+    def record(self, journal, book, ledger, records):
+        for record in records:
+            if record.TABLE == "balance":
+                ledger.apply(record)
+            else:
+                book.apply(record)
+            journal.write(record.TABLE, record)
+        journal.flush()
+
+    def recover(self):
+        journal = OrderJournal(self.path, fsync="never")
+        book, ledger = OrderBook(), PositionLedger()
+        recovery = OrderRecovery(journal, book, ledger)
+        return journal, book, ledger, recovery, recovery.replay()
+
+    def testReplay(self):
+        journal, book, ledger, recovery, result = self.recover()
+        self.assertEqual(result["events"], 0)
+        self.record(
+            journal,
+            book,
+            ledger,
+            [submitted("0000001", 10), executed("0000001", "1", 4, 6), balance(4)],
+        )
+        journal.close()
+
+        journal, book, ledger, recovery, result = self.recover()
+        self.assertFalse(result["checkpoint"])
+        self.assertEqual(result["events"], 3)
+        self.assertEqual(book.getOrder("0000001").status, OrderStatus.PARTIAL)
+        self.assertEqual(book.remainingQty("0000001"), 6)
+        self.assertEqual(ledger.getQty("8888888811", "005930"), 4)
+        journal.close()
+
+    def testReplayFromCheckpoint(self):
+        journal, book, ledger, recovery, _ = self.recover()
+        self.record(journal, book, ledger, [submitted("0000001", 10), balance(0)])
+        self.assertIsNotNone(recovery.checkpoint(wait=True))
+        self.record(journal, book, ledger, [executed("0000001", "1", 10, 0), balance(10)])
+        journal.close()
+
+        journal, book, ledger, recovery, result = self.recover()
+        self.assertTrue(result["checkpoint"])
+        self.assertEqual(result["events"], 2)
+        self.assertEqual(book.getOrder("0000001").status, OrderStatus.FILLED)
+        self.assertEqual(ledger.getQty("8888888811", "005930"), 10)
+        self.assertEqual(ledger.getCashDeposit("8888888811"), 1000000)
+
+        # 복구 이후에 기록된 이벤트는 재생 범위에 포함되지 않음
+        recovery.isRecovered = False
+        self.record(journal, book, ledger, [submitted("0000002", 5)])
+        self.assertEqual(recovery.replay()["events"], 2)
+        journal.close()
+
+    def testCheckpointWithQueuedEvents(self):
+        journal, book, ledger, recovery, _ = self.recover()
+        self.record(journal, book, ledger, [submitted("0000001", 10), balance(0)])
+
+        # background thread가 기록하지 못하는 동안 반영된 이벤트
+        release = threading.Event()
+        open_ = journal._OrderJournal__open
+
+        def blockingOpen(date):
+            release.wait(5)
+            return open_(date)
+
+        journal._OrderJournal__open = blockingOpen
+        for record in [executed("0000001", "1", 4, 6), balance(4)]:
+            (ledger if record.TABLE == "balance" else book).apply(record)
+            journal.write(record.TABLE, record)
+
+        start = time.time()
+        self.assertIsNotNone(recovery.checkpoint(wait=True))
+        self.assertLess(time.time() - start, 0.5)  # journal 기록을 기다리지 않음
+
+        release.set()
+        self.record(journal, book, ledger, [executed("0000001", "2", 6, 0)])
+        journal.close()
+
+        journal, book, ledger, recovery, result = self.recover()
+        self.assertTrue(result["checkpoint"])
+        self.assertEqual(result["events"], 1)  # checkpoint 이후의 체결만 재생
+        self.assertEqual(book.getOrder("0000001").filledQty, 10)
+        self.assertEqual(book.getOrder("0000001").status, OrderStatus.FILLED)
+        self.assertEqual(ledger.getQty("8888888811", "005930"), 4)
+        journal.close()
+
+    def testCheckpointAfterRestartWithoutEvents(self):
+        journal, book, ledger, recovery, _ = self.recover()
+        self.record(journal, book, ledger, [submitted("0000001", 10)])
+        journal.close()
+
+        journal, book, ledger, recovery, result = self.recover()
+        self.assertIsNotNone(recovery.checkpoint(wait=True))
+        journal.close()
+
+        journal, book, ledger, recovery, result = self.recover()
+        self.assertTrue(result["checkpoint"])
+        self.assertEqual(result["events"], 0)
+        self.assertEqual(book.remainingQty("0000001"), 10)
+        journal.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
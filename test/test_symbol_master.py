@@ -0,0 +1,70 @@
+import shutil
+import tempfile
+import unittest
+
+from kiwoom_api.api.symbol_master import SymbolMaster
+
+
+class TestSymbolMaster(unittest.TestCase):
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.path)
+
+    def build(self, master, date, codes, names=None, states=None):
+        names = names or ["종목" + code for code in codes]
+        states = states or ["증거금20%"] * len(codes)
+        markets = ["KSP"] * len(codes)
+        master.build(codes, names, markets, states, {"0": codes + [""]}, date=date)
+        master.save()
+        return master
+
+    def testLookup(self):
+        master = self.build(
+            SymbolMaster(self.path),
+            "20200313",
+            ["005930", "000660"],
+            states=["증거금20%", "증거금40%|관리종목"],
+        )
+
+        self.assertIn("005930", master)
+        self.assertNotIn("035720", master)
+        self.assertEqual(master.getName("005930"), "종목005930")
+        self.assertEqual(master.getMarket("000660"), "KSP")
+        self.assertEqual(master.getStates("000660"), ["증거금40%", "관리종목"])
+        self.assertEqual(master.getMarginRate("000660"), 40)
+        self.assertTrue(master.hasIssue("000660"))
+        self.assertFalse(master.hasIssue("005930"))
+        self.assertIsNone(master.getMarket("035720"))
+
+    def testSaveLoad(self):
+        self.build(SymbolMaster(self.path), "20200313", ["005930", "000660"])
+
+        master = SymbolMaster(self.path)
+        self.assertFalse(master.isLoaded)
+        self.assertFalse(master.load("20200312"))
+        self.assertTrue(master.load("20200313"))
+        self.assertEqual(len(master), 2)
+        self.assertEqual(master.codeLists["0"], ["005930", "000660", ""])
+
+    def testCompare(self):
+        master = SymbolMaster(self.path)
+        self.assertIsNone(self.build(master, "20200312", ["005930", "000660"]).compare())
+
+        self.build(
+            master,
+            "20200313",
+            ["005930", "035720"],
+            names=["삼성전자", "카카오"],
+        )
+        diff = master.compare()
+        self.assertEqual(diff["date"], "20200312")
+        self.assertEqual(diff["listed"], ["035720"])
+        self.assertEqual(diff["delisted"], ["000660"])
+        self.assertEqual(diff["renamed"], {"005930": ("종목005930", "삼성전자")})
+        self.assertEqual(diff["stateChanged"], {})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,125 @@
+import logging
+import shutil
+import tempfile
+import unittest
+
+from kiwoom_api.api.kiwoom import Kiwoom
+from kiwoom_api.api.tr_cache import TrCache
+
+
+DATA = {
+    "싱글데이터": {"종목코드": "005930"},
+    "멀티데이터": [
+        {"일자": "20200313", "현재가": "49950"},
+        {"일자": "20200312", "현재가": "50800"},
+    ],
+}
+
+
+class FakeKiwoom:
+    """ pages를 순서대로 연속조회하는 Kiwoom 대용, commRqData()는 Kiwoom의 cache 처리를 그대로 사용 """
+
+    commRqData = Kiwoom.commRqData
+    connectState = 1
+
+    def __init__(self, path, pages):
+        self.trCache = TrCache(path)
+        self.logger = logging.getLogger("test_tr_cache")
+        self.pages = pages
+        self.requests = []
+        self.isNext = 0
+        self._Kiwoom__inputs = {}
+        self._Kiwoom__trChains = {}
+
+    def setInputValue(self, key, value):
+        self._Kiwoom__inputs[key] = value
+
+    def dynamicCall(self, signature, *args):
+        pass
+
+    def _Kiwoom__commRqData(self, rqName, trCode, inquiry, scrNo):
+        self.page = self.page + 1 if inquiry == 2 else 0
+        self.requests.append(self.page)
+        setattr(self, trCode, self.pages[self.page])
+        self.isNext = 2 if self.page + 1 < len(self.pages) else 0
+
+    def requestAll(self, inputs):
+        for key, value in inputs.items():
+            self.setInputValue(key, value)
+        self.commRqData("rq", "OPT10081", 0, "0101")
+        while self.isNext:
+            self.commRqData("rq", "OPT10081", 2, "0101")
+
+
+PAGES = [
+    {"멀티데이터": [{"일자": "20200313", "현재가": "49950"}]},
+    {"멀티데이터": [{"일자": "20200312", "현재가": "50800"}]},
+]
+
+
+class TestTrCache(unittest.TestCase):
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+        self.cache = TrCache(self.path)
+
+    def tearDown(self):
+        shutil.rmtree(self.path)
+
+    def testPutGet(self):
+        key = TrCache.key("OPT10081", {"종목코드": "005930", "기준일자": "20200313"})
+        self.assertIsNone(self.cache.get("OPT10081", key))
+
+        self.cache.put("OPT10081", key, DATA, 2)
+        self.assertEqual(self.cache.get("OPT10081", key), (DATA, 2))
+        self.assertEqual((self.cache.hits, self.cache.misses, self.cache.stores), (1, 1, 1))
+
+        self.cache.clear("OPT10081")
+        self.assertIsNone(self.cache.get("OPT10081", key))
+
+    def testKey(self):
+        inputs = {"종목코드": "005930", "기준일자": "20200313"}
+        self.assertEqual(
+            TrCache.key("opt10081", inputs), TrCache.key("OPT10081", dict(reversed(list(inputs.items()))))
+        )
+
+        # 연속조회 page는 이전 page의 응답에 연결
+        self.assertNotEqual(
+            TrCache.key("OPT10081", inputs, 1, TrCache.digest(DATA, 2)),
+            TrCache.key("OPT10081", inputs, 1, TrCache.digest(DATA, 0)),
+        )
+
+    def testIsImmutable(self):
+        inputs = {"종목코드": "005930", "기준일자": "20200313"}
+        self.assertTrue(self.cache.isImmutable(inputs, DATA, today="20200314"))
+
+        # 당일 데이터 포함
+        self.assertFalse(self.cache.isImmutable(inputs, DATA, today="20200313"))
+        # 수정주가
+        self.assertFalse(self.cache.isImmutable(dict(inputs, 수정주가구분="1"), DATA, today="20200314"))
+        # 일자 입력값이 없는 TR의 첫 page
+        self.assertFalse(self.cache.isImmutable({"종목코드": "005930"}, DATA, today="20200314"))
+        self.assertTrue(self.cache.isImmutable({"종목코드": "005930"}, DATA, page=1, today="20200314"))
+        # 일자 항목이 없는 응답
+        self.assertFalse(self.cache.isImmutable(inputs, {"멀티데이터": [{"현재가": "1"}]}, today="20200314"))
+
+    def testCachedChain(self):
+        kiwoom = FakeKiwoom(self.path, PAGES)
+        inputs = {"종목코드": "005930", "기준일자": "20200313"}
+        kiwoom.requestAll(inputs)
+        self.assertEqual(kiwoom.trCache.stores, 2)
+
+        kiwoom.requests = []
+        kiwoom.requestAll(inputs)
+        self.assertEqual(kiwoom.requests, [])
+        self.assertEqual(kiwoom.OPT10081, PAGES[1])
+
+    def testContinuationOfMutableRoot(self):
+        # 일자 입력값이 없는 첫 page는 매일 달라지므로, 이어지는 page도 저장하지 않음
+        kiwoom = FakeKiwoom(self.path, PAGES)
+        kiwoom.requestAll({"종목코드": "005930"})
+        self.assertEqual(kiwoom.requests, [0, 1])
+        self.assertEqual(kiwoom.trCache.stores, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()